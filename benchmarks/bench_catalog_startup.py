@@ -0,0 +1,54 @@
+"""
+Benchmark de arranque en frío del catálogo de skills:
+escaneo completo del directorio vs carga del snapshot precompilado.
+
+    python -m benchmarks.bench_catalog_startup --skills 1000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from benchmarks.fixtures import generate_skills
+from src.infrastructure.storage.catalog_snapshot import load_store, write_snapshot
+from src.infrastructure.storage.fs_skill_store import FSSkillStore
+
+
+def _measure(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(skills: int = 1000, repeat: int = 5) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = os.path.join(tmp, "skills")
+        snapshot_path = os.path.join(tmp, "skills.catalog")
+        generate_skills(skills_dir, skills)
+        write_snapshot(FSSkillStore(skills_dir), snapshot_path)
+
+        scan_ms = _measure(lambda: FSSkillStore(skills_dir).refresh(), repeat)
+        snapshot_ms = _measure(lambda: load_store(skills_dir, snapshot_path).refresh(), repeat)
+
+    return {
+        "skills": skills,
+        "scan_ms": round(scan_ms, 2),
+        "snapshot_ms": round(snapshot_ms, 2),
+        "speedup": round(scan_ms / snapshot_ms, 1) if snapshot_ms else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skills", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = run(args.skills, args.repeat)
+    print(
+        f"{result['skills']} skills | escaneo: {result['scan_ms']} ms | "
+        f"snapshot: {result['snapshot_ms']} ms | x{result['speedup']}"
+    )
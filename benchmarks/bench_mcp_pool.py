@@ -0,0 +1,69 @@
+"""
+Benchmark del pool MCP frente a un único proceso contra el bridge de Context7.
+
+    python -m benchmarks.bench_mcp_pool --calls 200 --concurrency 32 --latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from src.infrastructure.mcp.pool import MCPPool
+from src.infrastructure.mcp.stdio_client import MCPStdioClient
+
+BRIDGE = ["scripts/context7_mcp_bridge.py"]
+
+
+async def _drive(client, calls: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.call_tool("resolve-library-id", {"libraryName": f"lib{i}"})
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "throughput_rps": round(calls / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+async def run(calls=200, concurrency=32, pool_size=4, latency_ms=5.0) -> dict:
+    os.environ["CONTEXT7_BRIDGE_LATENCY_MS"] = str(latency_ms)
+    results = {}
+
+    single = MCPStdioClient(sys.executable, BRIDGE)
+    await single.connect()
+    try:
+        results["single"] = await _drive(single, calls, concurrency)
+    finally:
+        await single.stop()
+
+    pool = MCPPool(sys.executable, BRIDGE, size=pool_size)
+    await pool.start()
+    try:
+        results[f"pool_{pool_size}"] = await _drive(pool, calls, concurrency)
+    finally:
+        await pool.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.calls, args.concurrency, args.pool_size, args.latency_ms))
+    for name, row in results.items():
+        print(f"{name:>8} | {row['throughput_rps']} req/s | p50 {row['p50_ms']} ms | p95 {row['p95_ms']} ms")
@@ -0,0 +1,78 @@
+"""
+Benchmark de inyección top-k de skills en el prompt del Router:
+tokens del system prompt y latencia local (ranking + construcción del prompt).
+La latencia estimada del Router suma el prefill del LLM a `--prefill-tps` tokens/s.
+
+    python -m benchmarks.bench_skill_ranking --top-k 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from benchmarks.fixtures import generate_metadata
+from src.infrastructure.llm.openai_client import OpenAIClient
+from src.infrastructure.storage.skill_ranker import BM25SkillRanker
+
+QUERIES = [
+    "¿Qué clima hace hoy en la ciudad?",
+    "Resume este pdf y saca la tabla de datos",
+    "Abre un ticket de soporte para el cliente",
+    "Busca noticias sobre el despliegue del servidor",
+]
+
+
+def _approx_tokens(text: str) -> int:
+    # Aproximación estándar (~4 caracteres por token)
+    return len(text) // 4
+
+
+async def _router_prompt_ms(client, ranker, catalog, query) -> tuple[float, int]:
+    start = time.perf_counter()
+    skills = await ranker.select(query, catalog) if ranker else catalog
+    prompt = client._build_system_prompt("", "", skills)
+    return (time.perf_counter() - start) * 1000, _approx_tokens(prompt)
+
+
+async def run(
+    sizes=(10, 100, 1000), top_k: int = 8, repeat: int = 20, prefill_tps: float = 5000
+) -> list[dict]:
+    client = OpenAIClient()
+    ranker = BM25SkillRanker(top_k=top_k)
+    results = []
+    for size in sizes:
+        catalog = generate_metadata(size)
+        await ranker.select(QUERIES[0], catalog)  # construye el índice
+
+        row = {"skills": size}
+        for label, active_ranker in (("full", None), ("topk", ranker)):
+            latencies, tokens = [], []
+            for i in range(repeat):
+                ms, tok = await _router_prompt_ms(
+                    client, active_ranker, catalog, QUERIES[i % len(QUERIES)]
+                )
+                latencies.append(ms)
+                tokens.append(tok)
+            row[f"{label}_tokens"] = int(statistics.mean(tokens))
+            row[f"{label}_ms"] = round(statistics.median(latencies), 3)
+            row[f"{label}_router_ms"] = round(
+                row[f"{label}_ms"] + 1000 * row[f"{label}_tokens"] / prefill_tps, 1
+            )
+        row["token_reduction_pct"] = round(
+            100 * (1 - row["topk_tokens"] / row["full_tokens"]), 1
+        )
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--prefill-tps", type=float, default=5000)
+    args = parser.parse_args()
+
+    for row in asyncio.run(run(top_k=args.top_k, prefill_tps=args.prefill_tps)):
+        print(
+            f"{row['skills']:>5} skills | tokens: {row['full_tokens']} -> {row['topk_tokens']} "
+            f"(-{row['token_reduction_pct']}%) | local: {row['full_ms']} -> {row['topk_ms']} ms "
+            f"| router est.: {row['full_router_ms']} -> {row['topk_router_ms']} ms"
+        )
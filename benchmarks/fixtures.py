@@ -0,0 +1,44 @@
+import os
+import random
+from src.core.schemas.models import SkillMetadata
+
+_WORDS = (
+    "clima ciudad temperatura búsqueda web documentación librería precio "
+    "producto noticias traducción idioma calendario evento correo resumen "
+    "pdf tabla datos gráfico código repositorio despliegue servidor logs "
+    "métricas alerta factura pago cliente ticket soporte mapa ruta viaje"
+).split()
+
+
+def generate_skills(skills_dir: str, count: int, seed: int = 42) -> list[str]:
+    """Genera `count` skills sintéticas con frontmatter realista. Devuelve sus nombres."""
+    rng = random.Random(seed)
+    os.makedirs(skills_dir, exist_ok=True)
+    names = []
+    for i in range(count):
+        name = f"skill-{i:04d}-{rng.choice(_WORDS)}"
+        description = " ".join(rng.choice(_WORDS) for _ in range(12))
+        body = "\n".join(
+            f"{j}. " + " ".join(rng.choice(_WORDS) for _ in range(10)) for j in range(30)
+        )
+        skill_dir = os.path.join(skills_dir, name)
+        os.makedirs(skill_dir, exist_ok=True)
+        with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8") as f:
+            f.write(
+                f"---\nname: {name}\ndescription: {description}\nversion: 1.0.0\n"
+                f"metadata:\n  entry_script: scripts/run.py\n---\n\n# {name}\n\n{body}\n"
+            )
+        names.append(name)
+    return names
+
+
+def generate_metadata(count: int, seed: int = 42) -> list[SkillMetadata]:
+    """Catálogo Nivel 1 sintético en memoria (sin tocar disco)."""
+    rng = random.Random(seed)
+    return [
+        SkillMetadata(
+            name=f"skill-{i:04d}-{rng.choice(_WORDS)}",
+            description=" ".join(rng.choice(_WORDS) for _ in range(12)),
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,316 @@
+"""
+Generador de carga en lazo cerrado contra el loop completo del Orchestrator.
+
+Arranca `scripts/openai_stub_server.py` como LLM, un workspace temporal con
+skills sintéticas (latencia configurable) y el bridge MCP local. Después
+simula K usuarios concurrentes; cada uno encadena conversaciones
+multi-paso (skills y tools) sin pausa o con `--think-ms` entre ellas.
+
+    python -m benchmarks.loadgen --users 32 --duration 30 --llm-latency lognormal:300,0.4
+    python -m benchmarks.loadgen --users 8 --conversations 20 --stream --runner warm
+
+Informa del throughput y de p50/p95/p99 por fase: LLM, skill, MCP y
+conversación completa (e2e).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+STUB_SERVER = "scripts/openai_stub_server.py"
+FLOW_PROMPTS = {
+    "weather": "¿Qué tiempo hace en {city}?",
+    "docs": "Busca en los docs de react cómo usar hooks ({city})",
+    "mixed": "Investiga python y pydantic para {city}",
+}
+CITIES = ["Madrid", "Paris", "Tokyo", "Lima", "Oslo", "Roma", "Quito", "Seúl"]
+
+SKILL_TEMPLATE = """---
+name: {name}
+description: {description}
+version: 1.0.0
+metadata:
+  entry_script: scripts/run.py
+---
+
+# {name}
+
+Skill sintética para pruebas de carga.
+"""
+
+SCRIPT_TEMPLATE = """import json, sys, time
+time.sleep({latency_s})
+args = json.loads(sys.argv[1]) if len(sys.argv) > 1 else {{}}
+print(json.dumps({{"skill": "{name}", "args": args, "ok": True}}))
+"""
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil por rango más cercano (sin interpolación)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class PhaseRecorder:
+    """Duraciones (ms) por fase; los wrappers de abajo las alimentan."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, phase: str, started: float, ok: bool = True):
+        self.samples[phase].append((time.perf_counter() - started) * 1000)
+        if not ok:
+            self.errors[phase] += 1
+
+    def summary(self, elapsed_s: float) -> dict:
+        report = {}
+        for phase, samples in sorted(self.samples.items()):
+            report[phase] = {
+                "count": len(samples),
+                "errors": self.errors.get(phase, 0),
+                "rate_per_s": round(len(samples) / elapsed_s, 2) if elapsed_s else 0.0,
+                "mean_ms": round(sum(samples) / len(samples), 2),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+            }
+        return report
+
+
+class _TimedLLM:
+    def __init__(self, inner, recorder: PhaseRecorder):
+        self.inner, self.recorder = inner, recorder
+
+    async def ask(self, state, on_event=None):
+        start = time.perf_counter()
+        action = await self.inner.ask(state, on_event=on_event)
+        self.recorder.record("llm", start, ok=action.name != "error_handler")
+        return action
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+class _TimedRunner:
+    def __init__(self, inner, recorder: PhaseRecorder):
+        self.inner, self.recorder = inner, recorder
+
+    async def run(self, skill, args):
+        start = time.perf_counter()
+        observation = await self.inner.run(skill, args)
+        self.recorder.record("skill", start, ok=observation.status == "success")
+        return observation
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+class _TimedMCP:
+    def __init__(self, inner, recorder: PhaseRecorder):
+        self.inner, self.recorder = inner, recorder
+
+    async def call_tool(self, tool_name, args):
+        start = time.perf_counter()
+        observation = await self.inner.call_tool(tool_name, args)
+        self.recorder.record("mcp", start, ok=observation.status == "success")
+        return observation
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+def build_workspace(root: str, skill_latency_ms: float):
+    """Workspace temporal: soul/tools reales y skills sintéticas con latencia fija."""
+    for filename in ("soul.md", "tools.md"):
+        source = os.path.join("workspace", filename)
+        if os.path.exists(source):
+            shutil.copy(source, os.path.join(root, filename))
+    skills = {
+        "weather": "Obtiene el clima actual de una ciudad.",
+        "instant-info": "Obtiene información instantánea sobre un concepto.",
+    }
+    for name, description in skills.items():
+        script_dir = os.path.join(root, "skills", name, "scripts")
+        os.makedirs(script_dir)
+        with open(os.path.join(root, "skills", name, "SKILL.md"), "w", encoding="utf-8") as f:
+            f.write(SKILL_TEMPLATE.format(name=name, description=description))
+        with open(os.path.join(script_dir, "run.py"), "w", encoding="utf-8") as f:
+            f.write(SCRIPT_TEMPLATE.format(name=name, latency_s=skill_latency_ms / 1000))
+
+
+async def start_stub(args) -> tuple:
+    command = [
+        sys.executable, STUB_SERVER, "--port", "0",
+        "--latency", args.llm_latency,
+        "--token-delay-ms", str(args.token_delay_ms),
+        "--seed", str(args.seed),
+    ]
+    process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.PIPE)
+    line = (await asyncio.wait_for(process.stdout.readline(), 10)).decode()
+    if not line.startswith("LISTENING"):
+        process.kill()
+        raise RuntimeError(f"El stub no arrancó: {line!r}")
+    return process, int(line.split()[1])
+
+
+def configure(args, workspace: str, port: int):
+    """Ajusta `settings` antes de construir el contenedor de dependencias."""
+    from src.settings import settings
+
+    settings.LLM_BASE_URL = f"http://127.0.0.1:{port}/v1"
+    settings.LLM_API_KEY = "stub"
+    settings.LLM_STREAM = args.stream
+    settings.WORKSPACE_DIR = workspace
+    settings.SKILLS_DIR = os.path.join(workspace, "skills")
+    settings.SKILLS_SNAPSHOT = os.path.join(workspace, "skills.catalog")
+    settings.SKILLS_WATCH = False
+    settings.RUNNER_MODE = args.runner
+    settings.WARM_POOL_SIZE = max(2, args.users // 4)
+    settings.MCP_POOL_SIZE = args.mcp_pool_size
+    # Se mide el régimen estable: el pool arranca antes de la carga
+    settings.MCP_PREWARM = True
+    # Por defecto se mide el peor caso: sin cachés de resultados ni de decisiones
+    settings.SKILL_CACHE_ENABLED = args.with_caches
+    settings.LLM_CACHE_ENABLED = args.with_caches
+    settings.SPECULATION_TOP_N = args.speculation_top_n
+    # Blobs y sesiones dentro del workspace temporal
+    settings.BLOB_PATH = os.path.join(workspace, "blobs")
+    settings.SESSION_DB = os.path.join(workspace, "sessions.sqlite")
+    os.environ["CONTEXT7_BRIDGE_LATENCY_MS"] = str(args.mcp_latency_ms)
+
+
+async def run(args) -> dict:
+    from src.bootstrap import AppContainer
+
+    recorder = PhaseRecorder()
+    with tempfile.TemporaryDirectory() as workspace:
+        build_workspace(workspace, args.skill_latency_ms)
+        stub, port = await start_stub(args)
+        try:
+            configure(args, workspace, port)
+            container = AppContainer()
+            await container.prewarm()
+            orchestrator = container.orchestrator
+            orchestrator.llm = _TimedLLM(orchestrator.llm, recorder)
+            orchestrator.runner = _TimedRunner(orchestrator.runner, recorder)
+            orchestrator.mcp = _TimedMCP(orchestrator.mcp, recorder)
+
+            flows = args.flows.split(",")
+            # Sesiones nuevas en cada ejecución (nunca se reanuda una anterior)
+            run_id = uuid.uuid4().hex[:8]
+            deadline = time.perf_counter() + args.duration if args.duration else None
+
+            async def user(index: int):
+                rng = random.Random(args.seed + index)
+                done = 0
+                while True:
+                    if deadline and time.perf_counter() >= deadline:
+                        return
+                    if not deadline and done >= args.conversations:
+                        return
+                    flow = rng.choice(flows)
+                    prompt = FLOW_PROMPTS[flow].format(city=rng.choice(CITIES))
+                    start = time.perf_counter()
+                    try:
+                        await orchestrator.chat(prompt, session_id=f"load-{run_id}-{index}-{done}")
+                        recorder.record("e2e", start)
+                    except Exception:
+                        recorder.record("e2e", start, ok=False)
+                    done += 1
+                    if args.think_ms:
+                        await asyncio.sleep(args.think_ms / 1000)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(user(i) for i in range(args.users)))
+            elapsed = time.perf_counter() - started
+            speculator = orchestrator.speculator
+
+            await container.mcp_client.stop()
+            stop = getattr(container.runner, "stop", None)
+            if stop:
+                await stop()
+        finally:
+            stub.terminate()
+            await stub.wait()
+
+    phases = recorder.summary(elapsed)
+    conversations = phases.get("e2e", {}).get("count", 0)
+    return {
+        "config": {
+            "users": args.users,
+            "duration_s": args.duration,
+            "conversations_per_user": None if args.duration else args.conversations,
+            "llm_latency": args.llm_latency,
+            "skill_latency_ms": args.skill_latency_ms,
+            "mcp_latency_ms": args.mcp_latency_ms,
+            "runner": args.runner,
+            "stream": args.stream,
+            "with_caches": args.with_caches,
+            "speculation_top_n": args.speculation_top_n,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "throughput_conversations_per_s": round(conversations / elapsed, 2) if elapsed else 0.0,
+        "phases": phases,
+        "speculation": speculator.stats.as_dict() if speculator else None,
+    }
+
+
+def format_report(result: dict) -> str:
+    lines = [
+        f"{result['config']['users']} usuarios | {result['elapsed_s']} s | "
+        f"{result['throughput_conversations_per_s']} conversaciones/s",
+        f"{'fase':<6} {'n':>7} {'err':>5} {'/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}",
+    ]
+    for phase, row in result["phases"].items():
+        lines.append(
+            f"{phase:<6} {row['count']:>7} {row['errors']:>5} {row['rate_per_s']:>8} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+        )
+    if result.get("speculation"):
+        spec = result["speculation"]
+        lines.append(f"especulación: aciertos {spec['hit_ratio']:.0%} | desperdicio {spec['waste_ratio']:.0%}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=8, help="Usuarios concurrentes (K)")
+    parser.add_argument("--conversations", type=int, default=10, help="Conversaciones por usuario")
+    parser.add_argument("--duration", type=float, default=None, help="Segundos (ignora --conversations)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pausa entre conversaciones")
+    parser.add_argument("--flows", default="weather,docs,mixed", help="Flujos del stub a mezclar")
+    parser.add_argument("--llm-latency", default="lognormal:200,0.3", help="Distribución del stub LLM")
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    parser.add_argument("--skill-latency-ms", type=float, default=50.0)
+    parser.add_argument("--mcp-latency-ms", type=float, default=20.0)
+    parser.add_argument("--mcp-pool-size", type=int, default=2)
+    parser.add_argument("--runner", choices=("cold", "warm"), default="cold")
+    parser.add_argument("--stream", action="store_true", help="LLM en modo streaming")
+    parser.add_argument("--with-caches", action="store_true", help="Activa cachés de skills y Router")
+    parser.add_argument("--speculation-top-n", type=int, default=0, help="Skills especuladas (0 = desactivada)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Guarda el resultado en JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+    print(format_report(result))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Comparación de resultados de benchmarks contra un baseline.
+
+Todas las métricas son "menor es mejor" (ms, bytes). Una métrica regresa
+si supera al baseline en más de su umbral relativo y, además, en más de
+`min_delta` unidades absolutas (para no marcar ruido en tiempos de µs).
+Los tiempos absolutos solo son comparables en el mismo entorno: ver
+`environment_mismatch`.
+"""
+import fnmatch
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Comparison:
+    metric: str
+    baseline: Optional[float]
+    current: Optional[float]
+    threshold: float
+    status: str  # ok | regression | improved | new | missing
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline
+
+
+# Campos de `meta` que deben coincidir para comparar dos ejecuciones
+ENVIRONMENT_KEYS = ("platform", "python", "quick")
+
+
+def environment_mismatch(current: Dict[str, object], baseline: Dict[str, object]) -> List[str]:
+    """Campos de `meta` en los que la ejecución actual difiere del baseline."""
+    return [key for key in ENVIRONMENT_KEYS if current.get(key) != baseline.get(key)]
+
+
+def threshold_for(metric: str, thresholds: Dict[str, float], default: float) -> float:
+    """Umbral de la métrica: el patrón glob más específico (más largo) que encaje."""
+    matches = [pattern for pattern in thresholds if fnmatch.fnmatchcase(metric, pattern)]
+    if not matches:
+        return default
+    return thresholds[max(matches, key=len)]
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    default_threshold: float = 0.25,
+    thresholds: Optional[Dict[str, float]] = None,
+    min_delta: float = 0.05,
+) -> List[Comparison]:
+    thresholds = thresholds or {}
+    rows = []
+    for metric in sorted(set(current) | set(baseline)):
+        threshold = threshold_for(metric, thresholds, default_threshold)
+        base, value = baseline.get(metric), current.get(metric)
+        if base is None:
+            status = "new"
+        elif value is None:
+            status = "missing"
+        elif value > base * (1 + threshold) and value - base > min_delta:
+            status = "regression"
+        elif value < base * (1 - threshold) and base - value > min_delta:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(Comparison(metric, base, value, threshold, status))
+    return rows
+
+
+def format_report(rows: List[Comparison]) -> str:
+    lines = [f"{'métrica':<40} {'baseline':>12} {'actual':>12} {'ratio':>7}  estado"]
+    for row in rows:
+        base = f"{row.baseline:.3f}" if row.baseline is not None else "-"
+        value = f"{row.current:.3f}" if row.current is not None else "-"
+        ratio = f"{row.ratio:.2f}" if row.ratio is not None else "-"
+        lines.append(f"{row.metric:<40} {base:>12} {value:>12} {ratio:>7}  {row.status}")
+    return "\n".join(lines)
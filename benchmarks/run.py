@@ -0,0 +1,303 @@
+"""
+Suite de micro-benchmarks por componente con control de regresiones.
+
+    python -m benchmarks.run --save-baseline               # fija el baseline de esta máquina
+    python -m benchmarks.run                              # todo, compara con ese baseline
+    python -m benchmarks.run --quick --only catalog,state
+    python -m benchmarks.run --threshold 0.3 --threshold-for "mcp.*=0.5"
+
+Todo corre offline: skills sintéticas en un directorio temporal, una skill
+no-op para el runner y el bridge local de Context7 para MCP. Cada tiempo es
+el mejor de N repeticiones (menos sensible al ruido que la mediana).
+
+El baseline es local (no se versiona): los tiempos absolutos dependen de la
+máquina. Los umbrales sí se versionan, en `benchmarks/thresholds.json`. Sale
+con código 1 si alguna métrica regresa respecto a un baseline del mismo
+entorno (plataforma, Python y `--quick`); con otro entorno, o con `--quick`,
+solo informa.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict
+from benchmarks.fixtures import generate_metadata, generate_skills
+from benchmarks.regression import compare, environment_mismatch, format_report
+from benchmarks.startup import SCENARIOS, measure
+from src.core.schemas.models import AgentState, Observation, SkillDoc, SkillMetadata
+from src.infrastructure.llm.openai_client import OpenAIClient
+from src.infrastructure.llm.tokenizers import CharTokenizer
+from src.infrastructure.mcp.stdio_client import MCPStdioClient
+from src.infrastructure.runners.subprocess_runner import SubprocessRunner
+from src.infrastructure.runners.warm_runner import WarmPoolRunner
+from src.infrastructure.storage.fs_skill_store import FSSkillStore
+from src.services.history_compactor import HistoryCompactor
+
+DEFAULT_OUTPUT = "benchmarks/results.json"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_THRESHOLDS = "benchmarks/thresholds.json"
+BRIDGE = ["scripts/context7_mcp_bridge.py"]
+
+Suite = Dict[str, Callable[[bool], Awaitable[Dict[str, float]]]]
+SUITE: Suite = {}
+
+
+def benchmark(group: str):
+    def register(fn):
+        SUITE[group] = fn
+        return fn
+
+    return register
+
+
+def _best_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(min(samples), 4)
+
+
+async def _best_ms_async(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(min(samples), 4)
+
+
+@benchmark("catalog")
+async def bench_catalog(quick: bool) -> Dict[str, float]:
+    """Escaneo en frío del directorio y parseo de todos los SkillDoc (Nivel 2)."""
+    results = {}
+    repeat = 3 if quick else 7
+    for size in (10, 100) if quick else (10, 100, 1000):
+        with tempfile.TemporaryDirectory() as tmp:
+            names = generate_skills(tmp, size)
+            results[f"catalog.scan_{size}_ms"] = _best_ms(lambda: FSSkillStore(tmp).refresh(), repeat)
+
+            # Parseo de todos los SkillDoc con el índice ya construido y la LRU vacía
+            samples = []
+            for _ in range(repeat):
+                store = FSSkillStore(tmp, doc_cache_size=size)
+                store.refresh()
+                start = time.perf_counter()
+                for name in names:
+                    store.load_skill_doc(name)
+                samples.append((time.perf_counter() - start) * 1000)
+            results[f"catalog.parse_{size}_ms"] = round(min(samples), 4)
+    return results
+
+
+@benchmark("prompt")
+async def bench_prompt(quick: bool) -> Dict[str, float]:
+    """Construcción del system prompt del Router: en frío y con las cachés calientes."""
+    client = OpenAIClient()
+    soul = client._load_workspace_file("soul.md")
+    tools = client._load_workspace_file("tools.md")
+    results = {}
+    repeat = 20 if quick else 200
+    for size in (10, 100) if quick else (10, 100, 1000):
+        skills = generate_metadata(size)
+        results[f"prompt.build_{size}_ms"] = _best_ms(
+            lambda: client._build_system_prompt(soul, tools, skills), repeat
+        )
+        state = AgentState(session_id="bench", available_skills=skills)
+        client._system_prompt_parts(state)
+        results[f"prompt.cached_{size}_ms"] = _best_ms(
+            lambda: client._system_prompt_parts(state), repeat
+        )
+    return results
+
+
+@benchmark("runner")
+async def bench_runner(quick: bool) -> Dict[str, float]:
+    """Overhead por llamada con una skill no-op: subproceso en frío vs worker warm."""
+    repeat = 5 if quick else 20
+    with tempfile.TemporaryDirectory() as workspace:
+        script_dir = os.path.join(workspace, "skills", "noop", "scripts")
+        os.makedirs(script_dir)
+        with open(os.path.join(script_dir, "run.py"), "w", encoding="utf-8") as f:
+            f.write('import json, sys\nprint(json.dumps({"ok": True}))\n')
+        skill = SkillDoc(
+            metadata=SkillMetadata(name="noop", description="no-op"),
+            instructions="",
+            entry_script="scripts/run.py",
+        )
+
+        cold = SubprocessRunner(workspace)
+        results = {"runner.cold_call_ms": await _best_ms_async(lambda: cold.run(skill, {}), repeat)}
+
+        warm = WarmPoolRunner(workspace, pool_size=1)
+        try:
+            await warm.prewarm(skill)
+            results["runner.warm_call_ms"] = await _best_ms_async(lambda: warm.run(skill, {}), repeat)
+        finally:
+            await warm.stop()
+    return results
+
+
+@benchmark("mcp")
+async def bench_mcp(quick: bool) -> Dict[str, float]:
+    """Arranque + handshake y round-trip secuencial contra el bridge local."""
+    os.environ["CONTEXT7_BRIDGE_LATENCY_MS"] = "0"
+    repeat = 20 if quick else 100
+    client = MCPStdioClient(sys.executable, BRIDGE)
+    start = time.perf_counter()
+    await client.connect()
+    results = {"mcp.connect_ms": round((time.perf_counter() - start) * 1000, 4)}
+    try:
+        results["mcp.roundtrip_ms"] = await _best_ms_async(
+            lambda: client.call_tool("resolve-library-id", {"libraryName": "react"}), repeat
+        )
+    finally:
+        await client.stop()
+    return results
+
+
+@benchmark("state")
+async def bench_state(quick: bool) -> Dict[str, float]:
+    """Crecimiento de AgentState con historiales largos: append, tamaño, compactación y volcado."""
+    steps = 200 if quick else 1000
+    content = "resultado " * 200  # ~2 KB por observación
+
+    def grow() -> AgentState:
+        state = AgentState(session_id="bench")
+        state.add_message("user", "pregunta inicial")
+        for i in range(steps):
+            state.add_message("assistant", f"Decision: skill:s{i} (r) Args: {{}}")
+            state.add_observation(Observation(origin=f"s{i}", content=content))
+        return state
+
+    repeat = 3 if quick else 5
+    state = grow()
+
+    compact_samples = []
+    for _ in range(repeat):
+        fresh = grow()
+        compactor = HistoryCompactor(CharTokenizer(), budget=60000)
+        start = time.perf_counter()
+        compactor.compact(fresh)
+        compact_samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        f"state.append_{steps}_ms": _best_ms(grow, repeat),
+        f"state.history_{steps}_bytes": float(sum(len(m["content"]) for m in state.history)),
+        f"state.count_{steps}_ms": _best_ms(
+            lambda: HistoryCompactor(CharTokenizer(), budget=0).count(state.history), repeat
+        ),
+        f"state.compact_{steps}_ms": round(min(compact_samples), 4),
+        f"state.dump_{steps}_ms": _best_ms(state.model_dump_json, repeat),
+    }
+
+
+@benchmark("startup")
+async def bench_startup(quick: bool) -> Dict[str, float]:
+    """Arranque en un intérprete nuevo: tiempo de imports según `-X importtime`."""
+    report = await asyncio.to_thread(measure, SCENARIOS, 3 if quick else 7)
+    return {f"startup.{name}_ms": row["import_ms"] for name, row in report.items()}
+
+
+async def run_suite(groups=None, quick: bool = False) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for group, fn in SUITE.items():
+        if groups and group not in groups:
+            continue
+        print(f"· {group}...", file=sys.stderr)
+        results.update(await fn(quick))
+    return results
+
+
+def _parse_thresholds(values) -> Dict[str, float]:
+    thresholds = {}
+    for value in values or []:
+        pattern, _, ratio = value.partition("=")
+        thresholds[pattern] = float(ratio)
+    return thresholds
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", help="Grupos separados por comas: " + ",".join(SUITE))
+    parser.add_argument("--quick", action="store_true", help="Tamaños y repeticiones reducidos")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="Umbrales versionados (JSON)")
+    parser.add_argument("--threshold", type=float, default=None, help="Regresión relativa tolerada (0.25 = +25%%)")
+    parser.add_argument(
+        "--threshold-for", action="append", metavar="GLOB=RATIO", help="Umbral por métrica (repetible)"
+    )
+    parser.add_argument("--min-delta", type=float, default=None, help="Diferencia absoluta mínima")
+    args = parser.parse_args(argv)
+
+    groups = set(args.only.split(",")) if args.only else None
+    results = asyncio.run(run_suite(groups, args.quick))
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    print(f"Resultados en {args.output}", file=sys.stderr)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"Baseline guardado en {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Sin baseline en {args.baseline}; usa --save-baseline", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    config = {}
+    if os.path.exists(args.thresholds):
+        with open(args.thresholds, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    thresholds = {**config.get("thresholds", {}), **_parse_thresholds(args.threshold_for)}
+    default = args.threshold if args.threshold is not None else config.get("default_threshold", 0.25)
+    min_delta = args.min_delta if args.min_delta is not None else config.get("min_delta", 0.05)
+    base_results = baseline["results"]
+    if groups or args.quick:
+        # Ejecución parcial: solo se comparan las métricas medidas
+        base_results = {k: v for k, v in base_results.items() if k in results}
+    rows = compare(results, base_results, default, thresholds, min_delta)
+    print(format_report(rows))
+
+    mismatch = environment_mismatch(document["meta"], baseline.get("meta", {}))
+    if mismatch:
+        print(
+            f"\nBaseline de otro entorno ({', '.join(mismatch)}): comparación solo informativa; "
+            "regenera el baseline con --save-baseline en esta máquina",
+            file=sys.stderr,
+        )
+        return 0
+    if args.quick:
+        # Con pocas repeticiones el ruido supera los umbrales: no es un gate
+        print("\n--quick: comparación solo informativa", file=sys.stderr)
+        return 0
+
+    regressions = [row for row in rows if row.status == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) frente al baseline", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
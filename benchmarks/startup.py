@@ -0,0 +1,130 @@
+"""
+Tiempo de arranque de los entry points y desglose por `-X importtime`.
+
+    python -m benchmarks.startup                          # CLI, bootstrap y grafo completo
+    python -m benchmarks.startup --module src.endpoints.http.server --top 20
+    python -m benchmarks.startup --output startup.json
+
+Cada medición es un intérprete nuevo (caché de bytecode caliente); se toma
+el mejor de N. El desglose agrupa el tiempo propio (`self`) de cada módulo
+por paquete de primer nivel para ver qué dependencia domina el arranque.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Escenarios: nombre -> código que se ejecuta en el intérprete nuevo
+SCENARIOS = {
+    "import_cli": "import src.endpoints.cli.main",
+    "import_bootstrap": "import src.bootstrap",
+    "container_build": "from src.bootstrap import AppContainer; AppContainer().orchestrator",
+    # Lo que hace el prewarm en segundo plano: grafo completo + cliente OpenAI
+    "container_prewarm": "from src.bootstrap import AppContainer; AppContainer()._build()",
+}
+
+
+@dataclass
+class ImportEntry:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    """Parsea las líneas `import time: self | cumulative | módulo` de `-X importtime`."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabecera
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        entries.append(
+            ImportEntry(
+                module=module,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(name) - len(module)) // 2,
+            )
+        )
+    return entries
+
+
+def by_package(entries: List[ImportEntry]) -> Dict[str, int]:
+    """Tiempo propio (µs) agregado por paquete de primer nivel, de mayor a menor."""
+    totals: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[entry.module.split(".")[0]] += entry.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def run_scenario(code: str) -> tuple:
+    """Ejecuta `code` en un intérprete nuevo; devuelve (ms de pared, entradas de importtime)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Falló `{code}`: {result.stderr.strip().splitlines()[-1:]}")
+    return wall_ms, parse_importtime(result.stderr)
+
+
+def measure(scenarios: Dict[str, str], repeat: int = 5) -> Dict[str, dict]:
+    report = {}
+    for name, code in scenarios.items():
+        best_ms, best_entries = None, []
+        for _ in range(repeat):
+            wall_ms, entries = run_scenario(code)
+            if best_ms is None or wall_ms < best_ms:
+                best_ms, best_entries = wall_ms, entries
+        report[name] = {
+            "wall_ms": round(best_ms, 2),
+            "import_ms": round(sum(e.cumulative_us for e in best_entries if e.depth == 0) / 1000, 2),
+            "modules": len(best_entries),
+            "packages_ms": {pkg: round(us / 1000, 2) for pkg, us in by_package(best_entries).items()},
+        }
+    return report
+
+
+def format_report(report: Dict[str, dict], top: int = 10) -> str:
+    lines = []
+    for name, row in report.items():
+        lines.append(
+            f"{name:<18} pared {row['wall_ms']:>8} ms | imports {row['import_ms']:>8} ms | "
+            f"{row['modules']} módulos"
+        )
+        for package, ms in list(row["packages_ms"].items())[:top]:
+            lines.append(f"    {package:<28} {ms:>8} ms")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", action="append", help="Módulo a importar (repetible)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Paquetes por escenario en el desglose")
+    parser.add_argument("--output", help="Guarda el resultado en JSON")
+    args = parser.parse_args(argv)
+
+    scenarios = {f"import:{m}": f"import {m}" for m in args.module} if args.module else SCENARIOS
+    report = measure(scenarios, args.repeat)
+    print(format_report(report, args.top))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,38 @@
+import os
 import sys
 import json
+import time
+
+# Latencia simulada por petición (benchmarks del pool MCP)
+LATENCY_MS = float(os.environ.get("CONTEXT7_BRIDGE_LATENCY_MS", "0"))
+
+
+TOOLS = [
+    {
+        "name": "resolve-library-id",
+        "description": "Resuelve el nombre de un paquete a un ID de librería compatible con Context7.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "libraryName": {"type": "string"},
+                "query": {"type": "string"},
+            },
+            "required": ["libraryName"],
+        },
+    },
+    {
+        "name": "query-docs",
+        "description": "Recupera documentación y ejemplos de código actualizados.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "libraryId": {"type": "string"},
+                "query": {"type": "string"},
+            },
+            "required": ["libraryId", "query"],
+        },
+    },
+]
 
 
 def handle_request(request):
@@ -7,7 +40,19 @@ def handle_request(request):
         method = request.get("method")
         params = request.get("params", {})
 
-        if method == "tools/call":
+        if method == "initialize":
+            return {
+                "result": {
+                    "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+                    "capabilities": {"tools": {"listChanged": True}},
+                    "serverInfo": {"name": "context7-bridge", "version": "0.1.0"},
+                }
+            }
+
+        elif method == "tools/list":
+            return {"result": {"tools": TOOLS}}
+
+        elif method == "tools/call":
             tool_name = params.get("name")
             arguments = params.get("arguments", {})
 
@@ -61,6 +106,11 @@ if __name__ == "__main__":
 
         try:
             request = json.loads(line)
+            if "id" not in request:
+                # Notificación (p.ej. notifications/initialized): sin respuesta
+                continue
+            if LATENCY_MS:
+                time.sleep(LATENCY_MS / 1000)
             response = handle_request(request)
             response["jsonrpc"] = "2.0"
             response["id"] = request.get("id")
@@ -0,0 +1,238 @@
+"""
+Servidor local compatible con `POST /v1/chat/completions` de OpenAI.
+
+Sustituye al LLM real en pruebas de carga: `OpenAIClient` lo usa apuntando
+`LLM_BASE_URL=http://127.0.0.1:<puerto>/v1`. En vez de generar texto,
+reproduce flujos de acciones guionizados: el flujo se elige por una palabra
+clave del primer mensaje de usuario y el paso por el número de decisiones
+(`assistant`) que ya hay en el historial.
+
+    python scripts/openai_stub_server.py --port 8099 --latency lognormal:300,0.4
+    python scripts/openai_stub_server.py --flows mis_flujos.json --token-delay-ms 5
+
+Latencias: `fixed:MS`, `uniform:MIN,MAX`, `normal:MEDIA,DESV`, `lognormal:MEDIANA,SIGMA`.
+Soporta respuestas normales y `stream: true` (SSE). Sin dependencias externas.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from http import HTTPStatus
+
+DEFAULT_FLOWS = {
+    "weather": {
+        "match": "tiempo",
+        "actions": [
+            {"type": "skill", "name": "weather", "args": {"city": "Madrid"}, "reason": "Consultar el clima."},
+            {"type": "respond", "name": "final_answer", "args": {"response": "En Madrid hace sol, 24 °C."}, "reason": "Dato obtenido."},
+        ],
+    },
+    "docs": {
+        "match": "docs",
+        "actions": [
+            {"type": "tool", "name": "resolve-library-id", "args": {"libraryName": "react"}, "reason": "Resolver la librería."},
+            {"type": "tool", "name": "query-docs", "args": {"libraryId": "/facebook/react", "query": "hooks"}, "reason": "Consultar la documentación."},
+            {"type": "respond", "name": "final_answer", "args": {"response": "Usa `useState` para el estado local."}, "reason": "Documentación obtenida."},
+        ],
+    },
+    "mixed": {
+        "match": "investiga",
+        "actions": [
+            {"type": "skill", "name": "instant-info", "args": {"query": "python"}, "reason": "Buscar contexto."},
+            {"type": "tool", "name": "resolve-library-id", "args": {"libraryName": "pydantic"}, "reason": "Resolver la librería."},
+            {"type": "respond", "name": "final_answer", "args": {"response": "Resumen combinado de la investigación."}, "reason": "Listo."},
+        ],
+    },
+}
+
+FALLBACK_ACTION = {
+    "type": "respond",
+    "name": "final_answer",
+    "args": {"response": "Respuesta simulada del servidor stub."},
+    "reason": "Sin flujo guionizado para este mensaje.",
+}
+
+
+def parse_latency(spec: str, rng: random.Random):
+    """Devuelve una función sin argumentos que muestrea una latencia en segundos."""
+    kind, _, raw = spec.partition(":")
+    values = [float(v) for v in raw.split(",") if v] if raw else []
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        # Parametrizada por la mediana (ms) y sigma del log
+        mu = math.log(values[0])
+        return lambda: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Distribución de latencia no soportada: {spec}")
+
+
+class ScriptedModel:
+    """Elige la acción según el flujo (palabra clave) y el paso de la conversación."""
+
+    def __init__(self, flows: dict):
+        self.flows = flows
+
+    def next_action(self, messages: list) -> dict:
+        user_messages = [m.get("content", "") for m in messages if m.get("role") == "user"]
+        first = user_messages[0].lower() if user_messages else ""
+        step = sum(1 for m in messages if m.get("role") == "assistant")
+        for flow in self.flows.values():
+            if flow["match"].lower() in first:
+                actions = flow["actions"]
+                return actions[min(step, len(actions) - 1)]
+        return FALLBACK_ACTION
+
+
+class StubServer:
+    def __init__(self, flows: dict, latency, token_delay: float = 0.0, chunk_chars: int = 8):
+        self.model = ScriptedModel(flows)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.chunk_chars = chunk_chars
+        self._ids = itertools.count(1)
+        self.requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # HTTP/1.1 con keep-alive: el cliente de OpenAI reutiliza conexiones
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1")
+                    if line in ("\r\n", "\n", ""):
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                if method == "POST" and path.rstrip("/").endswith("/chat/completions"):
+                    await self._completion(json.loads(body or b"{}"), writer)
+                else:
+                    self._send(writer, 404, {"error": {"message": f"Ruta no soportada: {path}"}})
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _send(writer, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+
+    async def _completion(self, request: dict, writer):
+        self.requests += 1
+        messages = request.get("messages", [])
+        action = self.model.next_action(messages)
+        content = json.dumps(action, ensure_ascii=False)
+        completion_id = f"chatcmpl-stub-{next(self._ids)}"
+        model = request.get("model", "stub")
+        usage = {
+            "prompt_tokens": sum(len(str(m.get("content", ""))) for m in messages) // 4,
+            "completion_tokens": len(content) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        await asyncio.sleep(self.latency())
+
+        if not request.get("stream"):
+            self._send(
+                writer,
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+
+        def chunk(delta: dict, finish=None, extra=None) -> dict:
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **(extra or {}),
+            }
+
+        async def send_event(data: str):
+            payload = f"data: {data}\n\n".encode()
+            writer.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            await writer.drain()
+
+        await send_event(json.dumps(chunk({"role": "assistant", "content": ""})))
+        for i in range(0, len(content), self.chunk_chars):
+            await send_event(json.dumps(chunk({"content": content[i : i + self.chunk_chars]})))
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+        await send_event(json.dumps(chunk({}, finish="stop", extra={"usage": usage})))
+        await send_event("[DONE]")
+        writer.write(b"0\r\n\r\n")
+
+
+async def serve(args) -> None:
+    flows = DEFAULT_FLOWS
+    if args.flows:
+        with open(args.flows, "r", encoding="utf-8") as f:
+            flows = json.load(f)
+    rng = random.Random(args.seed)
+    stub = StubServer(flows, parse_latency(args.latency, rng), args.token_delay_ms / 1000)
+    server = await asyncio.start_server(stub.handle, args.host, args.port)
+    port = server.sockets[0].getsockname()[1]
+    # Primera línea de stdout: puerto real (útil con --port 0)
+    print(f"LISTENING {port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", default="fixed:0", help="Latencia hasta el primer byte")
+    parser.add_argument("--token-delay-ms", type=float, default=0.0, help="Pausa entre chunks en streaming")
+    parser.add_argument("--flows", help="JSON con flujos {nombre: {match, actions}}")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
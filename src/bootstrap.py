@@ -1,39 +1,228 @@
-from src.infrastructure.storage.fs_skill_store import FSSkillStore
-from src.infrastructure.llm.openai_client import OpenAIClient
-from src.infrastructure.runners.subprocess_runner import SubprocessRunner
-from src.infrastructure.mcp.stdio_client import MCPStdioClient
-from src.services.orchestrator import Orchestrator
+import asyncio
+import logging
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
 from src.settings import settings
 
+if TYPE_CHECKING:
+    from src.services.orchestrator import Orchestrator
+
+logger = logging.getLogger(__name__)
+
 
 class AppContainer:
     """
     Contenedor de dependencias (Simple DI).
     Instancia las implementaciones concretas de infraestructura
     y las inyecta en los servicios de aplicación.
+
+    Cada adaptador se construye (e importa su módulo) en el primer acceso:
+    una invocación corta de la CLI no paga `openai`, `yaml` ni el pool MCP
+    si no los usa. `start_prewarm()` adelanta ese trabajo en segundo plano.
     """
 
     def __init__(self):
-        # 1. Infrastructure Layer
-        self.skill_store = FSSkillStore(skills_dir=settings.SKILLS_DIR)
-        self.llm_client = OpenAIClient()
-        self.runner = SubprocessRunner(workspace_dir=settings.WORKSPACE_DIR)
-
-        # Configuración de MCP (Context7)
-        self.mcp_client = MCPStdioClient(
-            command="python3", args=["scripts/context7_mcp_bridge.py"]
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+    # 1. Infrastructure Layer
+    @cached_property
+    def skill_store(self):
+        from src.infrastructure.storage.catalog_snapshot import load_store
+
+        store = load_store(settings.SKILLS_DIR, settings.SKILLS_SNAPSHOT)
+        if settings.SKILLS_WATCH:
+            from src.infrastructure.storage.live_skill_registry import LiveSkillRegistry
+
+            # Modo en vivo: catálogo en memoria invalidado por eventos del FS
+            store = LiveSkillRegistry(
+                store,
+                debounce=settings.SKILLS_WATCH_DEBOUNCE_MS / 1000,
+                poll_interval=settings.SKILLS_POLL_INTERVAL,
+            )
+            store.start()
+        return store
+
+    @cached_property
+    def skill_ranker(self):
+        from src.infrastructure.storage.skill_ranker import BM25SkillRanker
+
+        return BM25SkillRanker(
+            top_k=settings.SKILLS_TOP_K,
+            always_include=settings.SKILLS_ALWAYS_INCLUDE,
         )
 
-        # 2. Application Layer
-        self.orchestrator = Orchestrator(
+    @cached_property
+    def llm_client(self):
+        from src.infrastructure.llm.openai_client import OpenAIClient
+
+        client = OpenAIClient()
+        if settings.LLM_CACHE_ENABLED:
+            from src.infrastructure.llm.cached_client import CachedLLMClient
+
+            client = CachedLLMClient(
+                client,
+                self._tiered_cache(settings.LLM_CACHE_SIZE, settings.LLM_CACHE_DB),
+                ttl=settings.LLM_CACHE_TTL,
+                answer_ttl=settings.LLM_CACHE_ANSWER_TTL,
+            )
+        return client
+
+    @cached_property
+    def runner(self):
+        if settings.RUNNER_MODE == "warm":
+            from src.infrastructure.runners.warm_runner import WarmPoolRunner
+
+            runner = WarmPoolRunner(
+                workspace_dir=settings.WORKSPACE_DIR,
+                pool_size=settings.WARM_POOL_SIZE,
+                max_requests=settings.WARM_MAX_REQUESTS,
+                max_rss_mb=settings.WARM_MAX_RSS_MB,
+            )
+        else:
+            from src.infrastructure.runners.subprocess_runner import SubprocessRunner
+
+            runner = SubprocessRunner(workspace_dir=settings.WORKSPACE_DIR)
+        if settings.SKILL_CACHE_ENABLED:
+            from src.infrastructure.runners.cached_runner import CachingRunner
+
+            runner = CachingRunner(
+                runner, self._tiered_cache(settings.SKILL_CACHE_SIZE, settings.SKILL_CACHE_DB)
+            )
+        return runner
+
+    @cached_property
+    def mcp_client(self):
+        from src.infrastructure.mcp.pool import MCPPool
+
+        # Configuración de MCP (Context7): pool de procesos del servidor stdio.
+        # Los procesos arrancan en la primera llamada (o en `prewarm` con MCP_PREWARM).
+        return MCPPool(
+            command="python3",
+            args=["scripts/context7_mcp_bridge.py"],
+            size=settings.MCP_POOL_SIZE,
+        )
+
+    @cached_property
+    def metrics(self):
+        if not settings.METRICS_ENABLED:
+            return None
+        from src.infrastructure.observability.metrics import PrometheusMetrics
+
+        return PrometheusMetrics()
+
+    @cached_property
+    def tracer(self):
+        from src.core.interfaces.ports import NullTracer
+        from src.infrastructure.observability.tracing import JSONLSpanExporter, Tracer
+
+        # Observabilidad: sin sinks configurados se usa el NullTracer
+        sinks = []
+        if settings.TRACE_FILE:
+            sinks.append(JSONLSpanExporter(settings.TRACE_FILE))
+        if self.metrics:
+            sinks.append(self.metrics)
+        return Tracer(sinks) if sinks else NullTracer()
+
+    @cached_property
+    def blob_store(self):
+        from src.infrastructure.storage.blob_store import create_blob_store
+
+        return create_blob_store(settings.BLOB_STORE, settings.BLOB_PATH)
+
+    @cached_property
+    def session_store(self):
+        if settings.SESSION_STORE == "off":
+            return None
+        if settings.SESSION_STORE != "sqlite":
+            raise ValueError(f"SESSION_STORE no soportado: {settings.SESSION_STORE}")
+        from src.infrastructure.storage.session_store import SQLiteSessionStore
+
+        return SQLiteSessionStore(settings.SESSION_DB, snapshot_every=settings.SESSION_SNAPSHOT_EVERY)
+
+    @staticmethod
+    def _tiered_cache(size: int, db_path: Optional[str]):
+        from src.infrastructure.cache.ttl_cache import MemoryTTLCache, SQLiteTTLCache, TieredCache
+
+        return TieredCache(MemoryTTLCache(size), SQLiteTTLCache(db_path) if db_path else None)
+
+    # 2. Application Layer
+    @cached_property
+    def speculator(self):
+        if settings.SPECULATION_TOP_N <= 0:
+            return None
+        from src.services.speculation import Speculator
+
+        return Speculator(
+            self.skill_ranker,
+            top_n=settings.SPECULATION_TOP_N,
+            early_execution=settings.SPECULATIVE_EXECUTION,
+        )
+
+    @cached_property
+    def history_compactor(self):
+        from src.infrastructure.llm.tokenizers import create_tokenizer
+        from src.services.history_compactor import HistoryCompactor
+
+        return HistoryCompactor(
+            create_tokenizer(settings.TOKENIZER, settings.LLM_MODEL),
+            budget=settings.HISTORY_TOKEN_BUDGET,
+        )
+
+    @cached_property
+    def spiller(self):
+        if self.blob_store is None:
+            return None
+        from src.services.observation_spiller import ObservationSpiller
+
+        return ObservationSpiller(self.blob_store, threshold=settings.BLOB_SPILL_BYTES)
+
+    @cached_property
+    def orchestrator(self) -> "Orchestrator":
+        from src.services.orchestrator import Orchestrator
+
+        return Orchestrator(
             skill_store=self.skill_store,
             llm_client=self.llm_client,
             runner=self.runner,
             mcp_client=self.mcp_client,
+            skill_ranker=self.skill_ranker,
+            max_parallel_actions=settings.MAX_PARALLEL_ACTIONS,
+            history_compactor=self.history_compactor,
+            tracer=self.tracer,
+            speculator=self.speculator,
+            spiller=self.spiller,
+            session_store=self.session_store,
         )
 
+    async def prewarm(self):
+        """Construye el grafo antes de la primera petición del usuario."""
+        # Importar y construir el grafo (openai, yaml, pydantic...) fuera del loop
+        await asyncio.to_thread(self._build)
+        # Los procesos MCP solo si se piden: una sesión sin tools no los paga
+        if settings.MCP_PREWARM:
+            await self.mcp_client.start()
+
+    def _build(self):
+        self.orchestrator
+        # El cliente HTTP de OpenAI también se crea en el primer uso
+        getattr(self.llm_client, "client", None)
+
+    def start_prewarm(self) -> asyncio.Task:
+        """Lanza `prewarm` en segundo plano (p.ej. mientras el usuario escribe)."""
+        if self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(self.prewarm())
+        return self._prewarm_task
+
+    async def ready(self):
+        """Espera al prewarm en curso (o lo ejecuta); los fallos no son fatales."""
+        try:
+            await self.start_prewarm()
+        except Exception as e:
+            # MCPPool reintenta en la primera llamada; el resto se construye bajo demanda
+            logger.warning("Prewarm incompleto: %s", e)
+
 
-def bootstrap() -> Orchestrator:
+def bootstrap() -> "Orchestrator":
     """
     Punto de entrada para inicializar la aplicación.
     Retorna el orquestador listo para usar.
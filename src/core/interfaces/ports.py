@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.core.schemas.models import SkillMetadata, SkillDoc, Action, Observation, AgentState
+from typing import Any, Awaitable, Callable, ContextManager, List, Optional
+from src.core.schemas.models import SkillMetadata, SkillDoc, Action, Observation, AgentState, ToolSchema
+
+# Callback de eventos parciales del Router en streaming: (tipo, dato).
+# Tipos: "type", "name", "args" y "token" (fragmento de args.response).
+LLMEventCallback = Callable[[str, Any], Awaitable[None]]
 
 class ISkillStore(ABC):
     """Puerto para el descubrimiento y carga de skills (Filesystem)."""
@@ -15,12 +19,33 @@ class ISkillStore(ABC):
         """Nivel 2: Carga instrucciones completas de una skill."""
         pass
 
+class ISkillRanker(ABC):
+    """Puerto para seleccionar las skills relevantes para un mensaje (Nivel 1)."""
+
+    @abstractmethod
+    async def select(self, query: str, skills: List[SkillMetadata]) -> List[SkillMetadata]:
+        """Devuelve el subconjunto del catálogo que se inyecta en el Router."""
+        pass
+
+class ISkillPredictor(ABC):
+    """Puerto para predecir, sin LLM, qué skills elegirá el Router (especulación)."""
+
+    @abstractmethod
+    def predict(self, query: str, skills: List[SkillMetadata], limit: int) -> List[str]:
+        """Nombres de las `limit` skills más probables para `query`, de mayor a menor."""
+        pass
+
 class ILLMClient(ABC):
     """Puerto para la comunicación con el LLM (Router)."""
     
     @abstractmethod
-    async def ask(self, state: AgentState) -> Action:
-        """Convierte estado + contexto en una Acción estructurada."""
+    async def ask(
+        self, state: AgentState, on_event: Optional[LLMEventCallback] = None
+    ) -> Action:
+        """
+        Convierte estado + contexto en una Acción estructurada.
+        Si el cliente hace streaming, emite eventos parciales vía `on_event`.
+        """
         pass
 
 class IRunner(ABC):
@@ -38,3 +63,87 @@ class IMCPClient(ABC):
     async def call_tool(self, tool_name: str, args: dict) -> Observation:
         """Llama a una tool de un servidor MCP."""
         pass
+
+    @abstractmethod
+    async def list_tools(self) -> List[ToolSchema]:
+        """Tools expuestas por el servidor (cacheadas tras `tools/list`)."""
+        pass
+
+class IBlobStore(ABC):
+    """Puerto para contenido direccionado por hash (observaciones grandes)."""
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """Guarda `data` (idempotente) y devuelve su hash sha256 en hex."""
+        pass
+
+    @abstractmethod
+    def get(self, digest: str) -> Optional[bytes]:
+        """Contenido completo de `digest`, o None si no existe."""
+        pass
+
+class SessionConflictError(Exception):
+    """Otro proceso ya escribió en la sesión desde que este la cargó."""
+
+
+class ISessionStore(ABC):
+    """Puerto para persistir sesiones entre turnos, reinicios y procesos."""
+
+    @abstractmethod
+    async def load(self, session_id: str) -> Optional[AgentState]:
+        """Reanuda una sesión (snapshot + mensajes posteriores) o None si no existe."""
+        pass
+
+    @abstractmethod
+    async def save(self, state: AgentState) -> None:
+        """
+        Añade lo nuevo desde el último `save` (sin reescribir el estado
+        completo). Lanza `SessionConflictError` si otro proceso ya escribió.
+        """
+        pass
+
+class ITokenizer(ABC):
+    """Puerto para contar tokens de texto (contabilidad del prompt)."""
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Número (o estimación) de tokens de `text` para el modelo del Router."""
+        pass
+
+class ISpan(ABC):
+    """Span de una fase del loop (router, skill, MCP...)."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Añade un atributo al span (p.ej. tokens, estado)."""
+        pass
+
+class ITracer(ABC):
+    """Puerto para trazas estructuradas del loop agentic."""
+
+    @abstractmethod
+    def span(self, name: str, **attributes: Any) -> ContextManager[ISpan]:
+        """Abre un span hijo del span activo; se cierra al salir del `with`."""
+        pass
+
+class _NullSpan(ISpan):
+    """Span vacío reutilizable: entrar, salir y `set` no hacen nada."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class NullTracer(ITracer):
+    """Tracer desactivado (por defecto): coste de una llamada y un singleton por span."""
+
+    def span(self, name: str, **attributes: Any) -> ISpan:
+        return _NULL_SPAN
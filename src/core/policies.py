@@ -5,6 +5,9 @@ MAX_STEPS = 6  # Máximo de ciclos Decidir -> Ejecutar -> Observar
 MAX_TOOL_CALLS = 10
 SKILL_TIMEOUT = 30  # segundos
 MCP_TIMEOUT = 60    # segundos
+MCP_TOOLS_RETRY = 30  # segundos sin reintentar `tools/list` tras un fallo (se duplica)
+MAX_PARALLEL_ACTIONS = 4  # Acciones de un batch ejecutándose a la vez
+MAX_BATCH_ACTIONS = 8  # Acciones por batch (el resto se descarta con error)
 
 # Seguridad
 ALLOW_DESTRUCTIVE_ACTIONS = False  # En POC, siempre False
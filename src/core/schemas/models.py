@@ -1,5 +1,10 @@
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Set
+from pydantic import BaseModel, Field, field_validator
+
+# Prefijo de los mensajes de observación inyectados en el historial
+OBSERVATION_PREFIX = "[SYSTEM OBSERVATION]"
+# Nombre de la Action de fallback cuando el Router no devuelve una decisión válida
+ROUTER_ERROR = "error_handler"
 
 
 class SkillMetadata(BaseModel):
@@ -10,12 +15,22 @@ class SkillMetadata(BaseModel):
     version: Optional[str] = "1.0.0"
 
 
+class ToolSchema(BaseModel):
+    """Tool externa descubierta vía MCP (`tools/list`)."""
+
+    name: str
+    description: str = ""
+    input_schema: Dict[str, Any] = Field(default_factory=dict)
+
+
 class SkillDoc(BaseModel):
     """Metadata Nivel 2: Instrucciones completas (Progressive Disclosure)."""
 
     metadata: SkillMetadata
     instructions: str  # Contenido del SKILL.md (sin frontmatter)
     entry_script: Optional[str] = None
+    # TTL (segundos) para cachear resultados de la skill; None = no idempotente
+    cache_ttl: Optional[float] = None
     references: List[str] = Field(
         default_factory=list
     )  # Nivel 3: Links a otros archivos
@@ -30,16 +45,50 @@ class ActionType(str, Enum):
     SKILL = "skill"
     TOOL = "tool"
     RESPOND = "respond"
+    BATCH = "batch"  # Varias acciones independientes en paralelo
 
 
 class Action(BaseModel):
     """Decisión estructurada del Router LLM."""
 
-    type: str  # skill | tool | respond
+    type: str  # skill | tool | respond | batch
     name: str
     args: Dict[str, Any] = Field(default_factory=dict)
     reason: str  # El "por qué" de la decisión (Chain of Thought)
     stop: bool = False
+    # Solo para type="batch": acciones skill/tool independientes entre sí
+    actions: List["Action"] = Field(default_factory=list)
+    # Tokens de la llamada al Router (telemetría; no se serializa ni se cachea)
+    usage: Optional[Dict[str, int]] = Field(default=None, exclude=True)
+
+    @field_validator("actions", mode="before")
+    @classmethod
+    def _default_nested_reason(cls, value: Any) -> Any:
+        # El `reason` del batch va en la acción padre: en las sub-acciones es opcional
+        if isinstance(value, list):
+            return [{"reason": "", **a} if isinstance(a, dict) else a for a in value]
+        return value
+
+    @property
+    def is_router_error(self) -> bool:
+        """Fallback del cliente LLM: la respuesta es el error, no una decisión."""
+        return self.stop and self.name == ROUTER_ERROR
+
+
+class BlobRef(BaseModel):
+    """
+    Referencia a un contenido grande guardado fuera de memoria (Nivel 3).
+    El cuerpo completo se recupera del IBlobStore solo cuando hace falta.
+    """
+
+    hash: str  # sha256 del contenido serializado
+    size: int  # bytes
+    preview: str
+    encoding: str = "text"  # text | json
+
+    def __str__(self) -> str:
+        # Forma en la que aparece en el historial del Router
+        return f"{self.preview}\n[... {self.size} bytes en el blob {self.hash[:16]}]"
 
 
 class Observation(BaseModel):
@@ -51,6 +100,28 @@ class Observation(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class PromptReport(BaseModel):
+    """Tamaño del historial antes de una llamada al Router y compactaciones aplicadas."""
+
+    step: int
+    tokens_before: int
+    tokens_after: int
+    budget: int
+    truncated: List[int] = Field(default_factory=list)  # índices en `history`
+    elided: List[int] = Field(default_factory=list)
+
+
+class SessionCursor(BaseModel):
+    """Cuánto de `AgentState` está ya persistido (ISessionStore y blob store)."""
+
+    messages: int = 0
+    observations: int = 0
+    snapshot: int = 0  # mensajes incluidos en el último snapshot
+    spilled: int = 0  # observaciones ya revisadas por el ObservationSpiller
+    # Mensajes ya persistidos que se reescribieron en memoria (compactación, volcado)
+    edited: Set[int] = Field(default_factory=set)
+
+
 class AgentState(BaseModel):
     """Estado volátil de la sesión (In-Memory)."""
 
@@ -60,17 +131,43 @@ class AgentState(BaseModel):
     observations: List[Observation] = Field(default_factory=list)
     # Catálogo cargado en Nivel 1 para el Router
     available_skills: List[SkillMetadata] = Field(default_factory=list)
+    # Tools MCP descubiertas en el handshake (sustituyen a tools.md)
+    available_tools: List[ToolSchema] = Field(default_factory=list)
     is_complete: bool = False
+    # Saltarse la caché de decisiones del Router en esta sesión
+    bypass_cache: bool = False
+    # Un informe por llamada al Router (si hay compactador de historial)
+    prompt_reports: List[PromptReport] = Field(default_factory=list)
+    # Progreso de la persistencia incremental (no forma parte del estado lógico)
+    cursor: SessionCursor = Field(default_factory=SessionCursor, exclude=True)
 
     def add_message(self, role: str, content: str):
         self.history.append({"role": role, "content": content})
 
+    def replace_message(self, index: int, content: str):
+        """Reescribe un mensaje del historial; si ya estaba persistido, queda marcado."""
+        self.history[index] = {**self.history[index], "content": content}
+        if index < self.cursor.messages:
+            self.cursor.edited.add(index)
+
     def add_observation(self, observation: Observation):
         self.observations.append(observation)
         # Inyectamos el resultado en el historial.
         # Usamos role 'user' con un prefijo claro porque algunos modelos
         # ignoran mensajes 'system' en mitad de la conversación.
-        prefix = "SUCCESS" if observation.status == "success" else "ERROR"
-        msg = f"[SYSTEM OBSERVATION] Result from {observation.origin} ({prefix}):\n{observation.content}"
-        self.add_message("user", msg)
+        self.add_message("user", self.format_observation(observation))
+        self.steps += 1
+
+    def add_observations(self, observations: List[Observation]):
+        """Inyecta los resultados de un batch en un único mensaje (cuenta como un paso)."""
+        self.observations.extend(observations)
+        self.add_message(
+            "user", "\n\n".join(self.format_observation(o) for o in observations)
+        )
         self.steps += 1
+
+    @staticmethod
+    def format_observation(observation: Observation) -> str:
+        """Bloque de una observación en el historial (un batch los une con una línea en blanco)."""
+        prefix = "SUCCESS" if observation.status == "success" else "ERROR"
+        return f"{OBSERVATION_PREFIX} Result from {observation.origin} ({prefix}):\n{observation.content}"
@@ -0,0 +1,248 @@
+"""
+Modo batch offline: ejecuta un JSONL de prompts contra el orquestador.
+
+Uso:
+  uv run python -m src.endpoints.cli.batch prompts.jsonl -o results.jsonl -c 8
+
+Cada línea de entrada es un objeto con un id (`id` o `request_id`) y un
+prompt (`prompt`, `message` o `body`). La entrada se lee en streaming y
+cada resultado se añade al fichero de salida en cuanto termina. Si el
+fichero de salida ya existe, se saltan los ids que terminaron con
+`status="ok"` (reanudación); los fallidos se vuelven a ejecutar.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from src.core.schemas.models import Action, ActionType
+from src.services.orchestrator import Orchestrator
+
+logger = logging.getLogger(__name__)
+
+ID_FIELDS = ("id", "request_id")
+PROMPT_FIELDS = ("prompt", "message", "body")
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    skipped: int = 0
+    ok: int = 0
+    errors: int = 0
+    invalid: int = 0
+    elapsed_s: float = 0.0
+    failed_ids: list = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "ok": self.ok,
+            "errors": self.errors,
+            "invalid": self.invalid,
+            "elapsed_s": round(self.elapsed_s, 3),
+        }
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """Ids ya resueltos en la salida (una línea final cortada se ignora)."""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if record["status"] == "ok":
+                    done.add(str(record["id"]))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+    return done
+
+
+def iter_prompts(input_path: str) -> Iterator[Tuple[Optional[str], Optional[str], int]]:
+    """Genera (id, prompt, nº de línea) sin cargar el fichero en memoria."""
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield None, None, line_no
+                continue
+            if not isinstance(record, dict):
+                yield None, None, line_no
+                continue
+            record_id = next((record[k] for k in ID_FIELDS if record.get(k) is not None), line_no)
+            prompt = next((record[k] for k in PROMPT_FIELDS if isinstance(record.get(k), str)), None)
+            yield str(record_id), prompt, line_no
+
+
+class _OutputWriter:
+    """Append-only: una línea JSON por resultado, con flush inmediato."""
+
+    def __init__(self, path: str):
+        needs_newline = os.path.exists(path) and os.path.getsize(path) > 0 and not _ends_with_newline(path)
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            # Un corte a mitad de línea no debe corromper el siguiente registro
+            self._file.write("\n")
+
+    def write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+async def run_one(
+    orchestrator: Orchestrator,
+    record_id: str,
+    prompt: str,
+    timeout: Optional[float] = None,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Ejecuta un prompt y devuelve su registro de salida (con traza por paso).
+
+    Cada registro es una conversación nueva: la sesión lleva el `run_id` de
+    la ejecución para no reanudar la de una pasada anterior con el mismo id.
+    """
+    session_id = f"batch-{run_id or uuid.uuid4().hex[:12]}-{record_id}"
+    steps = []
+    final: Optional[Action] = None
+    start = last = time.perf_counter()
+
+    async def on_step(step, action):
+        nonlocal last, final
+        final = action
+        now = time.perf_counter()
+        steps.append(
+            {
+                "step": step,
+                "type": action.type,
+                "name": action.name,
+                "reason": action.reason,
+                "elapsed_ms": round((now - last) * 1000, 1),
+            }
+        )
+        last = now
+
+    record: Dict[str, Any] = {"id": record_id, "prompt": prompt}
+    try:
+        response = await asyncio.wait_for(
+            orchestrator.chat(prompt, on_step_cb=on_step, session_id=session_id),
+            timeout,
+        )
+        # El fallback de error del Router y el aviso de límite de pasos llegan
+        # como una respuesta normal: se distinguen por la última decisión
+        failed = final is not None and (
+            final.is_router_error or (final.type != ActionType.RESPOND and not final.stop)
+        )
+        if failed:
+            record.update(status="error", error=response)
+        else:
+            record.update(status="ok", response=response)
+    except asyncio.TimeoutError:
+        record.update(status="error", error=f"Timeout ({timeout}s)")
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    record["steps"] = steps
+    return record
+
+
+async def run_batch(
+    orchestrator: Orchestrator,
+    input_path: str,
+    output_path: str,
+    concurrency: int = 4,
+    timeout: Optional[float] = None,
+) -> BatchSummary:
+    """
+    Procesa `input_path` con `concurrency` sesiones en paralelo. La cola
+    entre lector y workers está acotada, así que la memoria no depende del
+    tamaño de la entrada.
+    """
+    summary = BatchSummary()
+    started = time.perf_counter()
+    run_id = uuid.uuid4().hex[:12]
+    done = completed_ids(output_path)
+    writer = _OutputWriter(output_path)
+    queue: "asyncio.Queue[Optional[Tuple[str, str]]]" = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            record = await run_one(orchestrator, *item, timeout=timeout, run_id=run_id)
+            writer.write(record)
+            if record["status"] == "ok":
+                summary.ok += 1
+            else:
+                summary.errors += 1
+                summary.failed_ids.append(record["id"])
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        for record_id, prompt, line_no in iter_prompts(input_path):
+            summary.total += 1
+            if prompt is None:
+                summary.invalid += 1
+                logger.warning("Línea %d sin prompt válido, se ignora", line_no)
+                continue
+            if record_id in done:
+                summary.skipped += 1
+                continue
+            # Los ids repetidos dentro de la misma entrada se ejecutan una sola vez
+            done.add(record_id)
+            await queue.put((record_id, prompt))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        writer.close()
+
+    summary.elapsed_s = time.perf_counter() - started
+    return summary
+
+
+async def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Ejecuta un JSONL de prompts en modo batch.")
+    parser.add_argument("input", help="JSONL de entrada (id + prompt por línea)")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL de resultados")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=None, help="Timeout por prompt (s)")
+    args = parser.parse_args(argv)
+
+    from src.bootstrap import AppContainer
+    from src.settings import settings
+
+    # Cada registro es una conversación de un solo turno: persistirla solo llena el disco
+    settings.SESSION_STORE = "off"
+    container = AppContainer()
+    await container.prewarm()
+    summary = await run_batch(
+        container.orchestrator, args.input, args.output, args.concurrency, args.timeout
+    )
+    print(json.dumps(summary.as_dict()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
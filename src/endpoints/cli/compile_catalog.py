@@ -0,0 +1,23 @@
+import argparse
+import time
+from src.infrastructure.storage.catalog_snapshot import write_snapshot
+from src.infrastructure.storage.fs_skill_store import FSSkillStore
+from src.settings import settings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Precompila el catálogo de skills en un snapshot para arranque rápido."
+    )
+    parser.add_argument("--skills-dir", default=settings.SKILLS_DIR)
+    parser.add_argument("--output", default=settings.SKILLS_SNAPSHOT)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = write_snapshot(FSSkillStore(args.skills_dir), args.output)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Snapshot escrito en {args.output}: {count} skills ({elapsed_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,20 @@
+import argparse
 import asyncio
 import sys
+import uuid
 from rich.console import Console
 from rich.panel import Panel
-from rich.live import Live
-from rich.markdown import Markdown
-from src.bootstrap import bootstrap
+from src.bootstrap import AppContainer
+from src.settings import settings
 
 console = Console()
 
 
-async def main():
-    # 1. Inicializar la aplicación vía Bootstrap
-    orchestrator = bootstrap()
+async def main(session_id: str):
+    # 1. Contenedor perezoso: el prewarm (imports pesados, cliente LLM)
+    # corre en segundo plano mientras el usuario escribe el primer mensaje
+    container = AppContainer()
+    container.start_prewarm()
 
     console.print(
         Panel(
@@ -20,10 +23,14 @@ async def main():
             title="Antigravity Agent",
         )
     )
-    console.print("[italic]Escribe 'salir' para terminar la sesión.[/italic]\n")
+    console.print("[italic]Escribe 'salir' para terminar la sesión.[/italic]")
+    if settings.SESSION_STORE != "off":
+        console.print(f"[dim]Sesión: {session_id} (reanúdala con --session {session_id})[/dim]")
+    console.print()
 
     while True:
-        user_input = console.input("[bold green]Usuario:[/bold green] ")
+        # La lectura bloqueante va a un hilo para no parar el prewarm
+        user_input = await asyncio.to_thread(console.input, "[bold green]Usuario:[/bold green] ")
 
         if user_input.lower() in ["salir", "exit", "quit"]:
             console.print("[yellow]Adiós![/yellow]")
@@ -32,21 +39,43 @@ async def main():
         if not user_input.strip():
             continue
 
+        await container.ready()
+        orchestrator = container.orchestrator
+
         with console.status(
             "[bold yellow]El agente está razonando...[/bold yellow]", spinner="dots"
-        ):
+        ) as status:
             try:
+                streamed: list[str] = []
 
                 async def on_step(step, action):
                     console.print(
                         f"[dim]Step {step}: {action.reason} ({action.type}:{action.name})[/dim]"
                     )
 
+                async def on_token(token):
+                    # Con LLM_STREAM la respuesta se pinta según llega
+                    if not streamed:
+                        status.stop()
+                        console.print("\n[bold blue]Agente:[/bold blue]")
+                    streamed.append(token)
+                    console.out(token, end="", highlight=False)
+
                 # Ejecutar el loop agentic
-                response = await orchestrator.chat(user_input, on_step_cb=on_step)
+                response = await orchestrator.chat(
+                    user_input, on_step_cb=on_step, on_token_cb=on_token, session_id=session_id
+                )
+
+                if streamed:
+                    console.print()
+                # Si el stream falló a medias, la respuesta final (p.ej. la del
+                # error_handler) no coincide con lo pintado: se muestra entera
+                if "".join(streamed).strip() != response.strip():
+                    from rich.markdown import Markdown
 
-                console.print("\n[bold blue]Agente:[/bold blue]")
-                console.print(Markdown(response))
+                    if not streamed:
+                        console.print("\n[bold blue]Agente:[/bold blue]")
+                    console.print(Markdown(response))
                 console.print("-" * 40 + "\n")
 
             except Exception as e:
@@ -54,8 +83,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CLI interactiva del agente")
+    parser.add_argument("--session", help="Id de una sesión guardada que reanudar")
+    args = parser.parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(args.session or uuid.uuid4().hex))
     except KeyboardInterrupt:
         console.print("\n[yellow]Proceso interrumpido por el usuario.[/yellow]")
         sys.exit(0)
@@ -0,0 +1,284 @@
+"""
+Servidor HTTP asyncio multi-sesión (sin dependencias externas).
+
+Endpoints:
+  POST /chat          {"message": "...", "session_id": "..."} -> JSON con la respuesta
+  POST /chat/stream   igual, pero emite eventos SSE: step, token, done, error
+  GET  /health        estado del control de admisión
+  GET  /metrics       métricas en formato texto de Prometheus (METRICS_ENABLED)
+
+Uso: uv run python -m src.endpoints.http.server
+"""
+import asyncio
+import json
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from src.core.interfaces.ports import SessionConflictError
+from src.endpoints.http.admission import AdmissionController, AdmissionRejected
+from src.infrastructure.observability.metrics import PrometheusMetrics
+from src.services.orchestrator import Orchestrator
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+READ_TIMEOUT = 10  # segundos para recibir cabeceras y cuerpo
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _SessionLocks:
+    """Un lock por sesión: los turnos de una misma sesión no se solapan."""
+
+    def __init__(self):
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def hold(self, session_id: str):
+        lock, users = self._locks.get(session_id) or (asyncio.Lock(), 0)
+        self._locks[session_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[session_id]
+            if users <= 1:
+                del self._locks[session_id]
+            else:
+                self._locks[session_id] = (lock, users - 1)
+
+
+class ChatServer:
+    """
+    Sirve muchas sesiones concurrentes desde un único proceso reutilizando
+    un mismo orquestador (un cliente LLM, un pool MCP, un índice de skills).
+    Cada petición trabaja sobre su propio `AgentState`.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_concurrency: int = 16,
+        max_queue: int = 64,
+        metrics: Optional[PrometheusMetrics] = None,
+    ):
+        self.orchestrator = orchestrator
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.admission = AdmissionController(max_concurrency, max_queue)
+        self._sessions = _SessionLocks()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Con port=0 el SO asigna uno libre (tests)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Servidor HTTP escuchando en http://%s:%s", self.host, self.port)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, body = await asyncio.wait_for(self._read_request(reader), READ_TIMEOUT)
+            await self._route(method, path, body, writer)
+        except HTTPError as e:
+            await self._send_json(writer, e.status, {"error": e.message})
+        except asyncio.TimeoutError:
+            await self._send_json(writer, HTTPStatus.REQUEST_TIMEOUT, {"error": "Timeout"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.exception("Error atendiendo petición HTTP")
+            await self._send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Petición HTTP no válida")
+        method, path, _ = parts
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", "0") or 0)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], body
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter):
+        if method == "GET" and path == "/health":
+            await self._send_json(writer, HTTPStatus.OK, {"status": "ok", **self.admission.as_dict()})
+            return
+        if method == "GET" and path == "/metrics" and self.metrics:
+            await self._send_text(writer, HTTPStatus.OK, self.metrics.render(), PrometheusMetrics.CONTENT_TYPE)
+            return
+        if method == "POST" and path in ("/chat", "/chat/stream"):
+            message, session_id = self._parse_chat(body)
+            try:
+                # Primero el lock de sesión: un turno en cola tras otro de su
+                # misma sesión no ocupa capacidad global mientras espera
+                async with self._sessions.hold(session_id):
+                    async with self.admission.slot():
+                        if path == "/chat":
+                            await self._chat(writer, message, session_id)
+                        else:
+                            await self._chat_stream(writer, message, session_id)
+            except AdmissionRejected:
+                await self._send_json(
+                    writer,
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                    {"error": "Servidor saturado, reintenta más tarde."},
+                    extra_headers={"Retry-After": "1"},
+                )
+            return
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Ruta no encontrada: {method} {path}")
+
+    @staticmethod
+    def _parse_chat(body: bytes) -> Tuple[str, str]:
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON no válido")
+        message = payload.get("message") if isinstance(payload, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Falta el campo 'message'")
+        session_id = payload.get("session_id") or uuid.uuid4().hex
+        return message, str(session_id)
+
+    async def _chat(self, writer: asyncio.StreamWriter, message: str, session_id: str):
+        try:
+            response = await self.orchestrator.chat(message, session_id=session_id)
+        except SessionConflictError as e:
+            # Otro proceso escribió la sesión: el cliente debe reintentar el turno
+            raise HTTPError(HTTPStatus.CONFLICT, str(e))
+        await self._send_json(writer, HTTPStatus.OK, {"session_id": session_id, "response": response})
+
+    async def _chat_stream(self, writer: asyncio.StreamWriter, message: str, session_id: str):
+        writer.write(
+            self._head(
+                HTTPStatus.OK,
+                {"Content-Type": "text/event-stream", "Cache-Control": "no-cache"},
+            )
+        )
+        connected = True
+
+        async def emit(event: str, data: dict):
+            # Si el cliente se desconecta, la sesión termina igualmente pero sin escribir
+            nonlocal connected
+            if not connected:
+                return
+            try:
+                writer.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode())
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+        async def on_step(step, action):
+            await emit(
+                "step",
+                {"step": step, "type": action.type, "name": action.name, "reason": action.reason},
+            )
+
+        async def on_token(token):
+            await emit("token", {"text": token})
+
+        try:
+            response = await self.orchestrator.chat(
+                message, on_step_cb=on_step, on_token_cb=on_token, session_id=session_id
+            )
+            await emit("done", {"session_id": session_id, "response": response})
+        except Exception as e:
+            logger.exception("Error en la sesión %s", session_id)
+            await emit("error", {"session_id": session_id, "error": str(e)})
+
+    @staticmethod
+    def _head(status: HTTPStatus, headers: Dict[str, str]) -> bytes:
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: dict,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": str(len(body)),
+            **(extra_headers or {}),
+        }
+        try:
+            writer.write(self._head(status, headers) + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _send_text(self, writer: asyncio.StreamWriter, status: HTTPStatus, text: str, content_type: str):
+        body = text.encode("utf-8")
+        headers = {"Content-Type": content_type, "Content-Length": str(len(body))}
+        try:
+            writer.write(self._head(status, headers) + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def main():
+    from src.bootstrap import AppContainer
+    from src.settings import settings
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    container = AppContainer()
+    await container.prewarm()
+    server = ChatServer(
+        container.orchestrator,
+        host=settings.HTTP_HOST,
+        port=settings.HTTP_PORT,
+        max_concurrency=settings.HTTP_MAX_CONCURRENCY,
+        max_queue=settings.HTTP_MAX_QUEUE,
+        metrics=container.metrics,
+    )
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
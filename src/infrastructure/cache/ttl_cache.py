@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class MemoryTTLCache:
+    """LRU acotado en memoria con TTL por entrada."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteTTLCache:
+    """Tier persistente en SQLite (valores JSON) con TTL por entrada."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_entry(key)[0]
+
+    def get_entry(self, key: str) -> Tuple[Optional[Any], float]:
+        """Devuelve (valor, expires_at) o (None, 0) si no hay entrada vigente."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, 0.0
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None, 0.0
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + ttl),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """
+    Caché de dos niveles: LRU en memoria delante de un tier SQLite opcional.
+    Los aciertos en disco se promocionan a memoria. Los valores deben ser
+    serializables a JSON. Las llamadas a SQLite van a un hilo para no
+    bloquear el event loop; los aciertos en memoria no salen de él.
+    """
+
+    def __init__(self, memory: MemoryTTLCache, disk: Optional[SQLiteTTLCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Tuple[Optional[Any], Optional[str]]:
+        """Devuelve (valor, tier) o (None, None) si no hay entrada vigente."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value, "memory"
+        if self.disk is not None:
+            value, expires_at = await asyncio.to_thread(self.disk.get_entry, key)
+            if value is not None:
+                self.memory.set(key, value, ttl=expires_at - time.time())
+                self.hits += 1
+                return value, "sqlite"
+        self.misses += 1
+        return None, None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value, ttl)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import logging
+from typing import Optional
+from src.core.interfaces.ports import ILLMClient, LLMEventCallback
+from src.core.schemas.models import Action, ActionType, AgentState
+from src.infrastructure.cache.ttl_cache import TieredCache
+from src.infrastructure.runners.cached_runner import canonicalize_args
+
+logger = logging.getLogger(__name__)
+
+
+class CachedLLMClient(ILLMClient):
+    """
+    Decorador de ILLMClient con caché de decisiones del Router.
+
+    Con `temperature=0` y salida JSON, el mismo prompt produce la misma
+    Action. La clave es (modelo, huella del system prompt, historial
+    normalizado); las respuestas finales y las decisiones intermedias tienen
+    TTL distintos. No se cachean los errores del Router, y
+    `AgentState.bypass_cache` fuerza la llamada real.
+    """
+
+    def __init__(
+        self,
+        inner: ILLMClient,
+        cache: TieredCache,
+        ttl: float = 3600,
+        answer_ttl: float = 600,
+    ):
+        self.inner = inner
+        self.cache = cache
+        self.ttl = ttl
+        self.answer_ttl = answer_ttl
+
+    def cache_key(self, state: AgentState) -> str:
+        fingerprint = getattr(self.inner, "prompt_fingerprint", None)
+        if fingerprint:
+            prompt = fingerprint(state)
+        else:
+            # Cliente sin huella de prompt: el catálogo visible identifica el prompt
+            prompt = [
+                [(s.name, s.description) for s in state.available_skills],
+                [(t.name, t.description) for t in state.available_tools],
+            ]
+        payload = json.dumps(
+            [
+                getattr(self.inner, "model", ""),
+                prompt,
+                [[m["role"], canonicalize_args(m["content"])] for m in state.history],
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return "router:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, action: Action) -> float:
+        return self.answer_ttl if action.type == ActionType.RESPOND else self.ttl
+
+    async def ask(
+        self, state: AgentState, on_event: Optional[LLMEventCallback] = None
+    ) -> Action:
+        if state.bypass_cache:
+            return await self.inner.ask(state, on_event=on_event)
+
+        key = self.cache_key(state)
+        cached, tier = await self.cache.get(key)
+        if cached is not None:
+            logger.debug("Decisión del Router desde caché (%s)", tier)
+            action = Action(**cached)
+            if on_event:
+                await self._replay(action, on_event)
+            return action
+
+        action = await self.inner.ask(state, on_event=on_event)
+        # `stop` sin respuesta válida es el fallback de error del cliente: no se cachea
+        if not action.is_router_error:
+            await self.cache.set(key, action.model_dump(), ttl=self.ttl_for(action))
+        return action
+
+    @staticmethod
+    async def _replay(action: Action, on_event: LLMEventCallback):
+        """Emite los mismos eventos que un stream para que los consumidores no distingan."""
+        await on_event("type", action.type)
+        await on_event("name", action.name)
+        response = action.args.get("response")
+        if action.type == ActionType.RESPOND and isinstance(response, str):
+            await on_event("token", response)
+        await on_event("args", action.args)
+
+    def __getattr__(self, name: str):
+        # Delegamos atributos del cliente real (prompt_tracker, model...)
+        return getattr(self.inner, name)
@@ -0,0 +1,136 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+# Eventos emitidos durante el streaming de una Action:
+#   ("type", str) / ("name", str)  -> campos de primer nivel en cuanto se completan
+#   ("args", dict)                 -> objeto `args` completo
+#   ("token", str)                 -> fragmento decodificado de `args.response`
+StreamEvent = Tuple[str, Any]
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_EARLY_FIELDS = ("type", "name")
+
+
+class _Frame:
+    __slots__ = ("kind", "key", "expect_key", "start")
+
+    def __init__(self, kind: str, start: int):
+        self.kind = kind  # "obj" | "arr"
+        self.key: Optional[str] = None
+        self.expect_key = kind == "obj"
+        self.start = start
+
+
+class IncrementalActionParser:
+    """
+    Parser JSON incremental para la Action del Router.
+
+    Procesa el texto a trozos (tal como llega del stream) y emite eventos en
+    cuanto se conocen `type`/`name`, cuando `args` está completo y por cada
+    fragmento de `args.response`, sin esperar al final del objeto.
+    """
+
+    def __init__(self):
+        self.buffer: List[str] = []
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._string_chars: List[str] = []
+        self._escape: Optional[str] = None  # None | "" | "u" + hex
+        self._high_surrogate: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.buffer)
+
+    def feed(self, chunk: str) -> List[StreamEvent]:
+        events: List[StreamEvent] = []
+        self.buffer.append(chunk)
+        for char in chunk:
+            if self._in_string:
+                self._feed_string_char(char, events)
+            else:
+                self._feed_structural_char(char, events)
+            self._pos += 1
+        return events
+
+    def result(self) -> dict:
+        """Objeto JSON completo (valida el texto acumulado)."""
+        return json.loads(self.text)
+
+    def _streaming_response(self) -> bool:
+        """True si el string actual es el valor de `args.response`."""
+        return (
+            not self._string_is_key
+            and len(self._stack) == 2
+            and self._stack[0].key == "args"
+            and self._stack[1].kind == "obj"
+            and self._stack[1].key == "response"
+        )
+
+    def _emit_char(self, value: str, events: List[StreamEvent]):
+        self._string_chars.append(value)
+        if self._streaming_response():
+            if events and events[-1][0] == "token":
+                events[-1] = ("token", events[-1][1] + value)
+            else:
+                events.append(("token", value))
+
+    def _feed_string_char(self, char: str, events: List[StreamEvent]):
+        if self._escape is not None:
+            if self._escape == "" and char != "u":
+                self._escape = None
+                self._emit_char(_ESCAPES.get(char, char), events)
+                return
+            self._escape += char
+            if len(self._escape) < 5:
+                return
+            code = int(self._escape[1:], 16)
+            self._escape = None
+            if 0xD800 <= code <= 0xDBFF:
+                self._high_surrogate = code
+                return
+            if self._high_surrogate is not None and 0xDC00 <= code <= 0xDFFF:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._emit_char(chr(code), events)
+            return
+
+        if char == "\\":
+            self._escape = ""
+        elif char == '"':
+            self._in_string = False
+            self._end_string(events)
+        else:
+            self._emit_char(char, events)
+
+    def _end_string(self, events: List[StreamEvent]):
+        value = "".join(self._string_chars)
+        self._string_chars = []
+        frame = self._stack[-1] if self._stack else None
+        if frame is None:
+            return
+        if self._string_is_key:
+            frame.key = value
+            frame.expect_key = False
+        elif len(self._stack) == 1 and frame.key in _EARLY_FIELDS:
+            events.append((frame.key, value))
+
+    def _feed_structural_char(self, char: str, events: List[StreamEvent]):
+        frame = self._stack[-1] if self._stack else None
+        if char == '"':
+            self._in_string = True
+            self._string_is_key = bool(frame and frame.kind == "obj" and frame.expect_key)
+        elif char in "{[":
+            self._stack.append(_Frame("obj" if char == "{" else "arr", self._pos))
+        elif char in "}]":
+            closed = self._stack.pop() if self._stack else None
+            parent = self._stack[-1] if self._stack else None
+            if closed and parent and len(self._stack) == 1 and parent.key == "args":
+                try:
+                    events.append(("args", json.loads(self.text[closed.start : self._pos + 1])))
+                except json.JSONDecodeError:
+                    pass
+        elif char == "," and frame and frame.kind == "obj":
+            frame.expect_key = True
@@ -1,83 +1,246 @@
-import os
+import hashlib
 import json
-from openai import AsyncOpenAI
-from src.core.interfaces.ports import ILLMClient
-from src.core.schemas.models import AgentState, Action, SkillMetadata
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+from src.core.interfaces.ports import ILLMClient, LLMEventCallback
+from src.core.schemas.models import ROUTER_ERROR, AgentState, Action, SkillMetadata, ToolSchema
+from src.infrastructure.llm.json_stream import IncrementalActionParser
+from src.infrastructure.llm.prompt_cache import PromptReuseTracker, WorkspaceFileCache
 from src.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 class OpenAIClient(ILLMClient):
     """
     Cliente LLM que utiliza la API de OpenAI (o compatibles).
     Actúa como el 'Router' que decide la siguiente acción.
+
+    El system prompt se arma como un prefijo estático byte-idéntico (soul,
+    tools e instrucciones de formato) seguido de la sección de skills, para
+    que el caché de prompts del proveedor pueda reutilizarlo entre pasos.
     """
 
     def __init__(self):
-        self.client = AsyncOpenAI(
-            api_key=settings.LLM_API_KEY, base_url=settings.LLM_BASE_URL
-        )
+        self._client = None
         self.model = settings.LLM_MODEL
+        self.stream = settings.LLM_STREAM
+        self._files = WorkspaceFileCache(settings.WORKSPACE_DIR)
+        self._prefix_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._skills_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        # Última combinación (skills, tools, soul, tools.md) -> (prefijo, sección)
+        self._last_parts: Optional[tuple] = None
+        self.prompt_tracker = PromptReuseTracker()
 
-    async def ask(self, state: AgentState) -> Action:
-        # 1. Cargar contexto del Workspace (Soul + Skills Metadata)
-        soul_content = self._load_workspace_file("soul.md")
-        tools_content = self._load_workspace_file("tools.md")
+    @property
+    def client(self):
+        """`AsyncOpenAI` creado en el primer uso: importar `openai` cuesta ~0,5 s."""
+        if self._client is None:
+            from openai import AsyncOpenAI
 
-        # 2. Construir el System Prompt
-        system_prompt = self._build_system_prompt(
-            soul_content, tools_content, state.available_skills
+            self._client = AsyncOpenAI(
+                api_key=settings.LLM_API_KEY, base_url=settings.LLM_BASE_URL
+            )
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    async def ask(
+        self, state: AgentState, on_event: Optional[LLMEventCallback] = None
+    ) -> Action:
+        # 1-2. Contexto del Workspace + System Prompt (cacheados)
+        prefix, skills_section = self._system_prompt_parts(state)
+        system_prompt = prefix + skills_section
+
+        # Métrica: bytes reutilizables (prefijo idéntico) vs re-enviados
+        step = self.prompt_tracker.record(
+            state.session_id,
+            [prefix, skills_section, *(m["role"] + m["content"] for m in state.history)],
         )
+        logger.debug("Prompt paso %s: %s", state.steps, step)
 
         # 3. Llamada al LLM con salida JSON estricta
+        messages = [{"role": "system", "content": system_prompt}, *state.history]
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "system", "content": system_prompt}, *state.history],
-                response_format={"type": "json_object"},
-                temperature=0,  # Necesitamos precisión para el routing
-            )
+            if self.stream:
+                action_data, usage = await self._ask_streaming(messages, on_event)
+            else:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0,  # Necesitamos precisión para el routing
+                )
 
-            raw_content = response.choices[0].message.content
-            action_data = json.loads(raw_content)
+                raw_content = response.choices[0].message.content
+                action_data = json.loads(raw_content)
+                usage = response.usage
 
             # Validación vía Pydantic (si falla, levanta ValidationError)
-            return Action(**action_data)
+            action = Action(**action_data)
+            action.usage = self._usage_dict(usage)
+            return action
 
         except Exception as e:
             # Fallback seguro: responder al usuario con el error
             return Action(
                 type="respond",
-                name="error_handler",
+                name=ROUTER_ERROR,
                 args={"response": f"Error en el Router LLM: {str(e)}"},
                 reason="Falla técnica en la comunicación con el LLM.",
                 stop=True,
             )
 
+    async def _ask_streaming(
+        self, messages: list[dict], on_event: Optional[LLMEventCallback]
+    ) -> tuple[dict, Any]:
+        """Streaming con parseo incremental: emite type/name/args/tokens al llegar."""
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parser = IncrementalActionParser()
+        usage = None
+        async for chunk in stream:
+            # El último chunk trae `usage` (y normalmente `choices` vacío)
+            usage = getattr(chunk, "usage", None) or usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for kind, data in parser.feed(delta):
+                if on_event:
+                    await on_event(kind, data)
+        return parser.result(), usage
+
+    @staticmethod
+    def _usage_dict(usage: Any) -> Optional[dict]:
+        if usage is None:
+            return None
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+    def prompt_fingerprint(self, state: AgentState) -> str:
+        """Hash del system prompt que recibiría `state` (cambia si cambian soul, tools o skills)."""
+        prefix, skills_section = self._system_prompt_parts(state)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(prefix.encode("utf-8"))
+        digest.update(skills_section.encode("utf-8"))
+        return digest.hexdigest()
+
     def _load_workspace_file(self, filename: str) -> str:
-        path = os.path.join(settings.WORKSPACE_DIR, filename)
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
-        return ""
+        return self._files.read(filename)
+
+    def _system_prompt_parts(self, state: AgentState) -> tuple[str, str]:
+        """
+        Devuelve (prefijo estático, sección de skills), ambos cacheados.
+
+        Entre pasos de un mismo turno el estado conserva las mismas listas de
+        skills y tools: se comparan por identidad para no recorrer el catálogo
+        en cada llamada. Solo con listas nuevas se calcula la clave completa.
+        """
+        soul_content = self._load_workspace_file("soul.md")
+        # Las tools descubiertas vía MCP mandan; tools.md queda como fallback
+        tools_md = None if state.available_tools else self._load_workspace_file("tools.md")
+
+        last = self._last_parts
+        if (
+            last is not None
+            and last[0] is state.available_skills
+            and last[1] is state.available_tools
+            and last[2] == soul_content
+            and last[3] == tools_md
+        ):
+            return last[4], last[5]
+
+        if state.available_tools:
+            tools_key = tuple((t.name, t.description, str(t.input_schema)) for t in state.available_tools)
+        else:
+            tools_key = ("tools.md", tools_md)
+
+        prefix_key = (soul_content, tools_key)
+        prefix = self._cached(self._prefix_cache, prefix_key)
+        if prefix is None:
+            tools_content = (
+                self._render_tools(state.available_tools)
+                if state.available_tools
+                else tools_md
+            )
+            prefix = self._build_static_prefix(soul_content, tools_content)
+            self._store(self._prefix_cache, prefix_key, prefix)
+
+        skills_key = tuple((s.name, s.description) for s in state.available_skills)
+        skills_section = self._cached(self._skills_cache, skills_key)
+        if skills_section is None:
+            skills_section = self._build_skills_section(state.available_skills)
+            self._store(self._skills_cache, skills_key, skills_section)
+
+        # Se guardan las listas (no su id) para que no se reutilice la identidad
+        self._last_parts = (
+            state.available_skills, state.available_tools, soul_content, tools_md, prefix, skills_section
+        )
+        return prefix, skills_section
+
+    @staticmethod
+    def _cached(cache: OrderedDict, key: tuple):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _store(cache: OrderedDict, key: tuple, value: str, max_entries: int = 64):
+        cache[key] = value
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    def _render_tools(self, tools: list[ToolSchema]) -> str:
+        lines = []
+        for tool in tools:
+            lines.append(f"- **{tool.name}**: {tool.description}")
+            properties = tool.input_schema.get("properties", {})
+            if properties:
+                args = ", ".join(
+                    f"`{name}: {spec.get('type', 'any')}`" for name, spec in properties.items()
+                )
+                lines.append(f"  - Args: {args}")
+        return "\n".join(lines)
 
     def _build_system_prompt(
         self, soul: str, tools: str, skills: list[SkillMetadata]
     ) -> str:
+        return self._build_static_prefix(soul, tools) + self._build_skills_section(skills)
+
+    def _build_skills_section(self, skills: list[SkillMetadata]) -> str:
         skills_summary = "\n".join([f"- {s.name}: {s.description}" for s in skills])
 
+        return f"""
+## Habilidades Disponibles (Agent Skills - Nivel 1)
+{skills_summary}
+"""
+
+    def _build_static_prefix(self, soul: str, tools: str) -> str:
+        # Todo lo que no depende del catálogo va primero para que sea byte-estable
         return f"""
 {soul}
 
 ## Herramientas Externas (MCP)
 {tools}
 
-## Habilidades Disponibles (Agent Skills - Nivel 1)
-{skills_summary}
-
 ## Instrucciones de Respuesta - FORMATO JSON ESTRICTO
 Debes responder SIEMPRE con un objeto JSON que siga esta estructura exacta:
 {{
-  "type": "skill" | "tool" | "respond",
+  "type": "skill" | "tool" | "respond" | "batch",
   "name": "nombre_de_la_skill_o_tool",
   "args": {{
     "parametro_1": "valor"
@@ -91,6 +254,7 @@ Debes responder SIEMPRE con un objeto JSON que siga esta estructura exacta:
 2. NO omitas los campos "type", "name", "args" o "reason". Son OBLIGATORIOS.
 3. Si quieres responder al usuario, usa "type": "respond", "name": "final_answer" y pon tu respuesta en "args": {{"response": "..."}}.
 4. Si una skill no devuelve la información tras 1 o 2 intentos, admítelo y responde al usuario.
+5. Si necesitas varias skills/tools INDEPENDIENTES entre sí (p. ej. el tiempo en varias ciudades), usa "type": "batch", "name": "batch" y lista cada acción en "actions": [{{"type": "skill", "name": "...", "args": {{...}}, "reason": "..."}}, ...]. Se ejecutan en paralelo y recibirás todos los resultados juntos.
 
 ### Ejemplo:
 {{
@@ -0,0 +1,110 @@
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+class WorkspaceFileCache:
+    """
+    Caché de ficheros del workspace (soul.md, tools.md) invalidada por
+    cambio de `mtime`/tamaño: en cada paso solo se hace un `stat`.
+    """
+
+    def __init__(self, workspace_dir: str):
+        self.workspace_dir = workspace_dir
+        self._files: Dict[str, Tuple[Optional[Tuple[int, int]], str]] = {}
+        self.reloads = 0
+
+    def read(self, filename: str) -> str:
+        path = os.path.join(self.workspace_dir, filename)
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+
+        cached = self._files.get(filename)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        content = ""
+        if signature is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+        self._files[filename] = (signature, content)
+        self.reloads += 1
+        return content
+
+
+@dataclass
+class PromptStats:
+    """Bytes enviados al LLM por paso: reutilizables (prefijo idéntico) vs re-enviados."""
+
+    steps: int = 0
+    bytes_total: int = 0
+    bytes_reused: int = 0
+    last_step: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def bytes_resent(self) -> int:
+        return self.bytes_total - self.bytes_reused
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.bytes_reused / self.bytes_total if self.bytes_total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "steps": self.steps,
+            "bytes_total": self.bytes_total,
+            "bytes_reused": self.bytes_reused,
+            "bytes_resent": self.bytes_resent,
+            "reuse_ratio": round(self.reuse_ratio, 4),
+            "last_step": dict(self.last_step),
+        }
+
+
+class PromptReuseTracker:
+    """
+    Mide cuántos bytes de cada petición son un prefijo idéntico a la
+    anterior de la misma sesión (lo que el caché de prompts del proveedor
+    puede reutilizar). Las sesiones nuevas se comparan con el último
+    prefijo estático enviado, que es compartido entre sesiones.
+    """
+
+    def __init__(self, max_sessions: int = 256):
+        self.stats = PromptStats()
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._last_prefix: List[str] = []
+
+    @staticmethod
+    def _digest(segment: str) -> str:
+        return hashlib.blake2b(segment.encode("utf-8"), digest_size=16).hexdigest()
+
+    def record(self, session_id: str, segments: List[str]) -> Dict[str, int]:
+        """Registra un paso. `segments[0]` debe ser el prefijo estático del prompt."""
+        digests = [self._digest(s) for s in segments]
+        sizes = [len(s.encode("utf-8")) for s in segments]
+        previous = self._sessions.get(session_id, self._last_prefix)
+
+        reused = 0
+        for i, digest in enumerate(digests):
+            if i >= len(previous) or previous[i] != digest:
+                break
+            reused += sizes[i]
+
+        self._sessions[session_id] = digests
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        self._last_prefix = digests[:1]
+
+        total = sum(sizes)
+        step = {"bytes_total": total, "bytes_reused": reused, "bytes_resent": total - reused}
+        self.stats.steps += 1
+        self.stats.bytes_total += total
+        self.stats.bytes_reused += reused
+        self.stats.last_step = step
+        return step
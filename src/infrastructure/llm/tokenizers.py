@@ -0,0 +1,42 @@
+import logging
+import math
+from src.core.interfaces.ports import ITokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class CharTokenizer(ITokenizer):
+    """Estimación barata: ~4 caracteres por token (sin dependencias)."""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+class TiktokenTokenizer(ITokenizer):
+    """Conteo exacto con `tiktoken` (extra opcional `tokens`)."""
+
+    def __init__(self, model: str):
+        import tiktoken
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Modelos no registrados (p.ej. vía LLM_BASE_URL compatible)
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def create_tokenizer(kind: str, model: str) -> ITokenizer:
+    """`kind`: "char", "tiktoken" o "auto" (tiktoken si está instalado)."""
+    if kind in ("tiktoken", "auto"):
+        try:
+            return TiktokenTokenizer(model)
+        except Exception as e:
+            if kind == "tiktoken":
+                logger.warning("tiktoken no disponible (%s), estimación por caracteres", e)
+    return CharTokenizer()
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+from src.core.interfaces.ports import IMCPClient
+from src.core.schemas.models import Observation, ToolSchema
+from src.core.policies import MCP_TIMEOUT
+from src.infrastructure.mcp.stdio_client import MCPStdioClient
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    """Un proceso del pool con su estado de reinicio (backoff exponencial)."""
+
+    def __init__(self, client: MCPStdioClient):
+        self.client = client
+        self.failures = 0
+        self.retry_at = 0.0
+        self.restarting: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return self.client.is_alive and self.restarting is None
+
+
+class MCPPool(IMCPClient):
+    """
+    Pool de procesos idénticos de un servidor MCP stdio.
+
+    Enruta cada llamada al proceso con menos peticiones en vuelo, reinicia
+    los procesos caídos con backoff exponencial y se puede precalentar en
+    el bootstrap para que la primera petición no pague el arranque. Sin
+    prewarm, los procesos arrancan con la primera llamada a una tool: el
+    descubrimiento de tools nunca arranca ninguno.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        args: Optional[list[str]] = None,
+        size: int = 2,
+        timeout: float = MCP_TIMEOUT,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.slots: List[_Slot] = [
+            _Slot(MCPStdioClient(command, args, timeout=timeout)) for _ in range(max(1, size))
+        ]
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.restarts = 0
+        # Catálogo de tools del primer handshake correcto (compartido por el pool)
+        self._tools: Optional[List[ToolSchema]] = None
+
+    async def start(self):
+        """Prewarm: arranca todos los procesos del pool."""
+        await asyncio.gather(*(self._restart(slot) for slot in self.slots))
+
+    async def _restart(self, slot: _Slot):
+        delay = slot.retry_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            await slot.client.stop()
+            await slot.client.connect()
+            slot.failures = 0
+        except Exception as e:
+            slot.failures += 1
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (slot.failures - 1))
+            slot.retry_at = time.monotonic() + backoff
+            logger.warning("No se pudo arrancar el servidor MCP (%s); reintento en %.1fs", e, backoff)
+        finally:
+            slot.restarting = None
+
+    def _supervise(self):
+        """Programa el reinicio de los procesos caídos (sin bloquear la llamada)."""
+        for slot in self.slots:
+            if not slot.client.is_alive and slot.restarting is None:
+                if slot.client.process is not None:
+                    self.restarts += 1
+                slot.restarting = asyncio.create_task(self._restart(slot))
+
+    async def _pick(self) -> Optional[_Slot]:
+        self._supervise()
+        available = [s for s in self.slots if s.available]
+        if not available:
+            # Todos caídos: esperamos al primer reinicio en curso
+            pending = [s.restarting for s in self.slots if s.restarting]
+            if pending:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            available = [s for s in self.slots if s.available]
+        if not available:
+            return None
+        # Least-outstanding-first
+        return min(available, key=lambda s: s.client.in_flight)
+
+    async def call_tool(self, tool_name: str, args: dict) -> Observation:
+        slot = await self._pick()
+        if slot is None:
+            return Observation(
+                origin=f"mcp:{tool_name}",
+                content="Error: Ningún servidor MCP del pool está disponible.",
+                status="error",
+            )
+        observation = await slot.client.call_tool(tool_name, args)
+        if not slot.client.is_alive:
+            self._supervise()
+        return observation
+
+    async def list_tools(self) -> List[ToolSchema]:
+        """
+        Todos los procesos son idénticos: basta con el catálogo de uno.
+
+        Solo se consulta a procesos ya vivos (prewarm o una llamada previa):
+        construir el prompt de cada turno no arranca procesos. Sin ninguno
+        vivo se devuelve el último catálogo conocido, o `[]` y el Router usa
+        `tools.md`. El catálogo se cachea tras el primer handshake correcto y
+        solo se vuelve a pedir si el servidor avisó de cambios.
+        """
+        live = [s for s in self.slots if s.available]
+        if not live or (self._tools is not None and not any(s.client.tools_stale for s in live)):
+            return self._tools or []
+        self._tools = await live[0].client.list_tools()
+        return self._tools
+
+    async def stop(self):
+        for slot in self.slots:
+            if slot.restarting:
+                slot.restarting.cancel()
+            await slot.client.stop()
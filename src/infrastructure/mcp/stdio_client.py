@@ -1,69 +1,279 @@
 import json
 import asyncio
-import subprocess
-from typing import Dict, Any, Optional
+import itertools
+import logging
+import time
+from typing import Dict, Any, List, Optional
 from src.core.interfaces.ports import IMCPClient
-from src.core.schemas.models import Observation
+from src.core.schemas.models import Observation, ToolSchema
+from src.core.policies import MCP_TIMEOUT, MCP_TOOLS_RETRY
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "agent-skills-poc", "version": "0.1.0"}
+
+# Límite de línea JSON-RPC (las respuestas de documentación pueden ser grandes)
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class MCPConnectionError(Exception):
+    """El servidor MCP no está disponible o cerró la conexión."""
 
 
 class MCPStdioClient(IMCPClient):
     """
     Cliente MCP que se comunica con un servidor vía stdio.
     Cumple con el estándar JSON-RPC 2.0 básico definido para la POC.
+
+    Las peticiones se multiplexan sobre un único proceso: una tarea lectora
+    en segundo plano despacha cada respuesta al future de su `id`, de modo
+    que puede haber muchas llamadas en vuelo a la vez. Los futures quedan
+    ligados al proceso por el que se enviaron: al reconectar, el lector
+    anterior se cancela y no puede fallar las peticiones del nuevo.
+
+    Al conectar hace el handshake `initialize` + `tools/list` una sola vez y
+    cachea los schemas de las tools hasta recibir `notifications/tools/list_changed`.
+    Si el descubrimiento falla por timeout, no se reintenta hasta pasado
+    `tools_retry` (backoff exponencial): un servidor colgado no bloquea cada turno.
     """
 
-    def __init__(self, command: str, args: Optional[list[str]] = None):
+    def __init__(
+        self,
+        command: str,
+        args: Optional[list[str]] = None,
+        timeout: float = MCP_TIMEOUT,
+        tools_retry: float = MCP_TOOLS_RETRY,
+    ):
         self.command = command
         self.args = args or []
+        self.timeout = timeout
+        self.tools_retry = tools_retry
         self.process: Optional[asyncio.subprocess.Process] = None
-        self._request_id = 1
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._write_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        self._connected = False
+        self._tools: List[ToolSchema] = []
+        self._tools_stale = True
+        self._tools_failures = 0
+        self._tools_retry_at = 0.0
+        self.server_info: Dict[str, Any] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Número de peticiones esperando respuesta."""
+        return len(self._pending)
+
+    @property
+    def tools_stale(self) -> bool:
+        """
+        True si hay que leer el catálogo de tools: no se ha leído o el servidor
+        avisó de cambios, y no está en backoff tras un `tools/list` fallido.
+        """
+        return self._tools_stale and time.monotonic() >= self._tools_retry_at
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self._connected
+            and self.process is not None
+            and self.process.returncode is None
+        )
+
+    async def connect(self):
+        """Arranca el proceso del servidor (prewarm) si no está vivo."""
+        await self._ensure_connected()
 
     async def _ensure_connected(self):
-        if self.process is None:
+        async with self._connect_lock:
+            if self.is_alive:
+                return
+            await self._discard_process()
             self.process = await asyncio.create_subprocess_exec(
                 self.command,
                 *self.args,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                limit=_STREAM_LIMIT,
             )
+            # Peticiones en vuelo de este proceso: su lector solo falla las suyas
+            self._pending = {}
+            self._connected = True
+            self._tasks = [
+                asyncio.create_task(self._read_loop(self.process, self._pending)),
+                asyncio.create_task(self._drain_stderr(self.process)),
+            ]
+            await self._handshake()
 
-    async def call_tool(self, tool_name: str, args: dict) -> Observation:
+    async def _discard_process(self):
+        """Cancela el lector y el drenaje del proceso anterior y lo termina si sigue vivo."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        process = self.process
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    async def _handshake(self):
+        """`initialize` + `notifications/initialized` + `tools/list` (una vez por conexión)."""
+        self._tools_stale = True
         try:
-            await self._ensure_connected()
+            response = await self._send_request(
+                "initialize",
+                {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": CLIENT_INFO,
+                },
+            )
+            if "error" in response:
+                logger.info("El servidor MCP no soporta initialize; sin descubrimiento de tools")
+                self._tools, self._tools_stale = [], False
+                return
+            self.server_info = response.get("result", {}).get("serverInfo", {})
+            await self._send_notification("notifications/initialized")
+            await self._refresh_tools()
+        except asyncio.TimeoutError:
+            self._tools_failed("Timeout en el handshake MCP")
 
-            if not self.process or not self.process.stdin or not self.process.stdout:
-                return Observation(
-                    origin=f"mcp:{tool_name}",
-                    content="Error: No se pudo conectar con el servidor MCP.",
-                    status="error",
-                )
+    async def _read_loop(
+        self, process: asyncio.subprocess.Process, pending: Dict[int, asyncio.Future]
+    ):
+        """Despacha cada respuesta JSON-RPC de `process` al future de su `id`."""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line.decode())
+                except json.JSONDecodeError:
+                    logger.debug("Línea MCP no válida: %r", line[:200])
+                    continue
 
-            # Formato JSON-RPC 2.0 simplificado para 'tools/call'
-            request = {
-                "jsonrpc": "2.0",
-                "id": self._request_id,
-                "method": "tools/call",
-                "params": {"name": tool_name, "arguments": args},
-            }
-            self._request_id += 1
-
-            # Enviar request
-            line = json.dumps(request) + "\n"
-            self.process.stdin.write(line.encode())
-            await self.process.stdin.drain()
+                future = pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+                elif "method" in message:
+                    self._on_notification(message)
+        except Exception as e:
+            logger.warning("Lector MCP terminado: %s", e)
+        finally:
+            # Si el servidor muere, ningún llamante se queda esperando
+            if self.process is process:
+                self._connected = False
+            self._fail_pending(pending, MCPConnectionError("Servidor MCP cerró la conexión."))
 
-            # Leer response
-            response_line = await self.process.stdout.readline()
+    async def _drain_stderr(self, process: asyncio.subprocess.Process):
+        """Consume stderr para que el servidor no se bloquee con el pipe lleno."""
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+            logger.debug("MCP stderr: %s", line.decode(errors="replace").rstrip())
 
-            if not response_line:
-                return Observation(
-                    origin=f"mcp:{tool_name}",
-                    content="Error: Servidor MCP cerró la conexión.",
-                    status="error",
-                )
+    def _on_notification(self, message: Dict[str, Any]):
+        """Notificaciones del servidor (mensajes sin `id`)."""
+        logger.debug("Notificación MCP: %s", message.get("method"))
+        if message.get("method") == "notifications/tools/list_changed":
+            # Se refresca de forma perezosa en el siguiente `list_tools()`
+            self._tools_stale = True
+
+    async def _refresh_tools(self):
+        response = await self._send_request("tools/list")
+        tools = response.get("result", {}).get("tools", [])
+        self._tools = [
+            ToolSchema(
+                name=tool["name"],
+                description=tool.get("description", ""),
+                input_schema=tool.get("inputSchema", {}),
+            )
+            for tool in tools
+            if "name" in tool
+        ]
+        self._tools_stale = False
+        self._tools_failures = 0
+
+    def _tools_failed(self, reason: str):
+        """Negative cache: programa el siguiente intento de `tools/list`."""
+        self._tools_failures += 1
+        delay = self.tools_retry * 2 ** (self._tools_failures - 1)
+        self._tools_retry_at = time.monotonic() + delay
+        logger.warning("%s; sin descubrimiento de tools durante %.0fs", reason, delay)
+
+    async def list_tools(self) -> List[ToolSchema]:
+        """
+        Schemas cacheados de las tools; solo se consulta al servidor si
+        cambiaron. En backoff devuelve el último catálogo conocido.
+        """
+        await self._ensure_connected()
+        if self.tools_stale:
+            try:
+                await self._refresh_tools()
+            except asyncio.TimeoutError:
+                self._tools_failed("Timeout en tools/list")
+        return self._tools
+
+    @staticmethod
+    def _fail_pending(pending: Dict[int, asyncio.Future], error: Exception):
+        futures = list(pending.values())
+        pending.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def request(
+        self, method: str, params: Optional[dict] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Envía una petición JSON-RPC y espera su respuesta (por `id`)."""
+        await self._ensure_connected()
+        return await self._send_request(method, params, timeout)
+
+    async def _send_request(
+        self, method: str, params: Optional[dict] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        process, pending = self.process, self._pending
+        if not process or not process.stdin:
+            raise MCPConnectionError("No se pudo conectar con el servidor MCP.")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        pending[request_id] = future
+
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        try:
+            async with self._write_lock:
+                process.stdin.write((json.dumps(request) + "\n").encode())
+                await process.stdin.drain()
+            return await asyncio.wait_for(future, timeout or self.timeout)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise MCPConnectionError("Servidor MCP cerró la conexión.") from e
+        finally:
+            # Limpieza de futures huérfanos (timeout o cancelación)
+            pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[dict] = None):
+        """Envía una notificación JSON-RPC (sin respuesta)."""
+        await self._ensure_connected()
+        await self._send_notification(method, params)
+
+    async def _send_notification(self, method: str, params: Optional[dict] = None):
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        async with self._write_lock:
+            self.process.stdin.write((json.dumps(message) + "\n").encode())
+            await self.process.stdin.drain()
 
-            response = json.loads(response_line.decode())
+    async def call_tool(self, tool_name: str, args: dict) -> Observation:
+        try:
+            # Formato JSON-RPC 2.0 simplificado para 'tools/call'
+            response = await self.request(
+                "tools/call", {"name": tool_name, "arguments": args}
+            )
 
             if "error" in response:
                 return Observation(
@@ -81,6 +291,18 @@ class MCPStdioClient(IMCPClient):
                 status="success",
             )
 
+        except MCPConnectionError as e:
+            return Observation(
+                origin=f"mcp:{tool_name}",
+                content=f"Error: {e}",
+                status="error",
+            )
+        except asyncio.TimeoutError:
+            return Observation(
+                origin=f"mcp:{tool_name}",
+                content=f"Error: Timeout MCP ({self.timeout}s) en '{tool_name}'.",
+                status="error",
+            )
         except Exception as e:
             return Observation(
                 origin=f"mcp:{tool_name}",
@@ -89,7 +311,13 @@ class MCPStdioClient(IMCPClient):
             )
 
     async def stop(self):
+        self._connected = False
         if self.process:
-            self.process.terminate()
+            if self.process.returncode is None:
+                self.process.terminate()
             await self.process.wait()
             self.process = None
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._fail_pending(self._pending, MCPConnectionError("Cliente MCP detenido."))
@@ -0,0 +1,93 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+from src.infrastructure.observability.tracing import Span, SpanSink
+
+# Buckets de latencia en segundos (convención de Prometheus)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_ATTRIBUTES = ("prompt_tokens", "completion_tokens")
+SPECULATION_ATTRIBUTES = {"speculation_hits": "hit", "speculation_waste": "waste"}
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.total = 0.0
+        self.count = 0
+
+
+class PrometheusMetrics(SpanSink):
+    """
+    Agrega los spans en histogramas de latencia y contadores, y los
+    renderiza en el formato de texto de Prometheus (`GET /metrics`).
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "agent"):
+        self.buckets = buckets
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, _Histogram] = {}
+        self._spans: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._tokens: Dict[str, int] = defaultdict(int)
+        self._speculation: Dict[str, int] = defaultdict(int)
+
+    def export(self, span: Span) -> None:
+        seconds = span.duration_ms / 1000
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = _Histogram(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.counts[i] += 1
+            histogram.total += seconds
+            histogram.count += 1
+            self._spans[(span.name, span.status)] += 1
+            for attribute in TOKEN_ATTRIBUTES:
+                value = span.attributes.get(attribute)
+                if isinstance(value, int):
+                    self._tokens[attribute.removesuffix("_tokens")] += value
+            for attribute, outcome in SPECULATION_ATTRIBUTES.items():
+                value = span.attributes.get(attribute)
+                if isinstance(value, int):
+                    self._speculation[outcome] += value
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_span_duration_seconds Duración de cada fase del loop agentic.",
+            f"# TYPE {p}_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, histogram in sorted(self._histograms.items()):
+                for bound, count in zip(self.buckets, histogram.counts):
+                    lines.append(f'{p}_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {count}')
+                lines.append(f'{p}_span_duration_seconds_bucket{{span="{name}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{p}_span_duration_seconds_sum{{span="{name}"}} {histogram.total:.6f}')
+                lines.append(f'{p}_span_duration_seconds_count{{span="{name}"}} {histogram.count}')
+
+            lines += [
+                f"# HELP {p}_spans_total Spans terminados por fase y estado.",
+                f"# TYPE {p}_spans_total counter",
+            ]
+            for (name, status), count in sorted(self._spans.items()):
+                lines.append(f'{p}_spans_total{{span="{name}",status="{status}"}} {count}')
+
+            lines += [
+                f"# HELP {p}_llm_tokens_total Tokens consumidos por el Router.",
+                f"# TYPE {p}_llm_tokens_total counter",
+            ]
+            for kind, count in sorted(self._tokens.items()):
+                lines.append(f'{p}_llm_tokens_total{{kind="{kind}"}} {count}')
+
+            lines += [
+                f"# HELP {p}_speculation_prefetch_total Prefetches especulativos usados (hit) o descartados (waste).",
+                f"# TYPE {p}_speculation_prefetch_total counter",
+            ]
+            for outcome, count in sorted(self._speculation.items()):
+                lines.append(f'{p}_speculation_prefetch_total{{outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,117 @@
+import contextvars
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from src.core.interfaces.ports import ISpan, ITracer
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class SpanSink(ABC):
+    """Destino de los spans terminados (exportadores y métricas)."""
+
+    @abstractmethod
+    def export(self, span: "Span") -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class Span(ISpan):
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_time = 0.0
+        self.duration_ms = 0.0
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes.setdefault("error", f"{exc_type.__name__}: {exc}")
+        self.tracer._finish(self)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": round(self.start_time, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer(ITracer):
+    """
+    Tracer en proceso: los spans se anidan vía `contextvars` (también entre
+    tareas de asyncio) y al cerrarse se envían a cada sink.
+    """
+
+    def __init__(self, sinks: List[SpanSink]):
+        self.sinks = sinks
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        return Span(self, name, attributes)
+
+    def _finish(self, span: Span):
+        for sink in self.sinks:
+            try:
+                sink.export(span)
+            except Exception as e:
+                logger.debug("Sink de trazas falló: %s", e)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class JSONLSpanExporter(SpanSink):
+    """Un span por línea JSON, en modo append y con escritura agrupada."""
+
+    def __init__(self, path: str, flush_every: int = 32):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def export(self, span: Span) -> None:
+        self._file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+        self._pending += 1
+        # Los spans raíz (fin de una conversación) fuerzan el flush
+        if self._pending >= self.flush_every or span.parent_id is None:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        self._file.close()
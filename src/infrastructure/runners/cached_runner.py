@@ -0,0 +1,72 @@
+import hashlib
+import json
+import unicodedata
+from typing import Any
+from src.core.interfaces.ports import IRunner
+from src.core.schemas.models import SkillDoc, Observation
+from src.infrastructure.cache.ttl_cache import TieredCache
+
+
+def canonicalize_args(value: Any) -> Any:
+    """Forma canónica de los args: claves ordenadas y strings normalizados."""
+    if isinstance(value, dict):
+        return {str(k): canonicalize_args(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize_args(v) for v in value]
+    if isinstance(value, str):
+        return " ".join(unicodedata.normalize("NFC", value).split())
+    return value
+
+
+def result_cache_key(skill: SkillDoc, args: dict) -> str:
+    payload = json.dumps(
+        [skill.metadata.name, skill.metadata.version, canonicalize_args(args)],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return "skill:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(observation: Observation) -> bool:
+    if observation.status != "success":
+        return False
+    return not (isinstance(observation.content, dict) and observation.content.get("error"))
+
+
+class CachingRunner(IRunner):
+    """
+    Decorador de IRunner con caché de resultados para skills idempotentes.
+
+    Solo cachea las skills que declaran `metadata.cache_ttl` en su SKILL.md
+    y solo los resultados exitosos: ni `status="error"` (exit code != 0) ni
+    un JSON con el campo `error`, que es como una skill avisa de un fallo
+    transitorio (red, API caída) sin dejar de devolver un resumen.
+    La clave es (nombre, versión, args canónicos).
+    `Observation.metadata["cache"]` indica hit/miss.
+    """
+
+    def __init__(self, inner: IRunner, cache: TieredCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def run(self, skill: SkillDoc, args: dict) -> Observation:
+        if not skill.cache_ttl:
+            return await self.inner.run(skill, args)
+
+        key = result_cache_key(skill, args)
+        cached, tier = await self.cache.get(key)
+        if cached is not None:
+            observation = Observation(**cached)
+            observation.metadata.update({"cache": "hit", "cache_tier": tier})
+            return observation
+
+        observation = await self.inner.run(skill, args)
+        if is_cacheable(observation):
+            await self.cache.set(key, observation.model_dump(), ttl=skill.cache_ttl)
+        observation.metadata["cache"] = "miss"
+        return observation
+
+    def __getattr__(self, name: str):
+        # Delegamos capacidades opcionales del runner real (prewarm, stop...)
+        return getattr(self.inner, name)
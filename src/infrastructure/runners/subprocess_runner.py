@@ -1,72 +1,119 @@
-import subprocess
+import asyncio
 import json
 import os
+import signal
+from typing import Optional
 from src.core.interfaces.ports import IRunner
 from src.core.schemas.models import SkillDoc, Observation
+from src.core.policies import SKILL_TIMEOUT
 
 class SubprocessRunner(IRunner):
     """
     Ejecutor de scripts locales mediante subprocess.
     Sigue el contrato de la POC: Input/Output vía JSON.
+
+    Usa subprocesos asyncio: una skill lenta no bloquea el event loop y
+    varias ejecuciones pueden correr en paralelo dentro del mismo proceso.
     """
-    
-    def __init__(self, workspace_dir: str):
+
+    def __init__(self, workspace_dir: str, timeout: float = SKILL_TIMEOUT):
         self.workspace_dir = workspace_dir
+        self.timeout = timeout
 
-    async def run(self, skill: SkillDoc, args: dict) -> Observation:
+    def resolve_script(self, skill: SkillDoc) -> tuple[Optional[str], Optional[Observation]]:
+        """Valida el entry_script de la skill. Devuelve (ruta, None) o (None, error)."""
         if not skill.entry_script:
-            return Observation(
+            return None, Observation(
                 origin=skill.metadata.name,
                 content="Error: La skill no tiene definido un entry_script.",
                 status="error"
             )
-            
+
         script_path = os.path.join(self.workspace_dir, "skills", skill.metadata.name, skill.entry_script)
-        
+
         if not os.path.exists(script_path):
-            return Observation(
+            return None, Observation(
                 origin=skill.metadata.name,
                 content=f"Error: Script no encontrado en {script_path}",
                 status="error"
             )
+        return script_path, None
+
+    async def run(self, skill: SkillDoc, args: dict) -> Observation:
+        script_path, error = self.resolve_script(skill)
+        if error:
+            return error
 
         try:
-            # Ejecutamos el script pasando los argumentos como JSON string
-            process = subprocess.run(
-                ["python3", script_path, json.dumps(args)],
-                capture_output=True,
-                text=True,
-                timeout=30 # Política SKILL_TIMEOUT
+            # Ejecutamos el script pasando los argumentos como JSON string.
+            # Grupo de procesos propio para poder matar también a sus hijos.
+            process = await asyncio.create_subprocess_exec(
+                "python3", script_path, json.dumps(args),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
             )
-            
-            if process.returncode != 0:
-                return Observation(
-                    origin=skill.metadata.name,
-                    content=f"Error en ejecución: {process.stderr}",
-                    status="error"
-                )
-            
-            # Intentamos parsear la salida como JSON
+
             try:
-                output_data = json.loads(process.stdout)
-            except json.JSONDecodeError:
-                output_data = process.stdout.strip()
-                
-            return Observation(
-                origin=skill.metadata.name,
-                content=output_data,
-                status="success"
-            )
-            
-        except subprocess.TimeoutExpired:
-            return Observation(
-                origin=skill.metadata.name,
-                content="Error: Tiempo de ejecución excedido (Timeout).",
-                status="error"
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=self.timeout # Política SKILL_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                await kill_process_group(process)
+                return timeout_observation(skill)
+            except asyncio.CancelledError:
+                await kill_process_group(process)
+                raise
+
+            return build_observation(
+                skill,
+                process.returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
             )
+
         except Exception as e:
             return Observation(
                 origin=skill.metadata.name,
                 content=f"Error inesperado: {str(e)}",
                 status="error"
             )
+
+
+def build_observation(skill: SkillDoc, returncode: int, stdout: str, stderr: str) -> Observation:
+    """Normaliza la salida de un entry_script (contrato stdout-JSON) a Observation."""
+    if returncode != 0:
+        return Observation(
+            origin=skill.metadata.name,
+            content=f"Error en ejecución: {stderr}",
+            status="error"
+        )
+
+    # Intentamos parsear la salida como JSON
+    try:
+        output_data = json.loads(stdout)
+    except json.JSONDecodeError:
+        output_data = stdout.strip()
+
+    return Observation(
+        origin=skill.metadata.name,
+        content=output_data,
+        status="success"
+    )
+
+
+def timeout_observation(skill: SkillDoc) -> Observation:
+    return Observation(
+        origin=skill.metadata.name,
+        content="Error: Tiempo de ejecución excedido (Timeout).",
+        status="error"
+    )
+
+
+async def kill_process_group(process: asyncio.subprocess.Process):
+    """Mata el grupo de procesos completo de la skill y recoge su estado."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    await process.wait()
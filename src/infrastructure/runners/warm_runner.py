@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List
+from src.core.interfaces.ports import IRunner
+from src.core.schemas.models import SkillDoc, Observation
+from src.core.policies import SKILL_TIMEOUT
+from src.infrastructure.runners.subprocess_runner import (
+    SubprocessRunner,
+    build_observation,
+    kill_process_group,
+    timeout_observation,
+)
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "warm_worker.py")
+# Límite de línea del protocolo (las skills de scraping devuelven payloads grandes)
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class WorkerError(Exception):
+    """El worker murió o rompió el protocolo; se reintenta en modo frío."""
+
+
+class _Worker:
+    """Proceso python3 de larga vida que sirve un único entry_script."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.requests_served = 0
+        self.max_rss_kb = 0
+
+    @classmethod
+    async def spawn(cls, script_path: str) -> "_Worker":
+        process = await asyncio.create_subprocess_exec(
+            "python3", WORKER_SCRIPT, script_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+            limit=_STREAM_LIMIT,
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def call(self, args: dict) -> dict:
+        line = json.dumps({"args": args}) + "\n"
+        try:
+            self.process.stdin.write(line.encode())
+            await self.process.stdin.drain()
+            raw = await self.process.stdout.readline()
+        except (BrokenPipeError, ConnectionResetError, ValueError) as e:
+            raise WorkerError(str(e)) from e
+        if not raw:
+            raise WorkerError("El worker cerró la conexión")
+
+        reply = json.loads(raw)
+        self.requests_served += 1
+        self.max_rss_kb = reply.get("max_rss_kb", 0)
+        return reply
+
+    async def kill(self):
+        if self.alive:
+            await kill_process_group(self.process)
+
+
+class _SkillPool:
+    """
+    Pool de workers de una skill: reutiliza los ociosos y limita el total.
+
+    `slots` cuenta los workers en uso; cada `acquire` toma un hueco y
+    `release`/`discard` lo devuelven, así que un worker descartado (reciclado,
+    timeout o error) despierta a quien espera y este arranca uno nuevo.
+    """
+
+    def __init__(self, script_path: str, size: int):
+        self.script_path = script_path
+        self.size = size
+        self.idle: List[_Worker] = []
+        self.slots = asyncio.Semaphore(size)
+        self.spawned = 0
+
+    async def acquire(self) -> _Worker:
+        await self.slots.acquire()
+        try:
+            while self.idle:
+                worker = self.idle.pop()
+                if worker.alive:
+                    return worker
+                self.spawned -= 1
+            worker = await _Worker.spawn(self.script_path)
+            self.spawned += 1
+            return worker
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, worker: _Worker):
+        self.idle.append(worker)
+        self.slots.release()
+
+    async def discard(self, worker: _Worker):
+        self.spawned -= 1
+        self.slots.release()
+        await worker.kill()
+
+    async def close(self):
+        """Termina los workers ociosos (los que están en uso siguen su curso)."""
+        idle, self.idle = self.idle, []
+        for worker in idle:
+            self.spawned -= 1
+            await worker.kill()
+
+
+class WarmPoolRunner(IRunner):
+    """
+    Runner "warm": mantiene un pool de workers persistentes por skill que
+    cargan el entry_script una vez y atienden peticiones JSON por stdin/stdout.
+
+    Los workers se reciclan tras `max_requests` peticiones o al superar
+    `max_rss_mb` de memoria. Si un worker falla, la petición se ejecuta con
+    el runner frío (`SubprocessRunner`), que sigue siendo el fallback.
+    """
+
+    def __init__(
+        self,
+        workspace_dir: str,
+        pool_size: int = 2,
+        max_requests: int = 200,
+        max_rss_mb: int = 256,
+        timeout: float = SKILL_TIMEOUT,
+    ):
+        self.cold = SubprocessRunner(workspace_dir, timeout=timeout)
+        self.pool_size = pool_size
+        self.max_requests = max_requests
+        self.max_rss_kb = max_rss_mb * 1024
+        self.timeout = timeout
+        self._pools: Dict[str, _SkillPool] = {}
+
+    def _pool(self, script_path: str) -> _SkillPool:
+        pool = self._pools.get(script_path)
+        if pool is None:
+            pool = self._pools[script_path] = _SkillPool(script_path, self.pool_size)
+        return pool
+
+    async def prewarm(self, skill: SkillDoc):
+        """Arranca un worker para la skill si aún no tiene ninguno."""
+        script_path, error = self.cold.resolve_script(skill)
+        if error:
+            return
+        pool = self._pool(script_path)
+        if pool.spawned == 0:
+            try:
+                pool.release(await pool.acquire())
+            except Exception as e:
+                logger.warning("No se pudo precalentar '%s': %s", skill.metadata.name, e)
+
+    async def run(self, skill: SkillDoc, args: dict) -> Observation:
+        script_path, error = self.cold.resolve_script(skill)
+        if error:
+            return error
+
+        pool = self._pool(script_path)
+        try:
+            worker = await pool.acquire()
+        except Exception as e:
+            logger.warning("Worker no disponible para '%s' (%s), modo frío", skill.metadata.name, e)
+            return await self.cold.run(skill, args)
+
+        try:
+            reply = await asyncio.wait_for(worker.call(args), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            await pool.discard(worker)
+            return timeout_observation(skill)
+        except (WorkerError, json.JSONDecodeError) as e:
+            await pool.discard(worker)
+            logger.warning("Worker de '%s' falló (%s), modo frío", skill.metadata.name, e)
+            return await self.cold.run(skill, args)
+        except BaseException:
+            await pool.discard(worker)
+            raise
+
+        if worker.requests_served >= self.max_requests or worker.max_rss_kb >= self.max_rss_kb:
+            await pool.discard(worker)
+        else:
+            pool.release(worker)
+
+        observation = build_observation(skill, reply["exit_code"], reply["stdout"], reply["stderr"])
+        observation.metadata["runner"] = "warm"
+        return observation
+
+    async def stop(self):
+        """Termina todos los workers ociosos."""
+        for pool in self._pools.values():
+            await pool.close()
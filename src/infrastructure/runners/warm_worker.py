@@ -0,0 +1,86 @@
+"""
+Worker persistente para el modo "warm" del runner.
+
+Uso: python3 warm_worker.py <ruta_entry_script>
+
+Compila el entry_script una sola vez y lo ejecuta en "modo import" para
+cargar sus dependencias (requests, bs4...). Después atiende peticiones
+JSON por stdin (una por línea) ejecutando el bloque `__main__` del script
+con el mismo contrato que el modo frío: argv[1] = JSON de args y la
+salida JSON por stdout. Cada respuesta es una línea JSON por stdout.
+"""
+import io
+import json
+import os
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+def _max_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _execute(code, script_path: str, run_name: str, argv: list) -> tuple[int, str, str]:
+    out, err = io.StringIO(), io.StringIO()
+    exit_code = 0
+    sys.argv = argv
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            exec(code, {"__name__": run_name, "__file__": script_path, "__builtins__": __builtins__})
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                err.write(str(e.code))
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+    return exit_code, out.getvalue(), err.getvalue()
+
+
+def main():
+    script_path = os.path.abspath(sys.argv[1])
+    sys.path.insert(0, os.path.dirname(script_path))
+
+    # El canal del protocolo es el stdout real; cualquier escritura a nivel
+    # de descriptor (extensiones C) se desvía a stderr para no corromperlo.
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    with open(script_path, "r", encoding="utf-8") as f:
+        code = compile(f.read(), script_path, "exec")
+
+    # Calentamiento: imports y definiciones, sin ejecutar el bloque __main__
+    _execute(code, script_path, "__warm__", [script_path])
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        exit_code, stdout, stderr = _execute(
+            code, script_path, "__main__", [script_path, json.dumps(request.get("args", {}))]
+        )
+        reply = {
+            "exit_code": exit_code,
+            "stdout": stdout,
+            "stderr": stderr,
+            "max_rss_kb": _max_rss_kb(),
+        }
+        protocol.write(json.dumps(reply) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Optional
+from src.core.interfaces.ports import IBlobStore
+
+
+def blob_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileBlobStore(IBlobStore):
+    """
+    Un fichero por blob en `root/ab/cdef...` (como los objetos de git).
+    Escritura atómica (tmp + rename) y lectura vía mmap.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def put(self, data: bytes) -> str:
+        digest = blob_hash(data)
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._path(digest), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[:]
+        except FileNotFoundError:
+            return None
+
+
+class SQLiteBlobStore(IBlobStore):
+    """Todos los blobs en una tabla SQLite (un solo fichero, útil con muchos blobs pequeños)."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER, data BLOB)"
+        )
+        self._conn.commit()
+
+    def put(self, data: bytes) -> str:
+        digest = blob_hash(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (hash, size, data) VALUES (?, ?, ?)",
+                (digest, len(data), sqlite3.Binary(data)),
+            )
+            self._conn.commit()
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_blob_store(kind: str, path: str) -> Optional[IBlobStore]:
+    """`file` (directorio), `sqlite` (fichero) u `off`."""
+    if kind == "file":
+        return FileBlobStore(path)
+    if kind == "sqlite":
+        return SQLiteBlobStore(path)
+    if kind == "off":
+        return None
+    raise ValueError(f"BLOB_STORE no soportado: {kind}")
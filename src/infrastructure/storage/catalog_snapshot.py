@@ -0,0 +1,66 @@
+import json
+import os
+import struct
+from typing import Dict, Optional
+from src.infrastructure.storage.fs_skill_store import CatalogEntry, FSSkillStore
+
+# Formato: MAGIC | uint32 longitud del índice | índice JSON compacto (UTF-8)
+MAGIC = b"SKCAT1\n"
+_HEADER = struct.Struct("<I")
+
+
+def write_snapshot(store: FSSkillStore, path: str) -> int:
+    """
+    Serializa el índice del store (Nivel 1, offsets de Nivel 2 y hashes)
+    en un único fichero. Devuelve el número de skills escritas.
+    """
+    store.refresh()
+    entries = {
+        name: entry.to_snapshot()
+        for name, entry in store.entries().items()
+        if entry.metadata
+    }
+    payload = json.dumps(
+        {"skills_dir": os.path.abspath(store.skills_dir), "entries": entries},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    # Escritura atómica: un proceso que arranca nunca ve un snapshot a medias
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(len(payload)))
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+def load_store(skills_dir: str, path: str) -> FSSkillStore:
+    """Crea un FSSkillStore sembrado con el snapshot (si existe y es válido)."""
+    return FSSkillStore(skills_dir, snapshot=read_snapshot(path, skills_dir))
+
+
+def read_snapshot(path: str, skills_dir: Optional[str] = None) -> Dict[str, CatalogEntry]:
+    """
+    Carga el snapshot. Devuelve {} si no existe, es inválido o se compiló
+    para otro `skills_dir`.
+
+    Lectura completa sin mmap: el índice se parsea entero con `json.loads`
+    en cualquier caso, así que mapearlo no ahorra nada.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return {}
+            (length,) = _HEADER.unpack(f.read(_HEADER.size))
+            data = json.loads(f.read(length))
+    except (OSError, ValueError, struct.error):
+        return {}
+
+    if skills_dir is not None and data.get("skills_dir") != os.path.abspath(skills_dir):
+        return {}
+    return {
+        name: CatalogEntry.from_snapshot(raw)
+        for name, raw in data.get("entries", {}).items()
+    }
@@ -1,78 +1,280 @@
-import yaml
+import hashlib
 import os
-from typing import List, Optional
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from src.core.interfaces.ports import ISkillStore
 from src.core.schemas.models import SkillMetadata, SkillDoc
 
+# Firma de invalidación: (mtime_ns del directorio, mtime_ns del SKILL.md, tamaño)
+Signature = Tuple[int, int, int]
+
+
+@dataclass
+class CatalogEntry:
+    """
+    Entrada del índice en memoria: metadata Nivel 1 + firma del fichero.
+    Guarda también el hash del contenido y el offset del cuerpo (Nivel 2)
+    para poder revalidar y cargar instrucciones sin re-parsear el YAML.
+    """
+
+    signature: Signature
+    metadata: Optional[SkillMetadata]
+    sha1: str = ""
+    body_offset: int = -1
+    entry_script: Optional[str] = None
+    cache_ttl: Optional[float] = None
+    references: List[str] = field(default_factory=list)
+
+    def to_snapshot(self) -> dict:
+        return {
+            "sig": list(self.signature),
+            "sha1": self.sha1,
+            "meta": self.metadata.model_dump() if self.metadata else None,
+            "body": self.body_offset,
+            "entry_script": self.entry_script,
+            "cache_ttl": self.cache_ttl,
+            "references": self.references,
+        }
+
+    @classmethod
+    def from_snapshot(cls, raw: dict) -> "CatalogEntry":
+        return cls(
+            signature=tuple(raw["sig"]),
+            metadata=SkillMetadata(**raw["meta"]) if raw.get("meta") else None,
+            sha1=raw.get("sha1", ""),
+            body_offset=raw.get("body", -1),
+            entry_script=raw.get("entry_script"),
+            cache_ttl=raw.get("cache_ttl"),
+            references=raw.get("references") or [],
+        )
+
+
+@dataclass
+class CatalogStats:
+    """Contadores del índice para verificar su comportamiento bajo carga."""
+
+    scans: int = 0
+    hits: int = 0
+    reparses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    doc_hits: int = 0
+    doc_misses: int = 0
+    last_scan_ms: float = 0.0
+    total_scan_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def skill_signature(skill_path: str) -> Optional[Signature]:
+    """Firma de una skill o None si no es un directorio con SKILL.md."""
+    try:
+        dir_stat = os.stat(skill_path)
+        file_stat = os.stat(os.path.join(skill_path, "SKILL.md"))
+    except (OSError, ValueError):
+        return None
+    return (dir_stat.st_mtime_ns, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def scan_signatures(skills_dir: str) -> Dict[str, Signature]:
+    """
+    Barrido de `stat` sobre el directorio de skills (sin leer ficheros).
+    Devuelve la firma de cada skill válida indexada por nombre de directorio.
+    """
+    signatures: Dict[str, Signature] = {}
+    try:
+        entries = list(os.scandir(skills_dir))
+    except (FileNotFoundError, NotADirectoryError):
+        return signatures
+
+    for entry in entries:
+        try:
+            if not entry.is_dir():
+                continue
+        except OSError:
+            continue
+        signature = skill_signature(entry.path)
+        if signature is not None:
+            signatures[entry.name] = signature
+    return signatures
+
+
+def read_frontmatter(file_path: str) -> Optional[Tuple[str, int]]:
+    """
+    Parser en streaming: lee línea a línea hasta el delimitador de cierre
+    del frontmatter, sin cargar el cuerpo. Devuelve (yaml, offset en bytes
+    del cuerpo) o None si el fichero no empieza por un frontmatter válido.
+    """
+    with open(file_path, "rb") as f:
+        if f.readline().strip() != b"---":
+            return None
+        lines = []
+        while True:
+            line = f.readline()
+            if not line:
+                return None
+            if line.strip() == b"---":
+                return b"".join(lines).decode("utf-8"), f.tell()
+            lines.append(line)
+
+
+def file_sha1(file_path: str) -> str:
+    """Hash del contenido de un fichero ("" si no se puede leer)."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return ""
+
+
 class FSSkillStore(ISkillStore):
     """
     Implementación de infraestructura para cargar skills desde el Filesystem.
     Sigue el patrón de Progressive Disclosure.
+
+    Mantiene un índice en memoria del catálogo (Nivel 1): cada SKILL.md se
+    parsea una sola vez y solo se vuelve a parsear cuando cambia el mtime o
+    el tamaño del fichero o de su directorio.
     """
-    
-    def __init__(self, skills_dir: str):
+
+    def __init__(
+        self,
+        skills_dir: str,
+        snapshot: Optional[Dict[str, CatalogEntry]] = None,
+        doc_cache_size: int = 128,
+    ):
         self.skills_dir = skills_dir
+        # El snapshot precompilado (ver `catalog_snapshot`) siembra el índice
+        self._index: Dict[str, CatalogEntry] = dict(snapshot or {})
+        self.stats = CatalogStats()
+        # Se incrementa cada vez que el catálogo cambia (alta, baja o edición)
+        self.generation = 0
+        # LRU de SkillDoc (Nivel 2) indexado por (nombre, firma del fichero)
+        self._doc_cache: "OrderedDict[Tuple[str, Signature], SkillDoc]" = OrderedDict()
+        self.doc_cache_size = doc_cache_size
 
     async def get_all_metadata(self) -> List[SkillMetadata]:
-        """Nivel 1: Escanea directorios y extrae frontmatter."""
-        skills_metadata = []
-        if not os.path.exists(self.skills_dir):
-            return []
-            
-        for skill_name in os.listdir(self.skills_dir):
-            skill_path = os.path.join(self.skills_dir, skill_name)
-            skill_file = os.path.join(skill_path, "SKILL.md")
-            
-            if os.path.isdir(skill_path) and os.path.exists(skill_file):
-                metadata = self._extract_metadata(skill_file)
-                if metadata:
-                    skills_metadata.append(metadata)
-        
-        return skills_metadata
+        """Nivel 1: Escanea directorios y extrae frontmatter (con índice cacheado)."""
+        self.refresh()
+        return [e.metadata for e in self._index.values() if e.metadata]
+
+    def refresh(self) -> bool:
+        """
+        Sincroniza el índice con el disco. Solo hace `stat` de cada skill y
+        re-parsea las entradas cuya firma cambió. Devuelve True si el
+        catálogo cambió.
+        """
+        start = time.perf_counter()
+        changed = False
+        signatures = scan_signatures(self.skills_dir)
+
+        for name, signature in signatures.items():
+            cached = self._index.get(name)
+            if cached is not None and cached.signature == signature:
+                self.stats.hits += 1
+                continue
+
+            skill_file = os.path.join(self.skills_dir, name, "SKILL.md")
+            sha1 = file_sha1(skill_file) if cached is not None and cached.sha1 else None
+            if sha1 and sha1 == cached.sha1:
+                # mtime distinto pero mismo contenido (p.ej. tras un checkout)
+                cached.signature = signature
+                self.stats.revalidations += 1
+                continue
+
+            self._index[name] = self._parse_entry(name, skill_file, signature, sha1)
+            self.stats.reparses += 1
+            changed = True
+
+        for name in [n for n in self._index if n not in signatures]:
+            del self._index[name]
+            self.stats.evictions += 1
+            changed = True
+
+        if changed:
+            self.generation += 1
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats.scans += 1
+        self.stats.last_scan_ms = elapsed_ms
+        self.stats.total_scan_ms += elapsed_ms
+        return changed
+
+    def entries(self) -> Dict[str, CatalogEntry]:
+        """Vista del índice actual (nombre de directorio -> entrada)."""
+        return dict(self._index)
 
     async def get_skill_doc(self, name: str) -> Optional[SkillDoc]:
         """Nivel 2: Carga el documento completo para una skill específica."""
-        skill_file = os.path.join(self.skills_dir, name, "SKILL.md")
-        if not os.path.exists(skill_file):
+        return self.load_skill_doc(name)
+
+    def load_skill_doc(self, name: str) -> Optional[SkillDoc]:
+        """Versión síncrona de `get_skill_doc` (usada también por el registry en vivo)."""
+        skill_path = os.path.join(self.skills_dir, name)
+        signature = skill_signature(skill_path)
+        if signature is None:
             return None
-            
-        with open(skill_file, "r", encoding="utf-8") as f:
-            content = f.read()
-            
-        parts = content.split("---")
-        if len(parts) < 3:
+
+        cache_key = (name, signature)
+        doc = self._doc_cache.get(cache_key)
+        if doc is not None:
+            self._doc_cache.move_to_end(cache_key)
+            self.stats.doc_hits += 1
+            return doc
+        self.stats.doc_misses += 1
+
+        entry = self._index.get(name)
+        if entry is None or entry.signature != signature:
+            entry = self._parse_entry(name, os.path.join(skill_path, "SKILL.md"), signature)
+        if entry.metadata is None or entry.body_offset < 0:
             return None
-            
-        frontmatter = yaml.safe_load(parts[1])
-        instructions = parts[2].strip()
-        
-        metadata = SkillMetadata(
-            name=frontmatter.get("name", name),
-            description=frontmatter.get("description", ""),
-            version=frontmatter.get("version", "1.0.0")
-        )
-        
-        return SkillDoc(
-            metadata=metadata,
+
+        # Con el offset indexado solo leemos el cuerpo (sin re-parsear el YAML)
+        with open(os.path.join(skill_path, "SKILL.md"), "rb") as f:
+            f.seek(entry.body_offset)
+            instructions = f.read().decode("utf-8").strip()
+
+        doc = SkillDoc(
+            metadata=entry.metadata,
             instructions=instructions,
-            entry_script=frontmatter.get("metadata", {}).get("entry_script"),
-            references=frontmatter.get("references", [])
+            entry_script=entry.entry_script,
+            cache_ttl=entry.cache_ttl,
+            references=entry.references,
         )
+        self._doc_cache[cache_key] = doc
+        while len(self._doc_cache) > self.doc_cache_size:
+            self._doc_cache.popitem(last=False)
+        return doc
+
+    def _parse_entry(
+        self, name: str, file_path: str, signature: Signature, sha1: Optional[str] = None
+    ) -> CatalogEntry:
+        """Parsea solo el frontmatter de un SKILL.md (y el offset del cuerpo)."""
+        # yaml solo se importa si hay que parsear (el snapshot no lo necesita)
+        import yaml
 
-    def _extract_metadata(self, file_path: str) -> Optional[SkillMetadata]:
-        """Auxiliar para leer solo el frontmatter (Nivel 1)."""
+        # El hash permite revalidar por contenido cuando solo cambia el mtime
+        entry = CatalogEntry(signature=signature, metadata=None, sha1=sha1 or file_sha1(file_path))
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            parts = content.split("---")
-            if len(parts) >= 3:
-                frontmatter = yaml.safe_load(parts[1])
-                return SkillMetadata(
-                    name=frontmatter.get("name", "unknown"),
-                    description=frontmatter.get("description", ""),
-                    version=frontmatter.get("version", "1.0.0")
-                )
+            split = read_frontmatter(file_path)
+            if split is None:
+                return entry
+            frontmatter = yaml.safe_load(split[0]) or {}
+
+            entry.metadata = SkillMetadata(
+                name=frontmatter.get("name", name),
+                description=frontmatter.get("description", ""),
+                version=frontmatter.get("version", "1.0.0")
+            )
+            entry.body_offset = split[1]
+            extra = frontmatter.get("metadata") or {}
+            entry.entry_script = extra.get("entry_script")
+            entry.cache_ttl = extra.get("cache_ttl")
+            entry.references = frontmatter.get("references") or []
         except Exception:
-            return None
-        return None
+            entry.metadata = None
+        return entry
+
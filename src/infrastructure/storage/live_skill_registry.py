@@ -0,0 +1,93 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from src.core.interfaces.ports import ISkillStore
+from src.core.schemas.models import SkillMetadata, SkillDoc
+from src.infrastructure.storage.fs_skill_store import FSSkillStore, Signature
+from src.infrastructure.storage.skill_watcher import SkillWatcher, create_watcher
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Vista inmutable del catálogo; se reemplaza entera en cada re-indexado."""
+
+    generation: int = 0
+    metadata: List[SkillMetadata] = field(default_factory=list)
+    docs: Dict[str, Tuple[Signature, Optional[SkillDoc]]] = field(default_factory=dict)
+
+
+class LiveSkillRegistry(ISkillStore):
+    """
+    Registry de skills en vivo (invalidación push en lugar de polling).
+
+    Mantiene en memoria los niveles 1 y 2 de todo el catálogo y se
+    re-indexa cuando el watcher detecta cambios en `skills_dir`. En el
+    camino de la petición nunca se toca el disco.
+    """
+
+    def __init__(
+        self,
+        store: FSSkillStore,
+        debounce: float = 0.25,
+        poll_interval: float = 2.0,
+        watcher_factory: Optional[Callable[..., SkillWatcher]] = None,
+    ):
+        self.store = store
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._watcher_factory = watcher_factory or create_watcher
+        self._watcher: Optional[SkillWatcher] = None
+        self._snapshot = _Snapshot()
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Número de generación del catálogo; cambia cuando cambia alguna skill."""
+        return self._snapshot.generation
+
+    def start(self):
+        """Indexa el catálogo completo y empieza a escuchar cambios."""
+        self.reindex()
+        if self._watcher is None:
+            self._watcher = self._watcher_factory(
+                self.store.skills_dir,
+                self.reindex,
+                debounce=self.debounce,
+                poll_interval=self.poll_interval,
+            )
+            self._watcher.start()
+
+    def stop(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def reindex(self):
+        """Re-indexa desde disco. Solo recarga el Nivel 2 de las skills que cambiaron."""
+        with self._lock:
+            previous = self._snapshot
+            if not self.store.refresh() and previous.generation:
+                return
+
+            docs = {}
+            for name, entry in self.store.entries().items():
+                cached = previous.docs.get(name)
+                if cached and cached[0] == entry.signature:
+                    docs[name] = cached
+                else:
+                    docs[name] = (entry.signature, self.store.load_skill_doc(name))
+
+            self._snapshot = _Snapshot(
+                generation=previous.generation + 1,
+                metadata=[e.metadata for e in self.store.entries().values() if e.metadata],
+                docs=docs,
+            )
+
+    async def get_all_metadata(self) -> List[SkillMetadata]:
+        """Nivel 1 desde memoria (lista compartida, de solo lectura)."""
+        return self._snapshot.metadata
+
+    async def get_skill_doc(self, name: str) -> Optional[SkillDoc]:
+        """Nivel 2 desde memoria."""
+        cached = self._snapshot.docs.get(name)
+        return cached[1] if cached else None
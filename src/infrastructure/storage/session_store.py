@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+from src.core.interfaces.ports import ISessionStore, SessionConflictError
+from src.core.schemas.models import AgentState, BlobRef, Observation
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    steps INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    snapshot TEXT,
+    snapshot_messages INTEGER NOT NULL DEFAULT 0,
+    snapshot_observations INTEGER NOT NULL DEFAULT 0,
+    spilled INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS observations (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+def _dump_observation(observation: Observation) -> str:
+    # El BlobRef se marca para reconstruirlo como tal (content es Any)
+    return json.dumps(
+        {"blob": isinstance(observation.content, BlobRef), **observation.model_dump()},
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def _load_observation(data: str) -> Observation:
+    raw = json.loads(data)
+    if raw.pop("blob", False):
+        raw["content"] = BlobRef(**raw["content"])
+    return Observation(**raw)
+
+
+class SQLiteSessionStore(ISessionStore):
+    """
+    Sesiones en SQLite (WAL): log append-only de mensajes y observaciones
+    más un snapshot periódico del estado.
+
+    `save` solo inserta lo añadido desde el último guardado (según
+    `state.cursor`) en una transacción. Los `seq` son únicos: si otro
+    proceso ya ocupó esas posiciones, `save` lanza `SessionConflictError`
+    en lugar de sobrescribir sus mensajes.
+
+    Cada `snapshot_every` mensajes se reescribe el snapshot con el estado en
+    memoria (historial ya compactado y observaciones con sus `BlobRef`), así
+    que `load` lee una fila más la cola del log sin reproducirlo entero. El
+    snapshot crece con ese estado, no con el log: su tamaño lo acotan
+    `HistoryCompactor` y el blob store.
+    Los mensajes ya guardados que se reescriben en memoria (compactación,
+    volcado al blob store; ver `AgentState.replace_message`) se actualizan
+    en su fila, o fuerzan un snapshot nuevo si caen dentro del anterior.
+    Las llamadas a SQLite van a un hilo para no bloquear el event loop.
+    """
+
+    def __init__(self, path: str, snapshot_every: int = 50):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Con WAL, NORMAL solo arriesga la última transacción ante un corte de luz
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        if "spilled" not in columns:
+            # Bases creadas antes de persistir el cursor del spiller
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN spilled INTEGER NOT NULL DEFAULT 0")
+
+    async def load(self, session_id: str) -> Optional[AgentState]:
+        return await asyncio.to_thread(self.load_sync, session_id)
+
+    async def save(self, state: AgentState) -> None:
+        await asyncio.to_thread(self.save_sync, state)
+
+    def load_sync(self, session_id: str) -> Optional[AgentState]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT steps, snapshot, snapshot_messages, snapshot_observations, spilled "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            steps, snapshot, snap_messages, snap_observations, spilled = row
+            messages = self._conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? AND seq >= ? ORDER BY seq",
+                (session_id, snap_messages),
+            ).fetchall()
+            observations = self._conn.execute(
+                "SELECT data FROM observations WHERE session_id = ? AND seq >= ? ORDER BY seq",
+                (session_id, snap_observations),
+            ).fetchall()
+
+        base = json.loads(snapshot) if snapshot else {"history": [], "observations": []}
+        history: List[dict] = base["history"] + [{"role": r, "content": c} for r, c in messages]
+        state = AgentState(
+            session_id=session_id,
+            history=history,
+            steps=steps,
+            observations=[_load_observation(d) for d in base["observations"]]
+            + [_load_observation(d) for (d,) in observations],
+        )
+        state.cursor.messages = len(state.history)
+        state.cursor.observations = len(state.observations)
+        state.cursor.snapshot = snap_messages
+        state.cursor.spilled = spilled
+        return state
+
+    def save_sync(self, state: AgentState) -> None:
+        cursor = state.cursor
+        new_messages = state.history[cursor.messages :]
+        new_observations = state.observations[cursor.observations :]
+        edited = sorted(i for i in cursor.edited if i < cursor.messages)
+        snapshot = None
+        if len(state.history) - cursor.snapshot >= self.snapshot_every or (
+            edited and edited[0] < cursor.snapshot
+        ):
+            snapshot = json.dumps(
+                {
+                    "history": state.history,
+                    "observations": [_dump_observation(o) for o in state.observations],
+                },
+                ensure_ascii=False,
+            )
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO messages (session_id, seq, role, content) VALUES (?, ?, ?, ?)",
+                    [
+                        (state.session_id, cursor.messages + i, m["role"], m["content"])
+                        for i, m in enumerate(new_messages)
+                    ],
+                )
+                self._conn.executemany(
+                    "INSERT INTO observations (session_id, seq, data) VALUES (?, ?, ?)",
+                    [
+                        (state.session_id, cursor.observations + i, _dump_observation(o))
+                        for i, o in enumerate(new_observations)
+                    ],
+                )
+                if snapshot is None:
+                    # Con snapshot nuevo el log anterior ya no se lee
+                    self._conn.executemany(
+                        "UPDATE messages SET content = ? WHERE session_id = ? AND seq = ?",
+                        [(state.history[i]["content"], state.session_id, i) for i in edited],
+                    )
+                self._conn.execute(
+                    "INSERT INTO sessions (session_id, steps, updated_at, spilled) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET steps = excluded.steps, "
+                    "updated_at = excluded.updated_at, spilled = excluded.spilled",
+                    (state.session_id, state.steps, time.time(), cursor.spilled),
+                )
+                if snapshot is not None:
+                    self._conn.execute(
+                        "UPDATE sessions SET snapshot = ?, snapshot_messages = ?, "
+                        "snapshot_observations = ? WHERE session_id = ?",
+                        (snapshot, len(state.history), len(state.observations), state.session_id),
+                    )
+                self._conn.execute("COMMIT")
+            except sqlite3.IntegrityError as e:
+                self._conn.execute("ROLLBACK")
+                raise SessionConflictError(
+                    f"La sesión {state.session_id} cambió en otro proceso; recárgala"
+                ) from e
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        cursor.messages = len(state.history)
+        cursor.observations = len(state.observations)
+        cursor.edited.clear()
+        if snapshot is not None:
+            cursor.snapshot = len(state.history)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
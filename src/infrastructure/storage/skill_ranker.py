@@ -0,0 +1,114 @@
+import itertools
+import math
+import re
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.core.interfaces.ports import ISkillPredictor, ISkillRanker
+from src.core.schemas.models import SkillMetadata
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a al con de del el en es la las lo los me mi o para por que se su un una y "
+    "the an and for in is of on or to with what how".split()
+)
+# Las palabras del nombre de la skill pesan más que las de la descripción
+_NAME_WEIGHT = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Minúsculas, sin acentos, alfanumérico y sin stopwords."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [t for t in _TOKEN_RE.findall(text) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class _BM25Index:
+    """Índice invertido BM25 sobre nombre + descripción de cada skill."""
+
+    def __init__(self, skills: Sequence[SkillMetadata], k1: float = 1.5, b: float = 0.75):
+        self.skills = list(skills)
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.lengths: List[int] = []
+
+        for idx, skill in enumerate(self.skills):
+            terms = tokenize(skill.name) * _NAME_WEIGHT + tokenize(skill.description)
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings[term].append((idx, tf))
+
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        n = len(self.skills)
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """Devuelve (índice, score) de las skills con score > 0, de mayor a menor."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for idx, tf in self.postings[term]:
+                norm = 1 - self.b + self.b * self.lengths[idx] / (self.avg_length or 1)
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class BM25SkillRanker(ISkillRanker, ISkillPredictor):
+    """
+    Selección léxica local (BM25) de las top-k skills para el mensaje del usuario.
+    Evita que el prompt del Router crezca linealmente con el catálogo.
+    También actúa como predictor barato para la especulación del Orchestrator.
+    """
+
+    # Índices vivos: catálogo completo (select) y subconjuntos del Router (predict)
+    _MAX_INDEXES = 4
+
+    def __init__(self, top_k: int = 8, always_include: Optional[List[str]] = None):
+        self.top_k = top_k
+        self.always_include = list(always_include or [])
+        self._indexes: "OrderedDict[int, _BM25Index]" = OrderedDict()
+
+    async def select(self, query: str, skills: List[SkillMetadata]) -> List[SkillMetadata]:
+        if self.top_k <= 0 or len(skills) <= self.top_k:
+            return skills
+
+        index = self._get_index(skills)
+        selected = [s for s in index.skills if s.name in self.always_include]
+        chosen = {s.name for s in selected}
+        # Las fijas que no están en el catálogo no amplían el límite
+        limit = self.top_k + len(selected)
+
+        # Coincidencias BM25 y, si no llegan a k, el resto en orden de catálogo:
+        # una consulta sin términos comunes no deja al Router sin skills
+        ranked = (index.skills[idx] for idx, _ in index.search(query))
+        for skill in itertools.chain(ranked, index.skills):
+            if len(selected) >= limit:
+                break
+            if skill.name not in chosen:
+                selected.append(skill)
+                chosen.add(skill.name)
+        return selected
+
+    def predict(self, query: str, skills: List[SkillMetadata], limit: int) -> List[str]:
+        if limit <= 0 or not skills:
+            return []
+        index = self._get_index(skills)
+        return [index.skills[idx].name for idx, _ in index.search(query)[:limit]]
+
+    def _get_index(self, skills: List[SkillMetadata]) -> _BM25Index:
+        """Reconstruye el índice solo cuando cambia el catálogo."""
+        key = hash(tuple((s.name, s.description) for s in skills))
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = _BM25Index(skills)
+            while len(self._indexes) > self._MAX_INDEXES:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(key)
+        return index
@@ -0,0 +1,190 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from src.infrastructure.storage.fs_skill_store import scan_signatures
+
+logger = logging.getLogger(__name__)
+
+# Máscaras de inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class SkillWatcher(ABC):
+    """
+    Vigila el directorio de skills en un hilo propio y llama a `on_change`
+    una sola vez por ráfaga de cambios (debounce).
+    """
+
+    def __init__(self, skills_dir: str, on_change: Callable[[], None]):
+        self.skills_dir = skills_dir
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @abstractmethod
+    def _run(self):
+        """Bucle del hilo vigilante; termina cuando se activa `self._stop`."""
+        pass
+
+    def _fire(self):
+        try:
+            self.on_change()
+        except Exception:
+            logger.exception("Error re-indexando el catálogo de skills")
+
+
+class PollingSkillWatcher(SkillWatcher):
+    """Fallback portable: barrido periódico de `stat` sobre el catálogo."""
+
+    def __init__(
+        self, skills_dir: str, on_change: Callable[[], None], interval: float = 2.0
+    ):
+        super().__init__(skills_dir, on_change)
+        self.interval = interval
+        self._last = scan_signatures(skills_dir)
+
+    def _run(self):
+        # El propio intervalo de sondeo agrupa las ráfagas de escrituras
+        while not self._stop.wait(self.interval):
+            current = scan_signatures(self.skills_dir)
+            if current != self._last:
+                self._last = current
+                self._fire()
+
+
+class InotifySkillWatcher(SkillWatcher):
+    """Watcher basado en inotify (Linux) vía ctypes, sin dependencias externas."""
+
+    def __init__(
+        self,
+        skills_dir: str,
+        on_change: Callable[[], None],
+        debounce: float = 0.25,
+    ):
+        super().__init__(skills_dir, on_change)
+        self.debounce = debounce
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self._wake_r, self._wake_w = os.pipe()
+        self._add_watches()
+
+    @staticmethod
+    def _load_libc():
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify solo está disponible en Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+
+    def _add_watches(self):
+        """Vigila el directorio raíz y cada directorio de skill (idempotente)."""
+        paths = [self.skills_dir]
+        try:
+            paths += [e.path for e in os.scandir(self.skills_dir) if e.is_dir()]
+        except OSError:
+            pass
+        for path in paths:
+            self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+
+    def stop(self):
+        # Idempotente: un segundo stop() no vuelve a cerrar los descriptores
+        if self._fd is None:
+            return
+        self._stop.set()
+        os.write(self._wake_w, b"x")
+        super().stop()
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+        self._fd = None
+
+    def _drain(self) -> int:
+        """Consume los eventos pendientes y devuelve cuántos había."""
+        count = 0
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return count
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + name_len
+                count += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._stop.is_set():
+                return
+            if self._fd not in ready or not self._drain():
+                continue
+
+            # Debounce: esperamos a que la ráfaga se calme antes de re-indexar
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd, self._wake_r], [], [], self.debounce)
+                if self._fd not in ready or not self._drain():
+                    break
+
+            if not self._stop.is_set():
+                self._add_watches()
+                self._fire()
+
+
+def create_watcher(
+    skills_dir: str,
+    on_change: Callable[[], None],
+    debounce: float = 0.25,
+    poll_interval: float = 2.0,
+) -> SkillWatcher:
+    """Usa inotify cuando está disponible y cae a sondeo periódico si no."""
+    try:
+        return InotifySkillWatcher(skills_dir, on_change, debounce=debounce)
+    except (OSError, AttributeError) as e:
+        logger.info("inotify no disponible (%s), usando sondeo periódico", e)
+        return PollingSkillWatcher(skills_dir, on_change, interval=poll_interval)
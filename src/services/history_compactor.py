@@ -0,0 +1,113 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List
+from src.core.interfaces.ports import ITokenizer
+from src.core.schemas.models import AgentState, PromptReport, OBSERVATION_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Tokens de overhead por mensaje en el formato chat (rol + delimitadores)
+MESSAGE_OVERHEAD = 4
+# Marcas finales para no volver a compactar un mensaje ya compactado
+_TRUNCATED_MARK = " para ahorrar contexto]"
+_ELIDED_MARK = " para ahorrar contexto]."
+
+
+class HistoryCompactor:
+    """
+    Mantiene `AgentState.history` por debajo de un presupuesto de tokens.
+
+    Solo toca observaciones antiguas (mensajes `[SYSTEM OBSERVATION]`); la
+    última se conserva íntegra. Primero se truncan a un preview, de la más
+    antigua a la más reciente, y si no basta se eliden por completo. La
+    compactación es persistente: un mensaje ya compactado no cambia en los
+    pasos siguientes, de modo que el prefijo del prompt sigue siendo estable.
+    """
+
+    def __init__(
+        self,
+        tokenizer: ITokenizer,
+        budget: int,
+        preview_chars: int = 400,
+        cache_size: int = 1024,
+    ):
+        self.tokenizer = tokenizer
+        self.budget = budget
+        self.preview_chars = preview_chars
+        self.cache_size = cache_size
+        # Clave = digest del contenido: la LRU no retiene los mensajes grandes
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+
+    def count_message(self, message: Dict[str, str]) -> int:
+        content = message.get("content", "")
+        key = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        cached = self._counts.get(key)
+        if cached is None:
+            cached = self.tokenizer.count(content)
+            self._counts[key] = cached
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        else:
+            self._counts.move_to_end(key)
+        return cached + MESSAGE_OVERHEAD
+
+    def count(self, history: List[Dict[str, str]]) -> int:
+        return sum(self.count_message(m) for m in history)
+
+    def compact(self, state: AgentState) -> PromptReport:
+        """Compacta el historial in-place y devuelve el informe del paso."""
+        history = state.history
+        sizes = [self.count_message(m) for m in history]
+        total = before = sum(sizes)
+        report = PromptReport(
+            step=state.steps, tokens_before=before, tokens_after=before, budget=self.budget
+        )
+        if self.budget <= 0 or total <= self.budget:
+            return report
+
+        candidates = [
+            i for i, m in enumerate(history) if m.get("content", "").startswith(OBSERVATION_PREFIX)
+        ][:-1]  # La última observación se queda completa
+
+        # 1) Truncar a preview (de la más antigua a la más reciente)
+        for i in candidates:
+            if total <= self.budget:
+                break
+            content = history[i]["content"]
+            if len(content) <= self.preview_chars or content.endswith(_TRUNCATED_MARK):
+                continue
+            omitted = len(content) - self.preview_chars
+            state.replace_message(
+                i, f"{content[: self.preview_chars]}\n... [{omitted} caracteres omitidos{_TRUNCATED_MARK}"
+            )
+            size = self.count_message(history[i])
+            total += size - sizes[i]
+            sizes[i] = size
+            report.truncated.append(i)
+
+        # 2) Elidir por completo si el preview no basta
+        for i in candidates:
+            if total <= self.budget:
+                break
+            content = history[i]["content"]
+            if content.endswith(_ELIDED_MARK):
+                continue
+            header = content.split("\n", 1)[0]
+            state.replace_message(i, f"{header}\n[contenido elidido{_ELIDED_MARK}")
+            size = self.count_message(history[i])
+            total += size - sizes[i]
+            sizes[i] = size
+            report.elided.append(i)
+
+        report.tokens_after = total
+        if report.truncated or report.elided:
+            logger.info(
+                "Historial compactado: %d -> %d tokens (presupuesto %d, truncadas %d, elididas %d)",
+                before, total, self.budget, len(report.truncated), len(report.elided),
+            )
+        if total > self.budget:
+            logger.warning(
+                "El historial sigue por encima del presupuesto (%d > %d tokens)", total, self.budget
+            )
+        return report
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+from src.core.interfaces.ports import IBlobStore
+from src.core.schemas.models import OBSERVATION_PREFIX, AgentState, BlobRef, Observation
+
+logger = logging.getLogger(__name__)
+
+
+class ObservationSpiller:
+    """
+    Saca de `AgentState` los contenidos grandes y los guarda en un
+    IBlobStore: el `content` de más de `threshold` bytes se sustituye por un
+    `BlobRef` (hash, tamaño y preview), tanto en `observations` como en el
+    mensaje de `history` que lo inyectó.
+
+    El contenido completo se recupera bajo demanda con `load`/`rehydrate`:
+    `expand` lo devuelve al último mensaje solo mientras dura la llamada al
+    Router, y `collapse` deja de nuevo el preview.
+    """
+
+    def __init__(self, store: IBlobStore, threshold: int = 16384, preview_chars: int = 400):
+        self.store = store
+        self.threshold = threshold
+        self.preview_chars = preview_chars
+
+    @staticmethod
+    def _encode(content: Any) -> Tuple[bytes, str]:
+        if isinstance(content, str):
+            return content.encode("utf-8"), "text"
+        return json.dumps(content, ensure_ascii=False, default=str).encode("utf-8"), "json"
+
+    def _preview(self, text: str) -> str:
+        return text[: self.preview_chars]
+
+    async def spill(self, state: AgentState) -> int:
+        """Igual que `spill_sync`, en un hilo (sha256 y escritura a disco)."""
+        return await asyncio.to_thread(self.spill_sync, state)
+
+    def spill_sync(self, state: AgentState) -> int:
+        """
+        Vuelca las observaciones nuevas que superen el umbral; devuelve los
+        bytes sacados de memoria. Solo revisa las añadidas desde la última
+        pasada (`state.cursor.spilled`).
+        """
+        spilled = 0
+        start = state.cursor.spilled
+        for i in range(start, len(state.observations)):
+            observation = state.observations[i]
+            if isinstance(observation.content, BlobRef):
+                continue
+            data, encoding = self._encode(observation.content)
+            if len(data) < self.threshold:
+                continue
+            ref = BlobRef(
+                hash=self.store.put(data),
+                size=len(data),
+                preview=self._preview(data.decode("utf-8", errors="replace")),
+                encoding=encoding,
+            )
+            # Copia: otros componentes pueden conservar la Observation original
+            state.observations[i] = observation.model_copy(update={"content": ref})
+            self._replace_in_history(state, observation, state.observations[i])
+            spilled += len(data)
+        state.cursor.spilled = len(state.observations)
+
+        if spilled:
+            logger.debug("Sesión %s: %d bytes volcados al blob store", state.session_id, spilled)
+        return spilled
+
+    @staticmethod
+    def _replace_block(content: str, old: str, new: str) -> Optional[str]:
+        """Sustituye el bloque `old` completo (no un prefijo de otro bloque) o None."""
+        start = content.find(old)
+        while start >= 0:
+            end = start + len(old)
+            if content[max(0, start - 2) : start] in ("", "\n\n") and content[end : end + 2] in ("", "\n\n"):
+                return content[:start] + new + content[end:]
+            start = content.find(old, start + 1)
+        return None
+
+    def _replace_in_history(self, state: AgentState, old: Observation, new: Observation) -> bool:
+        """Cambia el bloque de `old` por el de `new` en el mensaje más reciente que lo contenga."""
+        old_block, new_block = state.format_observation(old), state.format_observation(new)
+        for i in range(len(state.history) - 1, -1, -1):
+            if not state.history[i]["content"].startswith(OBSERVATION_PREFIX):
+                continue
+            content = self._replace_block(state.history[i]["content"], old_block, new_block)
+            if content is not None:
+                state.replace_message(i, content)
+                return True
+        return False
+
+    async def expand(self, state: AgentState) -> Optional[str]:
+        """
+        Rehidrata los `BlobRef` del último mensaje si es una observación (la
+        que el Router aún no ha visto). Devuelve el texto con previews para
+        `collapse`, o None si no había nada que expandir.
+        """
+        if not state.history or not state.history[-1]["content"].startswith(OBSERVATION_PREFIX):
+            return None
+        message = state.history[-1]
+        collapsed = message["content"]
+        # Las observaciones del mensaje (una, o las de un batch) son las últimas
+        refs = []
+        for observation in reversed(state.observations):
+            if state.format_observation(observation) not in collapsed:
+                break
+            if isinstance(observation.content, BlobRef):
+                refs.append(observation)
+        if not refs:
+            return None
+        full = await asyncio.to_thread(lambda: [self.rehydrate(o) for o in refs])
+        content = collapsed
+        for observation, original in zip(refs, full):
+            content = self._replace_block(
+                content, state.format_observation(observation), state.format_observation(original)
+            ) or content
+        message["content"] = content
+        return collapsed
+
+    @staticmethod
+    def collapse(state: AgentState, collapsed: Optional[str]):
+        """Deshace `expand`: el último mensaje vuelve a llevar solo los previews."""
+        if collapsed is not None:
+            state.history[-1]["content"] = collapsed
+
+    def load(self, ref: BlobRef) -> Any:
+        """Contenido completo de un `BlobRef` (el original, no el preview)."""
+        data = self.store.get(ref.hash)
+        if data is None:
+            raise KeyError(f"Blob no encontrado: {ref.hash}")
+        text = data.decode("utf-8")
+        return json.loads(text) if ref.encoding == "json" else text
+
+    def rehydrate(self, observation: Observation) -> Observation:
+        if not isinstance(observation.content, BlobRef):
+            return observation
+        return observation.model_copy(update={"content": self.load(observation.content)})
+
+    @staticmethod
+    def memory_report(state: AgentState) -> Dict[str, int]:
+        """Bytes de contenido residentes en la sesión frente a los volcados a disco."""
+        history = sum(len(m["content"].encode("utf-8")) for m in state.history)
+        resident, spilled, blobs = 0, 0, 0
+        for observation in state.observations:
+            if isinstance(observation.content, BlobRef):
+                resident += len(observation.content.preview.encode("utf-8"))
+                spilled += observation.content.size
+                blobs += 1
+            else:
+                resident += len(ObservationSpiller._encode(observation.content)[0])
+        return {
+            "history_bytes": history,
+            "observation_bytes": resident,
+            "resident_bytes": history + resident,
+            "spilled_bytes": spilled,
+            "blobs": blobs,
+        }
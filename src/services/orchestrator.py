@@ -1,6 +1,22 @@
-from typing import List, Dict, Any, Optional
-from src.core.interfaces.ports import ISkillStore, ILLMClient, IRunner, IMCPClient
-from src.core.schemas.models import AgentState, Action, Observation, ActionType
+import asyncio
+import uuid
+from typing import List, Dict, Any, Optional, Tuple
+from src.core.interfaces.ports import (
+    ISkillStore,
+    ILLMClient,
+    IRunner,
+    IMCPClient,
+    ISessionStore,
+    ISkillRanker,
+    ITracer,
+    NullTracer,
+    SessionConflictError,
+)
+from src.core.schemas.models import AgentState, Action, Observation, ActionType, SkillDoc
+from src.core.policies import MAX_BATCH_ACTIONS, MAX_PARALLEL_ACTIONS
+from src.services.history_compactor import HistoryCompactor
+from src.services.observation_spiller import ObservationSpiller
+from src.services.speculation import EarlyRun, Speculator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,68 +34,418 @@ class Orchestrator:
         llm_client: ILLMClient,
         runner: IRunner,
         mcp_client: Optional[IMCPClient] = None,
+        skill_ranker: Optional[ISkillRanker] = None,
+        max_parallel_actions: int = MAX_PARALLEL_ACTIONS,
+        history_compactor: Optional[HistoryCompactor] = None,
+        tracer: Optional[ITracer] = None,
+        speculator: Optional[Speculator] = None,
+        spiller: Optional[ObservationSpiller] = None,
+        session_store: Optional[ISessionStore] = None,
     ):
         self.skill_store = skill_store
         self.llm = llm_client
         self.runner = runner
         self.mcp = mcp_client
+        self.skill_ranker = skill_ranker
         self.max_steps = 6  # Definido en policies.py (Plan Inicial)
+        self.max_parallel_actions = max(1, max_parallel_actions)
+        self.compactor = history_compactor
+        # Spans por fase (router, skill, MCP...); NullTracer = coste ~0
+        self.tracer = tracer or NullTracer()
+        # Prefetch/ejecución adelantada de las skills que predice el BM25 local
+        self.speculator = speculator
+        # Observaciones grandes fuera de memoria (blob store direccionado por hash)
+        self.spiller = spiller
+        # Sin store, cada llamada a `chat` es una conversación nueva en memoria
+        self.sessions = session_store
 
-    async def chat(self, user_prompt: str, on_step_cb=None) -> str:
-        """Punto de entrada para la CLI."""
+    async def _prefetch_skill(self, name: str) -> Optional[SkillDoc]:
+        """Carga el SkillDoc (Nivel 2) y precalienta el runner mientras el LLM sigue generando."""
+        skill_doc = await self.skill_store.get_skill_doc(name)
+        prewarm = getattr(self.runner, "prewarm", None)
+        if skill_doc and prewarm:
+            try:
+                await prewarm(skill_doc)
+            except Exception as e:
+                logger.debug("Prewarm de '%s' falló: %s", name, e)
+        return skill_doc
 
-        # 1. Inicialización de sesión volátil
-        state = AgentState(session_id="session_poc")
+    async def chat(
+        self,
+        user_prompt: str,
+        on_step_cb=None,
+        on_token_cb=None,
+        bypass_cache: bool = False,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """
+        Punto de entrada para la CLI y el servidor HTTP.
+        `on_token_cb` recibe los fragmentos de la respuesta final según llegan
+        (solo si el cliente LLM hace streaming). `bypass_cache` fuerza
+        llamadas reales al Router aunque haya caché de decisiones. Con
+        session store, `session_id` reanuda la conversación guardada; sin él
+        (o sin store) se empieza una nueva.
+        """
+
+        # 1. Sesión: reanudada del store o nueva
+        session_id = session_id or uuid.uuid4().hex
+        state = await self._load_session(session_id)
+        state.bypass_cache = bypass_cache
+        state.is_complete = False
         state.add_message("user", user_prompt)
 
-        # Cargar catálogo Nivel 1 (Metadata) para el Router
-        state.available_skills = await self.skill_store.get_all_metadata()
+        with self.tracer.span("chat", session_id=session_id) as chat_span:
+            # Cargar catálogo Nivel 1 (Metadata) para el Router
+            with self.tracer.span("catalog.load") as span:
+                catalog = await self.skill_store.get_all_metadata()
+                if self.skill_ranker:
+                    # Solo las top-k skills relevantes para el mensaje entran en el prompt
+                    catalog = await self.skill_ranker.select(user_prompt, catalog)
+                state.available_skills = catalog
+                span.set("skills", len(catalog))
+
+            # Tools MCP descubiertas vía `tools/list` (cacheadas por el pool)
+            if self.mcp:
+                with self.tracer.span("mcp.list_tools"):
+                    try:
+                        state.available_tools = await self.mcp.list_tools()
+                    except Exception as e:
+                        logger.warning("No se pudieron descubrir las tools MCP: %s", e)
 
-        # 2. Loop Agentic
-        while state.steps < self.max_steps and not state.is_complete:
-            # A. Fase de Decisión (Router LLM)
-            action: Action = await self.llm.ask(state)
+            # 2. Loop Agentic
+            prefetched: Dict[str, asyncio.Task] = {}
+            speculated: List[Tuple[str, asyncio.Task]] = []
+            discarded: List[asyncio.Task] = []
+            try:
+                return await self._loop(
+                    state, prefetched, speculated, discarded, on_step_cb, on_token_cb
+                )
+            finally:
+                chat_span.set("steps", state.steps)
+                if self.speculator:
+                    self._settle_speculation(prefetched, speculated, chat_span)
+                    await self._cancel_early_runs(discarded)
+                if self.spiller:
+                    for key, value in self.spiller.memory_report(state).items():
+                        chat_span.set(key, value)
+                for task in prefetched.values():
+                    task.cancel()
+                await self._save_session(state)
+
+    async def _loop(
+        self,
+        state: AgentState,
+        prefetched: Dict[str, "asyncio.Task[Optional[SkillDoc]]"],
+        speculated: List[Tuple[str, asyncio.Task]],
+        discarded: List[asyncio.Task],
+        on_step_cb=None,
+        on_token_cb=None,
+    ) -> str:
+        # Límite de pasos por turno (una sesión reanudada ya trae pasos previos)
+        max_step = state.steps + self.max_steps
+        turn_start = len(state.observations)
+        while state.steps < max_step and not state.is_complete:
+            # A. Fase de Decisión (Router LLM). En streaming, en cuanto se conoce
+            # `type`+`name` de una skill se adelanta la carga de su doc.
+            decided: Dict[str, str] = {}
+            early: Optional[EarlyRun] = None
+            if self.speculator:
+                # Mientras el Router piensa, se cargan las skills más probables
+                # (una vez por turno: el doc ya queda en la LRU del store)
+                already = {name for name, _ in speculated}
+                for name in self.speculator.predict(state, since=turn_start):
+                    if name not in prefetched and name not in already:
+                        prefetched[name] = asyncio.create_task(self._prefetch_skill(name))
+                        speculated.append((name, prefetched[name]))
+
+            async def on_event(kind: str, data: Any):
+                nonlocal early
+                if kind == "token":
+                    if on_token_cb:
+                        await on_token_cb(data)
+                    return
+                if kind == "args":
+                    # `args` completo antes que `reason`: se puede lanzar ya la skill
+                    if (
+                        self.speculator
+                        and self.speculator.early_execution
+                        and decided.get("type") == "skill"
+                        and decided.get("name")
+                        and early is None
+                    ):
+                        early = self._start_early_run(decided["name"], data, prefetched)
+                    return
+                if kind not in ("type", "name"):
+                    return
+                decided[kind] = data
+                name = decided.get("name")
+                if decided.get("type") == "skill" and name and name not in prefetched:
+                    prefetched[name] = asyncio.create_task(self._prefetch_skill(name))
+
+            with self.tracer.span("router", step=state.steps) as span:
+                # El Router ve completa la última observación; en el estado solo queda su preview
+                collapsed = await self._expand(state)
+                try:
+                    # El historial se compacta antes de cada llamada para respetar el presupuesto
+                    if self.compactor:
+                        report = self.compactor.compact(state)
+                        state.prompt_reports.append(report)
+                        span.set("history_tokens", report.tokens_after)
+
+                    action: Action = await self.llm.ask(state, on_event=on_event)
+                finally:
+                    if collapsed is not None:
+                        self.spiller.collapse(state, collapsed)
+                span.set("action", f"{action.type}:{action.name}")
+                if action.usage:
+                    span.set("prompt_tokens", action.usage.get("prompt_tokens"))
+                    span.set("completion_tokens", action.usage.get("completion_tokens"))
+
+            if early and not (
+                action.type == ActionType.SKILL
+                and not action.stop
+                and early.matches(action.name, action.args)
+            ):
+                # La decisión final no coincide: el resultado adelantado se descarta
+                self._discard_early_run(early, discarded)
+                early = None
 
             if on_step_cb:
                 await on_step_cb(state.steps, action)
 
             if action.type == "respond" or action.stop:
                 state.is_complete = True
-                return action.args.get("response", "No pude generar una respuesta.")
+                response = action.args.get("response", "No pude generar una respuesta.")
+                if self.sessions:
+                    # Contexto para el siguiente turno de la sesión
+                    state.add_message("assistant", response)
+                return response
 
             # D. Registrar la acción en el historial (para que el LLM sepa qué decidió)
-            state.add_message(
-                "assistant",
-                f"Decision: {action.type}:{action.name} ({action.reason}) Args: {action.args}",
-            )
+            state.add_message("assistant", self._describe_decision(action))
 
             # B. Fase de Ejecución
-            observation: Optional[Observation] = None
-
-            if action.type == "skill":
-                # Nivel 2: Si el agente elige una skill, cargamos su doc completo antes de ejecutar
-                # (Nota: En esta POC, la ejecución incluye la carga del contrato de la skill)
-                skill_doc = await self.skill_store.get_skill_doc(action.name)
-                if skill_doc:
-                    observation = await self.runner.run(skill_doc, action.args)
+            if action.type == ActionType.BATCH:
+                with self.tracer.span("batch", actions=len(action.actions)):
+                    observations = await self._execute_batch(action, prefetched)
+                # C. Fase de Observación (todas juntas antes de volver al Router)
+                with self.tracer.span("observation.inject", observations=len(observations)) as span:
+                    state.add_observations(observations)
+                    await self._spill(state, span)
+                await self._save_session(state)
+                continue
+
+            observation = await self._execute(action, prefetched, early)
+
+            # C. Fase de Observación
+            with self.tracer.span("observation.inject", observations=1 if observation else 0) as span:
+                if observation:
+                    state.add_observation(observation)
+                    await self._spill(state, span)
                 else:
-                    observation = Observation(
-                        origin=action.name,
-                        content=f"Error: Skill '{action.name}' no encontrada.",
-                        status="error",
+                    state.add_message(
+                        "system", "Error: La acción no produjo ninguna observación."
                     )
+                    state.steps += 1
+            await self._save_session(state)
+
+        return "Se alcanzó el límite de pasos permitido para esta tarea."
+
+    async def _load_session(self, session_id: str) -> AgentState:
+        if self.sessions:
+            try:
+                state = await self.sessions.load(session_id)
+                if state:
+                    return state
+            except Exception as e:
+                logger.warning("No se pudo reanudar la sesión %s: %s", session_id, e)
+        return AgentState(session_id=session_id)
+
+    async def _save_session(self, state: AgentState):
+        """Persistencia incremental tras cada observación y al final del turno."""
+        if not self.sessions:
+            return
+        with self.tracer.span("session.save"):
+            try:
+                await self.sessions.save(state)
+            except SessionConflictError:
+                # Seguir respondiendo sobre una sesión que ya no es la guardada
+                # perdería uno de los dos turnos: lo decide quien llama
+                raise
+            except Exception as e:
+                logger.warning("No se pudo guardar la sesión %s: %s", state.session_id, e)
+
+    async def _expand(self, state: AgentState) -> Optional[str]:
+        if not self.spiller:
+            return None
+        try:
+            return await self.spiller.expand(state)
+        except Exception as e:
+            # Si el blob no se puede leer, el Router trabaja con el preview
+            logger.warning("No se pudo rehidratar la última observación: %s", e)
+            return None
+
+    async def _spill(self, state: AgentState, span):
+        if not self.spiller:
+            return
+        try:
+            span.set("spilled_bytes", await self.spiller.spill(state))
+        except Exception as e:
+            # Sin blob store la sesión sigue funcionando, solo que en memoria
+            logger.warning("No se pudieron volcar observaciones al blob store: %s", e)
+
+    @staticmethod
+    def _describe_decision(action: Action) -> str:
+        if action.type == ActionType.BATCH:
+            parts = "; ".join(f"{a.type}:{a.name} Args: {a.args}" for a in action.actions)
+            return f"Decision: batch ({action.reason}) Actions: [{parts}]"
+        return f"Decision: {action.type}:{action.name} ({action.reason}) Args: {action.args}"
 
-            elif action.type == "tool" and self.mcp:
-                # Ejecución vía MCP
+    async def _execute(
+        self,
+        action: Action,
+        prefetched: Dict[str, "asyncio.Task[Optional[SkillDoc]]"],
+        early: Optional[EarlyRun] = None,
+    ) -> Optional[Observation]:
+        """Ejecuta una acción skill/tool y devuelve su observación."""
+        if action.type == ActionType.SKILL:
+            # Nivel 2: Si el agente elige una skill, cargamos su doc completo antes de ejecutar
+            # (Nota: En esta POC, la ejecución incluye la carga del contrato de la skill)
+            pending = prefetched.pop(action.name, None)
+            with self.tracer.span("skill.load", skill=action.name, prefetched=pending is not None) as span:
+                skill_doc = await (pending or self.skill_store.get_skill_doc(action.name))
+                span.set("found", skill_doc is not None)
+            if skill_doc:
+                with self.tracer.span("skill.run", skill=action.name) as span:
+                    observation = await early.task if early else None
+                    if observation is not None:
+                        self.speculator.stats.early_hits += 1
+                        observation.metadata["speculative"] = True
+                        span.set("early", True)
+                    else:
+                        observation = await self.runner.run(skill_doc, action.args)
+                    span.set("status", observation.status)
+                    for key in ("runner", "cache"):
+                        if key in observation.metadata:
+                            span.set(key, observation.metadata[key])
+                return observation
+            return Observation(
+                origin=action.name,
+                content=f"Error: Skill '{action.name}' no encontrada.",
+                status="error",
+            )
+
+        if action.type == ActionType.TOOL and self.mcp:
+            # Ejecución vía MCP
+            with self.tracer.span("mcp.call", tool=action.name) as span:
                 observation = await self.mcp.call_tool(action.name, action.args)
+                span.set("status", observation.status)
+            return observation
 
-            # C. Fase de Observación
-            if observation:
-                state.add_observation(observation)
-            else:
-                state.add_message(
-                    "system", "Error: La acción no produjo ninguna observación."
+        return None
+
+    def _start_early_run(
+        self, name: str, args: dict, prefetched: Dict[str, "asyncio.Task[Optional[SkillDoc]]"]
+    ) -> EarlyRun:
+        if name not in prefetched:
+            prefetched[name] = asyncio.create_task(self._prefetch_skill(name))
+        early = EarlyRun(name, args, task=None)
+        early.task = asyncio.create_task(self._run_early(early, prefetched[name]))
+        return early
+
+    async def _run_early(
+        self, early: EarlyRun, doc_task: "asyncio.Task[Optional[SkillDoc]]"
+    ) -> Optional[Observation]:
+        """Ejecuta la skill solo si es idempotente (`cache_ttl`); si no, devuelve None."""
+        # shield: cancelar la ejecución adelantada no debe cancelar la carga del doc
+        skill_doc = await asyncio.shield(doc_task)
+        if not skill_doc or not skill_doc.cache_ttl:
+            return None
+        early.started = True
+        try:
+            return await self.runner.run(skill_doc, early.args)
+        except Exception as e:
+            logger.debug("Ejecución adelantada de '%s' falló: %s", early.name, e)
+            return None
+
+    def _discard_early_run(self, early: EarlyRun, discarded: List[asyncio.Task]):
+        if early.started:
+            # Ya está corriendo: sigue en segundo plano (idempotente, puede
+            # llenar la caché) hasta el final del turno; el resultado se ignora
+            self.speculator.stats.early_waste += 1
+            discarded.append(early.task)
+        else:
+            early.task.cancel()
+
+    @staticmethod
+    async def _cancel_early_runs(discarded: List[asyncio.Task]):
+        """Al terminar el turno no quedan ejecuciones adelantadas huérfanas."""
+        for task in discarded:
+            task.cancel()
+        if discarded:
+            await asyncio.gather(*discarded, return_exceptions=True)
+
+    def _settle_speculation(
+        self,
+        prefetched: Dict[str, asyncio.Task],
+        speculated: List[Tuple[str, asyncio.Task]],
+        span,
+    ):
+        """Un prefetch especulativo acierta si `_execute` llegó a consumirlo."""
+        stats = self.speculator.stats
+        hits = sum(1 for name, task in speculated if prefetched.get(name) is not task)
+        stats.prefetch_hits += hits
+        stats.prefetch_waste += len(speculated) - hits
+        span.set("speculation_hits", hits)
+        span.set("speculation_waste", len(speculated) - hits)
+
+    async def _execute_batch(
+        self, batch: Action, prefetched: Dict[str, "asyncio.Task[Optional[SkillDoc]]"]
+    ) -> List[Observation]:
+        """
+        Ejecuta las acciones de un batch en paralelo (máx. `max_parallel_actions`
+        a la vez). Un fallo solo afecta a la observación de su propia acción.
+        """
+        if not batch.actions:
+            return [
+                Observation(
+                    origin="batch",
+                    content="Error: El batch no contiene acciones.",
+                    status="error",
                 )
-                state.steps += 1
+            ]
 
-        return "Se alcanzó el límite de pasos permitido para esta tarea."
+        semaphore = asyncio.Semaphore(self.max_parallel_actions)
+
+        async def run_one(action: Action) -> Observation:
+            if action.type not in (ActionType.SKILL, ActionType.TOOL):
+                return Observation(
+                    origin=action.name,
+                    content=f"Error: Acción '{action.type}' no permitida dentro de un batch.",
+                    status="error",
+                )
+            async with semaphore:
+                try:
+                    observation = await self._execute(action, prefetched)
+                except Exception as e:
+                    logger.warning("Acción '%s' del batch falló: %s", action.name, e)
+                    observation = Observation(
+                        origin=action.name, content=f"Error: {e}", status="error"
+                    )
+            return observation or Observation(
+                origin=action.name,
+                content="Error: La acción no produjo ninguna observación.",
+                status="error",
+            )
+
+        actions = batch.actions[:MAX_BATCH_ACTIONS]
+        observations = list(await asyncio.gather(*(run_one(a) for a in actions)))
+        for dropped in batch.actions[MAX_BATCH_ACTIONS:]:
+            observations.append(
+                Observation(
+                    origin=dropped.name,
+                    content=f"Error: Máximo {MAX_BATCH_ACTIONS} acciones por batch; no se ejecutó.",
+                    status="error",
+                )
+            )
+        return observations
@@ -0,0 +1,106 @@
+import asyncio
+from typing import List, Optional
+from src.core.interfaces.ports import ISkillPredictor
+from src.core.schemas.models import AgentState, Observation, OBSERVATION_PREFIX
+
+# Caracteres de la última observación que se suman a la consulta del predictor
+_QUERY_CONTEXT_CHARS = 500
+
+
+class SpeculationStats:
+    """Contadores acumulados de especulación (para ajustar `top_n`)."""
+
+    def __init__(self):
+        self.prefetch_hits = 0
+        self.prefetch_waste = 0
+        self.early_hits = 0
+        self.early_waste = 0
+
+    @property
+    def hits(self) -> int:
+        return self.prefetch_hits + self.early_hits
+
+    @property
+    def waste(self) -> int:
+        return self.prefetch_waste + self.early_waste
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.waste
+        return self.hits / total if total else 0.0
+
+    @property
+    def waste_ratio(self) -> float:
+        total = self.hits + self.waste
+        return self.waste / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_waste": self.prefetch_waste,
+            "early_hits": self.early_hits,
+            "early_waste": self.early_waste,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "waste_ratio": round(self.waste_ratio, 3),
+        }
+
+
+class EarlyRun:
+    """Ejecución adelantada de una skill idempotente con los `args` ya recibidos."""
+
+    def __init__(self, name: str, args: dict, task: Optional["asyncio.Task[Optional[Observation]]"]):
+        self.name = name
+        self.args = args
+        self.task = task
+        # True cuando el runner ya arrancó (a partir de ahí no se cancela)
+        self.started = False
+
+    def matches(self, name: str, args: dict) -> bool:
+        return self.name == name and self.args == args
+
+
+class Speculator:
+    """
+    Capa de especulación del Orchestrator.
+
+    Antes de cada llamada al Router predice (BM25 local) las `top_n` skills
+    más probables para que el Orchestrator adelante la carga de su doc y
+    el prewarm del runner. Con `early_execution`, las skills idempotentes
+    (`cache_ttl`) se lanzan en cuanto el stream trae sus `args` completos;
+    si la decisión final es otra, el resultado se descarta.
+    """
+
+    def __init__(self, predictor: ISkillPredictor, top_n: int = 2, early_execution: bool = False):
+        self.predictor = predictor
+        self.top_n = top_n
+        self.early_execution = early_execution
+        self.stats = SpeculationStats()
+
+    def predict(self, state: AgentState, since: int = 0) -> List[str]:
+        """
+        Skills candidatas para el siguiente paso (mensaje del usuario + última
+        observación). Se excluyen las ejecutadas desde `since` (el turno en
+        curso), que ya tienen el doc en la LRU y el runner caliente; las de
+        turnos anteriores pueden venir de otro proceso y siguen siendo candidatas.
+        """
+        if self.top_n <= 0 or not state.available_skills:
+            return []
+        executed = {o.origin for o in state.observations[since:]}
+        candidates = [s for s in state.available_skills if s.name not in executed]
+        return self.predictor.predict(self._query(state), candidates, self.top_n)
+
+    @staticmethod
+    def _query(state: AgentState) -> str:
+        # Último mensaje real del usuario (en sesiones reanudadas hay varios turnos)
+        user = next(
+            (
+                m["content"]
+                for m in reversed(state.history)
+                if m["role"] == "user" and not m["content"].startswith(OBSERVATION_PREFIX)
+            ),
+            "",
+        )
+        last = state.history[-1]["content"] if state.history else ""
+        if last.startswith(OBSERVATION_PREFIX):
+            return f"{user} {last[:_QUERY_CONTEXT_CHARS]}"
+        return user
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
+from src.core import policies
 
 
 class Settings(BaseSettings):
@@ -13,6 +14,7 @@ class Settings(BaseSettings):
     LLM_API_KEY: str = "sk-..."
     LLM_MODEL: str = "gpt-4o"
     LLM_BASE_URL: str = "https://api.openai.com/v1"
+    LLM_STREAM: bool = False  # Streaming de la Action con parseo JSON incremental
 
     # Workspace
     WORKSPACE_DIR: str = "./workspace"
@@ -20,8 +22,102 @@ class Settings(BaseSettings):
     SOUL_FILE: str = "./workspace/soul.md"
     TOOLS_FILE: str = "./workspace/tools.md"
 
+    # Skill Registry (modo en vivo: watcher de filesystem + catálogo en memoria)
+    SKILLS_WATCH: bool = False
+    SKILLS_WATCH_DEBOUNCE_MS: int = 250
+    SKILLS_POLL_INTERVAL: float = 2.0
+    # Snapshot precompilado del catálogo (`python -m src.endpoints.cli.compile_catalog`)
+    SKILLS_SNAPSHOT: str = "./workspace/skills.catalog"
+    # Inyección top-k de skills en el Router (0 = todo el catálogo)
+    SKILLS_TOP_K: int = 8
+    SKILLS_ALWAYS_INCLUDE: List[str] = []
+
+    # Runner de skills: "cold" (un proceso por ejecución) o "warm" (pool de workers)
+    RUNNER_MODE: str = "cold"
+    WARM_POOL_SIZE: int = 2
+    WARM_MAX_REQUESTS: int = 200
+    WARM_MAX_RSS_MB: int = 256
+
+    # Caché de resultados de skills idempotentes (TTL en el SKILL.md)
+    SKILL_CACHE_ENABLED: bool = False
+    SKILL_CACHE_SIZE: int = 512
+    SKILL_CACHE_DB: Optional[str] = None  # p.ej. "./workspace/.cache/skills.sqlite"
+
+    # Caché de decisiones del Router (temperature=0 => deterministas)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_SIZE: int = 256
+    LLM_CACHE_DB: Optional[str] = None  # p.ej. "./workspace/.cache/router.sqlite"
+    LLM_CACHE_TTL: float = 3600  # Decisiones skill/tool/batch
+    LLM_CACHE_ANSWER_TTL: float = 600  # Respuestas finales (respond)
+
+    # Orquestador: acciones de un batch ejecutándose en paralelo
+    MAX_PARALLEL_ACTIONS: int = policies.MAX_PARALLEL_ACTIONS
+
+    # Presupuesto de tokens del historial (0 = sin compactación)
+    HISTORY_TOKEN_BUDGET: int = 12000
+    TOKENIZER: str = "auto"  # auto | tiktoken | char
+
+    # Servidor HTTP multi-sesión (`python -m src.endpoints.http.server`)
+    HTTP_HOST: str = "127.0.0.1"
+    HTTP_PORT: int = 8080
+    HTTP_MAX_CONCURRENCY: int = 16  # Sesiones ejecutándose a la vez
+    HTTP_MAX_QUEUE: int = 64  # Peticiones en espera antes de responder 503
+
+    # Especulación: skills más probables (BM25) precargadas mientras decide el Router
+    SPECULATION_TOP_N: int = 0  # 0 = desactivada (opt-in)
+    # Lanza las skills idempotentes (cache_ttl) en cuanto llegan sus args (LLM_STREAM)
+    SPECULATIVE_EXECUTION: bool = False
+
+    # Blob store de observaciones grandes (file | sqlite | off)
+    BLOB_STORE: str = "off"
+    BLOB_PATH: str = "./workspace/.cache/blobs"  # directorio (file) o fichero (sqlite)
+    BLOB_SPILL_BYTES: int = 16384  # Umbral a partir del cual se vuelca
+
+    # Sesiones persistentes (sqlite | off): log append-only + snapshots (opt-in)
+    SESSION_STORE: str = "off"
+    SESSION_DB: str = "./workspace/.cache/sessions.sqlite"
+    SESSION_SNAPSHOT_EVERY: int = 50  # Mensajes entre snapshots
+
+    # MCP: procesos idénticos del servidor stdio en el pool
+    MCP_POOL_SIZE: int = 2
+    # Arranca el pool en el prewarm; si no, con la primera llamada a una tool
+    MCP_PREWARM: bool = False
+
+    # Observabilidad: spans por fase del loop (sin sinks = tracing desactivado)
+    TRACE_FILE: Optional[str] = None  # JSONL, un span por línea
+    METRICS_ENABLED: bool = False  # Expone GET /metrics en el servidor HTTP
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
 
-settings = Settings()
+class _LazySettings:
+    """
+    Proxy de `Settings`: el `.env` y las variables de entorno se leen en el
+    primer acceso, no al importar el módulo. Las asignaciones se reenvían
+    a la instancia real (útil en tests y scripts).
+    """
+
+    __slots__ = ("_instance",)
+
+    def __init__(self):
+        object.__setattr__(self, "_instance", None)
+
+    def _load(self) -> Settings:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            instance = Settings()
+            object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._load(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(self._load())
+
+
+settings = _LazySettings()
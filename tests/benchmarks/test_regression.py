@@ -0,0 +1,34 @@
+from benchmarks.regression import compare, environment_mismatch, threshold_for
+
+
+def test_threshold_prefers_most_specific_pattern():
+    thresholds = {"mcp.*": 1.0, "mcp.roundtrip_ms": 0.1}
+    assert threshold_for("mcp.roundtrip_ms", thresholds, 0.25) == 0.1
+    assert threshold_for("mcp.connect_ms", thresholds, 0.25) == 1.0
+    assert threshold_for("catalog.scan_10_ms", thresholds, 0.25) == 0.25
+
+
+def test_compare_statuses():
+    baseline = {"a_ms": 10.0, "b_ms": 10.0, "c_ms": 10.0, "tiny_ms": 0.01, "gone_ms": 1.0}
+    current = {"a_ms": 14.0, "b_ms": 11.0, "c_ms": 5.0, "tiny_ms": 0.03, "new_ms": 1.0}
+    rows = {r.metric: r.status for r in compare(current, baseline, 0.25, min_delta=0.05)}
+    assert rows == {
+        "a_ms": "regression",
+        "b_ms": "ok",
+        "c_ms": "improved",
+        "tiny_ms": "ok",  # x3 pero por debajo de min_delta
+        "gone_ms": "missing",
+        "new_ms": "new",
+    }
+
+
+def test_zero_threshold_flags_any_growth():
+    rows = compare({"h_bytes": 101.0}, {"h_bytes": 100.0}, 0.25, {"*_bytes": 0.0}, min_delta=0)
+    assert rows[0].status == "regression"
+
+
+def test_environment_mismatch():
+    meta = {"platform": "Linux-x86_64", "python": "3.11.7", "quick": False, "timestamp": "t1"}
+    assert environment_mismatch(dict(meta, timestamp="t2"), meta) == []
+    assert environment_mismatch(dict(meta, quick=True), meta) == ["quick"]
+    assert environment_mismatch(meta, {}) == ["platform", "python", "quick"]
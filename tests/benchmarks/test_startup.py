@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from benchmarks.startup import by_package, parse_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 |     yaml.reader
+import time:       500 |       1400 |   yaml
+import time:      2000 |       3500 | src.infrastructure.storage.fs_skill_store
+"""
+
+
+def test_parse_importtime_and_group_by_package():
+    entries = parse_importtime(SAMPLE)
+    assert [e.module for e in entries] == [
+        "_io",
+        "yaml.reader",
+        "yaml",
+        "src.infrastructure.storage.fs_skill_store",
+    ]
+    assert [e.depth for e in entries] == [1, 2, 1, 0]
+    assert entries[-1].cumulative_us == 3500
+    assert by_package(entries) == {"src": 2000, "yaml": 800, "_io": 120}
+
+
+def test_container_is_lazy():
+    # Construir el contenedor no importa openai ni yaml ni arranca MCP
+    code = (
+        "import sys\n"
+        "from src.bootstrap import AppContainer\n"
+        "c = AppContainer()\n"
+        "print(sorted(m for m in ('openai', 'yaml', 'src.infrastructure.mcp.pool') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import pytest
+from src.core.schemas.models import ROUTER_ERROR, Action
+from src.endpoints.cli.batch import completed_ids, run_batch
+
+
+class StubOrchestrator:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.prompts = []
+        self.sessions = []
+
+    async def chat(self, prompt, on_step_cb=None, session_id="s", **kwargs):
+        self.prompts.append(prompt)
+        self.sessions.append(session_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if prompt == "boom":
+                raise RuntimeError("fallo")
+            if prompt == "router-down":
+                if on_step_cb:
+                    await on_step_cb(
+                        0, Action(type="respond", name=ROUTER_ERROR, reason="r", stop=True)
+                    )
+                return "Error en el Router LLM: 503"
+            if on_step_cb:
+                await on_step_cb(0, Action(type="respond", name="final_answer", reason="r"))
+            return f"eco: {prompt}"
+        finally:
+            self.active -= 1
+
+
+def _write_input(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records) + "no es json\n")
+
+
+def _read_output(path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_with_bounded_concurrency_and_traces(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(
+        source,
+        [{"id": i, "prompt": f"p{i}"} for i in range(6)]
+        + [{"request_id": "r1", "body": "boom"}],
+    )
+    orchestrator = StubOrchestrator()
+
+    summary = await run_batch(orchestrator, str(source), str(output), concurrency=3)
+
+    assert summary.as_dict()["ok"] == 6
+    assert (summary.errors, summary.invalid) == (1, 1)
+    assert orchestrator.peak == 3
+    records = {r["id"]: r for r in _read_output(output)}
+    assert records["2"]["response"] == "eco: p2"
+    assert records["2"]["steps"][0]["name"] == "final_answer"
+    assert records["2"]["elapsed_ms"] > 0
+    assert records["r1"]["status"] == "error" and "fallo" in records["r1"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_skipping_completed_ids(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(source, [{"id": i, "prompt": f"p{i}"} for i in range(4)])
+    # Ejecución previa interrumpida: dos registros completos y una línea cortada
+    output.write_text(
+        json.dumps({"id": "0", "status": "ok"}) + "\n"
+        + json.dumps({"id": "1", "status": "ok"}) + "\n"
+        + '{"id": "2", "sta'
+    )
+    assert completed_ids(str(output)) == {"0", "1"}
+
+    orchestrator = StubOrchestrator(delay=0)
+    summary = await run_batch(orchestrator, str(source), str(output), concurrency=2)
+
+    assert summary.skipped == 2 and summary.ok == 2
+    assert sorted(orchestrator.prompts) == ["p2", "p3"]
+    assert sorted(r["id"] for r in _read_output_lenient(output)) == ["0", "1", "2", "3"]
+
+
+def _read_output_lenient(path):
+    records = []
+    for line in path.read_text().splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            pass
+    return records
+
+
+@pytest.mark.asyncio
+async def test_batch_reruns_use_fresh_sessions(tmp_path):
+    source = tmp_path / "in.jsonl"
+    _write_input(source, [{"id": "a", "prompt": "p"}, {"id": "b", "prompt": "q"}])
+    orchestrator = StubOrchestrator(delay=0)
+
+    await run_batch(orchestrator, str(source), str(tmp_path / "run1.jsonl"))
+    await run_batch(orchestrator, str(source), str(tmp_path / "run2.jsonl"))
+
+    # Una re-ejecución nocturna no debe reanudar la conversación anterior
+    assert len(set(orchestrator.sessions)) == 4
+    assert all(s.startswith("batch-") for s in orchestrator.sessions)
+
+
+@pytest.mark.asyncio
+async def test_router_fallback_is_an_error_and_is_retried_on_resume(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(source, [{"id": "a", "prompt": "p"}, {"id": "b", "prompt": "router-down"}])
+    orchestrator = StubOrchestrator(delay=0)
+
+    summary = await run_batch(orchestrator, str(source), str(output))
+    assert (summary.ok, summary.errors, summary.failed_ids) == (1, 1, ["b"])
+    record = next(r for r in _read_output(output) if r["id"] == "b")
+    assert record["status"] == "error" and "Router" in record["error"]
+
+    # Al reanudar solo se repite el registro fallido
+    assert completed_ids(str(output)) == {"a"}
+    orchestrator.prompts.clear()
+    await run_batch(orchestrator, str(source), str(output))
+    assert orchestrator.prompts == ["router-down"]
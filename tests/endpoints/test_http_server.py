@@ -0,0 +1,176 @@
+import asyncio
+import json
+import pytest
+from src.core.schemas.models import Action
+from src.endpoints.http.server import ChatServer
+from src.services.orchestrator import Orchestrator
+
+
+class StubStore:
+    async def get_all_metadata(self):
+        return []
+
+    async def get_skill_doc(self, name):
+        return None
+
+
+class StubLLM:
+    """Responde con el session_id tras `delay` segundos, emitiendo tokens."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def ask(self, state, on_event=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        text = f"hola {state.session_id}"
+        if on_event:
+            for word in text.split(" "):
+                await on_event("token", word)
+        return Action(type="respond", name="final_answer", args={"response": text}, reason="r")
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, content = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, content.decode()
+
+
+async def _server(llm, **kwargs):
+    server = ChatServer(Orchestrator(StubStore(), llm, runner=None), port=0, **kwargs)
+    await server.start()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_are_isolated():
+    llm = StubLLM(delay=0.1)
+    server = await _server(llm, max_concurrency=8)
+    try:
+        results = await asyncio.gather(
+            *(_request(server.port, "POST", "/chat", {"message": "hi", "session_id": f"s{i}"}) for i in range(5))
+        )
+    finally:
+        await server.stop()
+
+    for i, (status, content) in enumerate(results):
+        assert status == 200
+        assert json.loads(content) == {"session_id": f"s{i}", "response": f"hola s{i}"}
+    assert llm.peak == 5
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_when_queue_is_full():
+    llm = StubLLM(delay=0.3)
+    server = await _server(llm, max_concurrency=1, max_queue=1)
+    try:
+        results = await asyncio.gather(
+            *(_request(server.port, "POST", "/chat", {"message": "hi"}) for _ in range(4))
+        )
+        status, health = await _request(server.port, "GET", "/health")
+    finally:
+        await server.stop()
+
+    statuses = sorted(s for s, _ in results)
+    assert statuses == [200, 200, 503, 503]
+    assert llm.peak == 1
+    assert json.loads(health)["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_sse_events():
+    server = await _server(StubLLM())
+    try:
+        status, content = await _request(
+            server.port, "POST", "/chat/stream", {"message": "hi", "session_id": "abc"}
+        )
+    finally:
+        await server.stop()
+
+    assert status == 200
+    events = [block.split("\n") for block in content.strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    assert names == ["token", "token", "step", "done"]
+    assert json.loads(events[-1][1].removeprefix("data: "))["response"] == "hola abc"
+
+
+@pytest.mark.asyncio
+async def test_bad_requests():
+    server = await _server(StubLLM())
+    try:
+        missing, _ = await _request(server.port, "POST", "/chat", {"nope": 1})
+        not_found, _ = await _request(server.port, "GET", "/nope")
+    finally:
+        await server.stop()
+    assert (missing, not_found) == (400, 404)
+
+
+@pytest.mark.asyncio
+async def test_session_conflict_is_a_409():
+    from src.core.interfaces.ports import SessionConflictError
+
+    class ConflictLLM:
+        async def ask(self, state, on_event=None):
+            raise SessionConflictError(f"La sesión {state.session_id} cambió en otro proceso")
+
+    server = await _server(ConflictLLM())
+    try:
+        status, content = await _request(server.port, "POST", "/chat", {"message": "hola", "session_id": "abc"})
+    finally:
+        await server.stop()
+    assert status == 409
+    assert "abc" in json.loads(content)["error"]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    from src.infrastructure.observability.metrics import PrometheusMetrics
+    from src.infrastructure.observability.tracing import Tracer
+
+    metrics = PrometheusMetrics()
+    orchestrator = Orchestrator(StubStore(), StubLLM(), runner=None, tracer=Tracer([metrics]))
+    server = ChatServer(orchestrator, port=0, metrics=metrics)
+    await server.start()
+    try:
+        await _request(server.port, "POST", "/chat", {"message": "hola"})
+        status, body = await _request(server.port, "GET", "/metrics")
+    finally:
+        await server.stop()
+    assert status == 200
+    assert 'agent_spans_total{span="chat",status="ok"} 1' in body
+
+
+@pytest.mark.asyncio
+async def test_queued_turns_of_one_session_do_not_hold_slots():
+    llm = StubLLM(delay=0.2)
+    server = await _server(llm, max_concurrency=2)
+    try:
+        same = [
+            asyncio.create_task(_request(server.port, "POST", "/chat", {"message": "hi", "session_id": "a"}))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        start = asyncio.get_running_loop().time()
+        status, _ = await _request(server.port, "POST", "/chat", {"message": "hi", "session_id": "b"})
+        elapsed = asyncio.get_running_loop().time() - start
+        await asyncio.gather(*same)
+    finally:
+        await server.stop()
+
+    # La sesión "b" usa el slot libre sin esperar a los turnos encolados de "a"
+    assert status == 200
+    assert elapsed < 0.35
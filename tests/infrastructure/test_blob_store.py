@@ -0,0 +1,26 @@
+import pytest
+from src.infrastructure.storage.blob_store import FileBlobStore, SQLiteBlobStore, blob_hash
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileBlobStore(str(tmp_path / "blobs"))
+    return SQLiteBlobStore(str(tmp_path / "blobs.sqlite"))
+
+
+def test_put_is_content_addressed_and_idempotent(store):
+    data = "página scrapeada ".encode("utf-8") * 1000
+    digest = store.put(data)
+    assert digest == blob_hash(data)
+    assert store.put(data) == digest
+    assert store.get(digest) == data
+    assert store.get(store.put(b"")) == b""
+    assert store.get("0" * 64) is None
+
+
+def test_file_store_layout(tmp_path):
+    store = FileBlobStore(str(tmp_path))
+    digest = store.put(b"hola")
+    assert (tmp_path / digest[:2] / digest[2:]).read_bytes() == b"hola"
+    assert not [p for p in (tmp_path / digest[:2]).iterdir() if p.name.startswith(".tmp-")]
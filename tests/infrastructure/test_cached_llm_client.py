@@ -0,0 +1,86 @@
+import pytest
+from src.core.interfaces.ports import ILLMClient
+from src.core.schemas.models import Action, AgentState, SkillMetadata
+from src.infrastructure.cache.ttl_cache import MemoryTTLCache, SQLiteTTLCache, TieredCache
+from src.infrastructure.llm.cached_client import CachedLLMClient
+
+
+class CountingLLM(ILLMClient):
+    model = "test-model"
+
+    def __init__(self, action: Action):
+        self.action = action
+        self.calls = 0
+
+    async def ask(self, state, on_event=None):
+        self.calls += 1
+        return self.action
+
+
+def _state(prompt="  Tiempo en   Madrid ", **kwargs):
+    state = AgentState(session_id="s", **kwargs)
+    state.available_skills = [SkillMetadata(name="weather", description="Clima")]
+    state.add_message("user", prompt)
+    return state
+
+
+def _respond(text="Hace sol"):
+    return Action(type="respond", name="final_answer", args={"response": text}, reason="r")
+
+
+@pytest.mark.asyncio
+async def test_repeated_prompt_hits_cache_with_normalized_history():
+    inner = CountingLLM(Action(type="skill", name="weather", args={"city": "Madrid"}, reason="r"))
+    client = CachedLLMClient(inner, TieredCache(MemoryTTLCache()))
+
+    first = await client.ask(_state())
+    second = await client.ask(_state("Tiempo en Madrid"))
+
+    assert inner.calls == 1
+    assert second == first
+    assert client.cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_catalog_change_and_bypass_miss():
+    inner = CountingLLM(_respond())
+    client = CachedLLMClient(inner, TieredCache(MemoryTTLCache()))
+    await client.ask(_state())
+
+    changed = _state()
+    changed.available_skills.append(SkillMetadata(name="news", description="Noticias"))
+    await client.ask(changed)
+    await client.ask(_state(bypass_cache=True))
+    assert inner.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached_and_ttls_differ():
+    error = Action(type="respond", name="error_handler", args={"response": "x"}, reason="r", stop=True)
+    inner = CountingLLM(error)
+    client = CachedLLMClient(inner, TieredCache(MemoryTTLCache()), ttl=100, answer_ttl=5)
+    await client.ask(_state())
+    await client.ask(_state())
+    assert inner.calls == 2
+    assert client.ttl_for(_respond()) == 5
+    assert client.ttl_for(Action(type="skill", name="w", reason="r")) == 100
+
+
+@pytest.mark.asyncio
+async def test_hit_replays_stream_events_and_persists_in_sqlite(tmp_path):
+    db = str(tmp_path / "router.sqlite")
+    inner = CountingLLM(_respond("Hola"))
+    await CachedLLMClient(inner, TieredCache(MemoryTTLCache(), SQLiteTTLCache(db))).ask(_state())
+
+    # Proceso "nuevo": memoria vacía, mismo fichero SQLite
+    client = CachedLLMClient(inner, TieredCache(MemoryTTLCache(), SQLiteTTLCache(db)))
+    events = []
+
+    async def on_event(kind, data):
+        events.append((kind, data))
+
+    action = await client.ask(_state(), on_event=on_event)
+    assert inner.calls == 1
+    assert action.args["response"] == "Hola"
+    assert ("token", "Hola") in events
+    assert events[:2] == [("type", "respond"), ("name", "final_answer")]
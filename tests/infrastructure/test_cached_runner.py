@@ -0,0 +1,104 @@
+import pytest
+import time
+from src.core.interfaces.ports import IRunner
+from src.core.schemas.models import SkillDoc, SkillMetadata, Observation
+from src.infrastructure.cache.ttl_cache import MemoryTTLCache, SQLiteTTLCache, TieredCache
+from src.infrastructure.runners.cached_runner import CachingRunner, result_cache_key
+
+
+class CountingRunner(IRunner):
+    def __init__(self, status="success", extra=None):
+        self.calls = 0
+        self.status = status
+        self.extra = extra or {}
+
+    async def run(self, skill: SkillDoc, args: dict) -> Observation:
+        self.calls += 1
+        content = {"n": self.calls, **self.extra}
+        return Observation(origin=skill.metadata.name, content=content, status=self.status)
+
+
+def _skill(cache_ttl=60, version="1.0.0"):
+    return SkillDoc(
+        metadata=SkillMetadata(name="weather", description="test", version=version),
+        instructions="...",
+        cache_ttl=cache_ttl,
+    )
+
+
+def test_cache_key_canonicalizes_args():
+    assert result_cache_key(_skill(), {"city": " Madrid ", "units": "c"}) == result_cache_key(
+        _skill(), {"units": "c", "city": "Madrid"}
+    )
+    assert result_cache_key(_skill(), {"city": "Madrid"}) != result_cache_key(
+        _skill(version="2.0.0"), {"city": "Madrid"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_caches_idempotent_skill_results():
+    inner = CountingRunner()
+    runner = CachingRunner(inner, TieredCache(MemoryTTLCache()))
+
+    miss = await runner.run(_skill(), {"city": "Madrid"})
+    hit = await runner.run(_skill(), {"city": "Madrid"})
+
+    assert inner.calls == 1
+    assert miss.metadata["cache"] == "miss"
+    assert hit.metadata == {"cache": "hit", "cache_tier": "memory"}
+    assert hit.content == miss.content
+    assert runner.cache.hit_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_skips_errors_and_skills_without_ttl():
+    inner = CountingRunner(status="error")
+    runner = CachingRunner(inner, TieredCache(MemoryTTLCache()))
+    await runner.run(_skill(), {})
+    await runner.run(_skill(), {})
+    assert inner.calls == 2
+
+    # Fallo transitorio con exit 0: la skill lo señala con el campo `error`
+    inner = CountingRunner(extra={"summary": "Error al obtener el clima", "error": "timeout"})
+    runner = CachingRunner(inner, TieredCache(MemoryTTLCache()))
+    await runner.run(_skill(), {"city": "Madrid"})
+    await runner.run(_skill(), {"city": "Madrid"})
+    assert inner.calls == 2
+
+    inner = CountingRunner()
+    runner = CachingRunner(inner, TieredCache(MemoryTTLCache()))
+    observation = await runner.run(_skill(cache_ttl=None), {})
+    await runner.run(_skill(cache_ttl=None), {})
+    assert inner.calls == 2
+    assert "cache" not in observation.metadata
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite")
+    inner = CountingRunner()
+    await CachingRunner(inner, TieredCache(MemoryTTLCache(), SQLiteTTLCache(db_path))).run(_skill(), {})
+
+    runner = CachingRunner(inner, TieredCache(MemoryTTLCache(), SQLiteTTLCache(db_path)))
+    hit = await runner.run(_skill(), {})
+    assert inner.calls == 1
+    assert hit.metadata["cache_tier"] == "sqlite"
+
+
+def test_memory_ttl_expires():
+    cache = MemoryTTLCache(max_entries=2)
+    cache.set("a", 1, ttl=0.01)
+    cache.set("b", 2, ttl=60)
+    cache.set("c", 3, ttl=60)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_creates_parent_directory(tmp_path):
+    db_path = str(tmp_path / ".cache" / "skills.sqlite")
+    cache = TieredCache(MemoryTTLCache(), SQLiteTTLCache(db_path))
+    await cache.set("k", {"v": 1}, ttl=60)
+    assert await TieredCache(MemoryTTLCache(), SQLiteTTLCache(db_path)).get("k") == ({"v": 1}, "sqlite")
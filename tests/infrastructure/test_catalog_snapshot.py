@@ -0,0 +1,86 @@
+import pytest
+import os
+from src.infrastructure.storage.catalog_snapshot import load_store, read_snapshot, write_snapshot
+from src.infrastructure.storage.fs_skill_store import FSSkillStore
+
+
+@pytest.fixture
+def temp_skills_dir(tmp_path):
+    skills_dir = tmp_path / "skills"
+    for name in ("weather", "instant-info"):
+        skill_dir = skills_dir / name
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(f"""---
+name: {name}
+description: Descripción de {name}.
+metadata:
+  entry_script: scripts/{name}.py
+---
+Instrucciones de {name}.
+""")
+    return str(skills_dir)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_seeds_index_without_reparsing(temp_skills_dir, tmp_path):
+    snapshot_path = str(tmp_path / "skills.catalog")
+    assert write_snapshot(FSSkillStore(temp_skills_dir), snapshot_path) == 2
+
+    store = load_store(temp_skills_dir, snapshot_path)
+    metadata = await store.get_all_metadata()
+    assert sorted(m.name for m in metadata) == ["instant-info", "weather"]
+    assert store.stats.reparses == 0
+    assert store.stats.hits == 2
+
+    doc = await store.get_skill_doc("weather")
+    assert doc.instructions == "Instrucciones de weather."
+    assert doc.entry_script == "scripts/weather.py"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_revalidates_by_hash_and_reparses_stale(temp_skills_dir, tmp_path):
+    snapshot_path = str(tmp_path / "skills.catalog")
+    write_snapshot(FSSkillStore(temp_skills_dir), snapshot_path)
+
+    # Mismo contenido con otro mtime -> revalidado por hash
+    weather_file = os.path.join(temp_skills_dir, "weather", "SKILL.md")
+    os.utime(weather_file, ns=(0, 0))
+    # Contenido nuevo -> re-parseo
+    info_file = os.path.join(temp_skills_dir, "instant-info", "SKILL.md")
+    with open(info_file, "w", encoding="utf-8") as f:
+        f.write("---\nname: instant-info\ndescription: Nueva.\n---\nOtro cuerpo.\n")
+
+    store = load_store(temp_skills_dir, snapshot_path)
+    metadata = {m.name: m for m in await store.get_all_metadata()}
+    assert metadata["instant-info"].description == "Nueva."
+    assert store.stats.revalidations == 1
+    assert store.stats.reparses == 1
+
+
+def test_missing_or_corrupt_snapshot_falls_back(temp_skills_dir, tmp_path):
+    corrupt = tmp_path / "corrupt.catalog"
+    corrupt.write_bytes(b"not a snapshot")
+
+    for path in (str(tmp_path / "missing.catalog"), str(corrupt)):
+        store = load_store(temp_skills_dir, path)
+        store.refresh()
+        assert store.stats.reparses == 2
+
+
+def test_snapshot_from_another_skills_dir_is_rejected(temp_skills_dir, tmp_path):
+    snapshot_path = str(tmp_path / "skills.catalog")
+    write_snapshot(FSSkillStore(temp_skills_dir), snapshot_path)
+
+    assert read_snapshot(snapshot_path, temp_skills_dir)
+    assert read_snapshot(snapshot_path, str(tmp_path / "other")) == {}
+
+
+def test_parsed_entries_revalidate_by_hash(temp_skills_dir):
+    store = FSSkillStore(temp_skills_dir)
+    store.refresh()
+    assert all(entry.sha1 for entry in store.entries().values())
+
+    os.utime(os.path.join(temp_skills_dir, "weather", "SKILL.md"), ns=(0, 0))
+    assert not store.refresh()
+    assert store.stats.revalidations == 1
+    assert store.stats.reparses == 2
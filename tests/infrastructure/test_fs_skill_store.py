@@ -63,3 +63,74 @@ async def test_get_non_existent_skill(temp_skills_dir):
     store = FSSkillStore(temp_skills_dir)
     doc = await store.get_skill_doc("ghost-skill")
     assert doc is None
+
+@pytest.mark.asyncio
+async def test_catalog_index_reuses_unchanged_entries(temp_skills_dir):
+    store = FSSkillStore(temp_skills_dir)
+    await store.get_all_metadata()
+    assert store.stats.reparses == 2
+    assert store.stats.hits == 0
+
+    metadata_list = await store.get_all_metadata()
+    assert len(metadata_list) == 2
+    assert store.stats.reparses == 2
+    assert store.stats.hits == 2
+    assert store.stats.scans == 2
+
+@pytest.mark.asyncio
+async def test_catalog_index_reparses_changed_and_drops_removed(temp_skills_dir):
+    store = FSSkillStore(temp_skills_dir)
+    await store.get_all_metadata()
+
+    skill_file = os.path.join(temp_skills_dir, "data-analysis", "SKILL.md")
+    with open(skill_file, "w", encoding="utf-8") as f:
+        f.write("---\nname: data-analysis\ndescription: Analiza datos tabulares.\n---\nNuevo cuerpo.\n")
+    shutil.rmtree(os.path.join(temp_skills_dir, "web-research"))
+
+    metadata_list = await store.get_all_metadata()
+    assert [m.description for m in metadata_list] == ["Analiza datos tabulares."]
+    assert store.stats.reparses == 3
+    assert store.stats.evictions == 1
+
+@pytest.mark.asyncio
+async def test_body_with_horizontal_rule(tmp_path):
+    skill_dir = tmp_path / "skills" / "rules"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("""---
+name: rules
+description: Skill con separadores en el cuerpo.
+---
+Parte uno.
+
+---
+
+Parte dos.
+""")
+    store = FSSkillStore(str(tmp_path / "skills"))
+
+    metadata_list = await store.get_all_metadata()
+    doc = await store.get_skill_doc("rules")
+
+    assert metadata_list[0].description == "Skill con separadores en el cuerpo."
+    assert "Parte uno." in doc.instructions
+    assert "Parte dos." in doc.instructions
+
+@pytest.mark.asyncio
+async def test_skill_doc_lru_cache(temp_skills_dir):
+    store = FSSkillStore(temp_skills_dir, doc_cache_size=1)
+
+    first = await store.get_skill_doc("web-research")
+    assert await store.get_skill_doc("web-research") is first
+    assert store.stats.doc_hits == 1
+
+    # Acotado: cargar otra skill expulsa la anterior
+    await store.get_skill_doc("data-analysis")
+    await store.get_skill_doc("web-research")
+    assert store.stats.doc_misses == 3
+
+    # Un cambio en el fichero invalida la entrada cacheada
+    skill_file = os.path.join(temp_skills_dir, "web-research", "SKILL.md")
+    with open(skill_file, "a", encoding="utf-8") as f:
+        f.write("Paso extra.\n")
+    doc = await store.get_skill_doc("web-research")
+    assert "Paso extra." in doc.instructions
@@ -0,0 +1,46 @@
+import json
+import pytest
+from src.infrastructure.llm.json_stream import IncrementalActionParser
+
+ACTION = {
+    "type": "respond",
+    "name": "final_answer",
+    "args": {"response": 'Hola "mundo"\nárbol 😀 \\ fin', "lang": "es"},
+    "reason": "listo",
+    "stop": True,
+}
+
+
+def _run(text: str, size: int):
+    parser = IncrementalActionParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i : i + size]))
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_events_independent_of_chunking(size):
+    text = json.dumps(ACTION)
+    parser, events = _run(text, size)
+
+    fields = [(k, v) for k, v in events if k != "token"]
+    assert fields == [("type", "respond"), ("name", "final_answer"), ("args", ACTION["args"])]
+    tokens = "".join(v for k, v in events if k == "token")
+    assert tokens == ACTION["args"]["response"]
+    assert parser.result() == ACTION
+
+
+def test_name_emitted_before_args_complete():
+    text = json.dumps({"type": "skill", "name": "weather", "args": {"city": "Madrid"}})
+    parser = IncrementalActionParser()
+    head = text[: text.index('"args"')]
+    events = parser.feed(head)
+    assert ("name", "weather") in events
+    assert all(kind != "args" for kind, _ in events)
+
+
+def test_nested_response_keys_are_not_streamed():
+    text = json.dumps({"type": "skill", "name": "x", "args": {"opts": {"response": "no"}}})
+    _, events = _run(text, 5)
+    assert not [v for k, v in events if k == "token"]
@@ -0,0 +1,114 @@
+import pytest
+import time
+from src.infrastructure.storage.fs_skill_store import FSSkillStore
+from src.infrastructure.storage.live_skill_registry import LiveSkillRegistry
+from src.infrastructure.storage.skill_watcher import (
+    InotifySkillWatcher,
+    PollingSkillWatcher,
+)
+
+
+def _write_skill(skills_dir, name, description):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(exist_ok=True)
+    (skill_dir / "SKILL.md").write_text(f"""---
+name: {name}
+description: {description}
+---
+Instrucciones de {name}.
+""")
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _polling_factory(skills_dir, on_change, debounce, poll_interval):
+    return PollingSkillWatcher(skills_dir, on_change, interval=0.05)
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    skills_dir = tmp_path / "skills"
+    skills_dir.mkdir()
+    _write_skill(skills_dir, "weather", "Clima actual.")
+    return skills_dir
+
+
+@pytest.mark.asyncio
+async def test_registry_serves_from_memory(skills_dir):
+    registry = LiveSkillRegistry(FSSkillStore(str(skills_dir)), watcher_factory=_polling_factory)
+    registry.start()
+    try:
+        store = registry.store
+        scans = store.stats.scans
+
+        metadata = await registry.get_all_metadata()
+        doc = await registry.get_skill_doc("weather")
+
+        assert [m.name for m in metadata] == ["weather"]
+        assert doc is not None and "Instrucciones de weather." in doc.instructions
+        assert await registry.get_skill_doc("ghost") is None
+        assert store.stats.scans == scans
+        assert registry.generation == 1
+    finally:
+        registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_registry_polling_picks_up_new_skill(skills_dir):
+    registry = LiveSkillRegistry(FSSkillStore(str(skills_dir)), watcher_factory=_polling_factory)
+    registry.start()
+    try:
+        _write_skill(skills_dir, "instant-info", "Información instantánea.")
+        assert _wait_for(lambda: registry.generation == 2)
+
+        names = sorted(m.name for m in await registry.get_all_metadata())
+        assert names == ["instant-info", "weather"]
+    finally:
+        registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_registry_inotify_coalesces_burst(skills_dir):
+    try:
+        registry = LiveSkillRegistry(
+            FSSkillStore(str(skills_dir)),
+            debounce=0.2,
+            watcher_factory=lambda d, cb, debounce, poll_interval: InotifySkillWatcher(
+                d, cb, debounce=debounce
+            ),
+        )
+        registry.start()
+    except OSError:
+        pytest.skip("inotify no disponible en esta plataforma")
+
+    try:
+        for i in range(5):
+            _write_skill(skills_dir, "weather", "Clima actual." + "!" * i)
+        _write_skill(skills_dir, "instant-info", "Información instantánea.")
+
+        assert _wait_for(lambda: registry.generation >= 2)
+        time.sleep(0.4)
+        assert registry.generation == 2
+
+        doc = await registry.get_skill_doc("weather")
+        assert doc.metadata.description == "Clima actual.!!!!"
+        assert len(await registry.get_all_metadata()) == 2
+    finally:
+        registry.stop()
+
+
+def test_inotify_watcher_stop_is_idempotent(skills_dir):
+    try:
+        watcher = InotifySkillWatcher(str(skills_dir), lambda: None)
+    except OSError:
+        pytest.skip("inotify no disponible en esta plataforma")
+    watcher.start()
+    watcher.stop()
+    watcher.stop()
@@ -0,0 +1,74 @@
+import pytest
+import sys
+import asyncio
+from src.infrastructure.mcp.pool import MCPPool
+
+BRIDGE = "scripts/context7_mcp_bridge.py"
+
+
+@pytest.mark.asyncio
+async def test_pool_prewarms_and_balances():
+    pool = MCPPool(command=sys.executable, args=[BRIDGE], size=3)
+    try:
+        await pool.start()
+        assert all(slot.client.is_alive for slot in pool.slots)
+
+        observations = await asyncio.gather(
+            *(pool.call_tool("resolve-library-id", {"libraryName": "react"}) for _ in range(9))
+        )
+        assert all(o.content["libraryId"] == "/facebook/react" for o in observations)
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_dead_process():
+    pool = MCPPool(command=sys.executable, args=[BRIDGE], size=1)
+    try:
+        await pool.start()
+        pool.slots[0].client.process.kill()
+        await pool.slots[0].client.process.wait()
+
+        observation = await pool.call_tool("resolve-library-id", {"libraryName": "pydantic"})
+        assert observation.status == "success"
+        assert pool.restarts == 1
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_backoff_when_server_cannot_start(tmp_path):
+    pool = MCPPool(command=str(tmp_path / "missing-binary"), size=1, base_backoff=0.05)
+    try:
+        observation = await pool.call_tool("any", {})
+        assert observation.status == "error"
+        assert pool.slots[0].failures == 1
+        assert pool.slots[0].retry_at > 0
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_caches_tools_without_starting_processes():
+    pool = MCPPool(command=sys.executable, args=[BRIDGE], size=2)
+    try:
+        # Sin prewarm ni llamadas, descubrir tools no arranca procesos
+        assert await pool.list_tools() == []
+        assert not any(slot.client.process for slot in pool.slots)
+
+        # La primera llamada a una tool arranca el pool; desde ahí hay catálogo
+        await pool.call_tool("resolve-library-id", {"libraryName": "react"})
+        await asyncio.gather(*(slot.restarting for slot in pool.slots if slot.restarting))
+        tools = await pool.list_tools()
+        assert "resolve-library-id" in [t.name for t in tools]
+
+        # Con los procesos caídos, construir el prompt no los reinicia
+        for slot in pool.slots:
+            slot.client.process.kill()
+            await slot.client.process.wait()
+        await asyncio.sleep(0)
+        assert await pool.list_tools() is tools
+        assert not any(slot.client.is_alive for slot in pool.slots)
+        assert all(slot.restarting is None for slot in pool.slots)
+    finally:
+        await pool.stop()
@@ -0,0 +1,172 @@
+import pytest
+import sys
+import asyncio
+from src.infrastructure.mcp.stdio_client import MCPStdioClient
+
+BRIDGE = "scripts/context7_mcp_bridge.py"
+
+
+def _fake_server(tmp_path, source):
+    script = tmp_path / "server.py"
+    script.write_text(source)
+    return MCPStdioClient(command=sys.executable, args=[str(script)], timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_against_bridge():
+    client = MCPStdioClient(command=sys.executable, args=[BRIDGE])
+    try:
+        libraries = [f"lib{i}" for i in range(20)]
+        observations = await asyncio.gather(
+            *(client.call_tool("resolve-library-id", {"libraryName": lib}) for lib in libraries)
+        )
+        assert [o.content["libraryId"] for o in observations] == [f"/mock/{lib}" for lib in libraries]
+        assert client.in_flight == 0
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_responses_are_dispatched_by_id(tmp_path):
+    # Lee dos llamadas y responde en orden inverso (sin soporte de initialize)
+    client = _fake_server(tmp_path, """
+import sys, json
+calls = []
+for line in sys.stdin:
+    req = json.loads(line)
+    if req["method"] == "initialize":
+        print(json.dumps({"jsonrpc": "2.0", "id": req["id"], "error": {"message": "no"}}), flush=True)
+        continue
+    calls.append(req)
+    if len(calls) == 2:
+        for call in reversed(calls):
+            name = call["params"]["name"]
+            print(json.dumps({"jsonrpc": "2.0", "id": call["id"], "result": {"content": name}}), flush=True)
+""")
+    try:
+        a, b = await asyncio.gather(client.call_tool("a", {}), client.call_tool("b", {}))
+        assert (a.content, b.content) == ("a", "b")
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_timeout_cleans_up_pending(tmp_path):
+    client = _fake_server(tmp_path, "import sys\nfor _ in sys.stdin: pass\n")
+    client.timeout = 0.2
+    try:
+        observation = await client.call_tool("slow", {})
+        assert observation.status == "error"
+        assert "Timeout" in observation.content
+        assert client.in_flight == 0
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_server_death_fails_in_flight_calls(tmp_path):
+    client = _fake_server(tmp_path, "import sys\nsys.stdin.readline()\nsys.exit(1)\n")
+    try:
+        observation = await client.call_tool("any", {})
+        assert observation.status == "error"
+        assert "cerró la conexión" in observation.content
+        assert client.in_flight == 0
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_handshake_discovers_and_caches_tools():
+    client = MCPStdioClient(command=sys.executable, args=[BRIDGE])
+    try:
+        tools = await client.list_tools()
+        assert {t.name for t in tools} == {"resolve-library-id", "query-docs"}
+        assert "libraryName" in next(t for t in tools if t.name == "resolve-library-id").input_schema["properties"]
+        assert await client.list_tools() is tools
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_tools_list_changed_notification_refreshes_cache(tmp_path):
+    # Cada `tools/list` devuelve una tool nueva; `bump` emite list_changed
+    client = _fake_server(tmp_path, """
+import sys, json
+version = 0
+def reply(req, result):
+    print(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": result}), flush=True)
+for line in sys.stdin:
+    req = json.loads(line)
+    method = req["method"]
+    if method == "initialize":
+        reply(req, {"protocolVersion": "2024-11-05", "capabilities": {"tools": {"listChanged": True}}})
+    elif method == "tools/list":
+        version += 1
+        reply(req, {"tools": [{"name": f"tool-v{version}"}]})
+    elif method == "tools/call":
+        print(json.dumps({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}), flush=True)
+        reply(req, {"content": "ok"})
+""")
+    try:
+        assert [t.name for t in await client.list_tools()] == ["tool-v1"]
+        assert [t.name for t in await client.list_tools()] == ["tool-v1"]
+        await client.call_tool("bump", {})
+        assert [t.name for t in await client.list_tools()] == ["tool-v2"]
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_isolates_stale_reader(tmp_path):
+    client = _fake_server(tmp_path, """
+import sys, json, time
+for line in sys.stdin:
+    req = json.loads(line)
+    if req["method"] == "initialize":
+        print(json.dumps({"jsonrpc": "2.0", "id": req["id"], "error": {"message": "no"}}), flush=True)
+        continue
+    time.sleep(0.3)
+    print(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": {"content": "ok"}}), flush=True)
+""")
+    try:
+        await client.connect()
+        old_process, old_tasks = client.process, list(client._tasks)
+        # El lector viejo aún no ha visto el EOF cuando llega la reconexión
+        client._connected = False
+        call = asyncio.create_task(client.call_tool("a", {}))
+        await asyncio.sleep(0.1)
+        if old_process.returncode is None:
+            old_process.kill()
+        await old_process.wait()
+
+        observation = await call
+        assert observation.status == "success" and observation.content == "ok"
+        assert all(task.done() for task in old_tasks)
+        assert client.in_flight == 0
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_tools_list_backs_off(tmp_path):
+    # Responde a initialize pero nunca a tools/list
+    client = _fake_server(tmp_path, """
+import sys, json
+for line in sys.stdin:
+    req = json.loads(line)
+    if req["method"] == "initialize":
+        print(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": {}}), flush=True)
+""")
+    client.timeout = 0.2
+    client.tools_retry = 60
+    try:
+        assert await client.list_tools() == []
+        assert not client.tools_stale
+
+        # En backoff no se envía otro tools/list ni se espera el timeout
+        start = asyncio.get_running_loop().time()
+        assert await client.list_tools() == []
+        assert asyncio.get_running_loop().time() - start < 0.1
+        assert client.in_flight == 0
+    finally:
+        await client.stop()
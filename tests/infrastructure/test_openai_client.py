@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 from src.infrastructure.llm.openai_client import OpenAIClient
-from src.core.schemas.models import AgentState, Action
+from src.core.schemas.models import AgentState, Action, SkillMetadata, ToolSchema
 
 @pytest.mark.asyncio
 async def test_ask_returns_valid_action():
@@ -11,7 +11,7 @@ async def test_ask_returns_valid_action():
         AsyncMock(message=AsyncMock(content='{"type": "skill", "name": "web-research", "args": {"q": "test"}, "reason": "test reasoning"}'))
     ]
     
-    with patch("src.infrastructure.llm.openai_client.AsyncOpenAI") as mock_openai:
+    with patch("openai.AsyncOpenAI") as mock_openai:
         mock_openai.return_value.chat.completions.create = AsyncMock(return_value=mock_response)
         
         client = OpenAIClient()
@@ -25,7 +25,7 @@ async def test_ask_returns_valid_action():
 
 @pytest.mark.asyncio
 async def test_ask_error_fallback():
-    with patch("src.infrastructure.llm.openai_client.AsyncOpenAI") as mock_openai:
+    with patch("openai.AsyncOpenAI") as mock_openai:
         mock_openai.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
         
         client = OpenAIClient()
@@ -35,3 +35,124 @@ async def test_ask_error_fallback():
         assert action.type == "respond"
         assert "Error en el Router LLM" in action.args["response"]
         assert action.stop is True
+
+@pytest.mark.asyncio
+async def test_ask_renders_discovered_mcp_tools():
+    mock_response = AsyncMock()
+    mock_response.choices = [
+        AsyncMock(message=AsyncMock(content='{"type": "respond", "name": "final_answer", "args": {"response": "ok"}, "reason": "r"}'))
+    ]
+
+    with patch("openai.AsyncOpenAI") as mock_openai:
+        create = AsyncMock(return_value=mock_response)
+        mock_openai.return_value.chat.completions.create = create
+
+        client = OpenAIClient()
+        state = AgentState(
+            session_id="test",
+            available_tools=[
+                ToolSchema(
+                    name="query-docs",
+                    description="Docs.",
+                    input_schema={"properties": {"libraryId": {"type": "string"}}},
+                )
+            ],
+        )
+        await client.ask(state)
+
+        system_prompt = create.call_args.kwargs["messages"][0]["content"]
+        assert "- **query-docs**: Docs." in system_prompt
+        assert "`libraryId: string`" in system_prompt
+
+@pytest.mark.asyncio
+async def test_prompt_prefix_is_cached_and_reused_across_steps():
+    mock_response = AsyncMock()
+    mock_response.choices = [
+        AsyncMock(message=AsyncMock(content='{"type": "respond", "name": "final_answer", "args": {"response": "ok"}, "reason": "r"}'))
+    ]
+
+    with patch("openai.AsyncOpenAI") as mock_openai:
+        create = AsyncMock(return_value=mock_response)
+        mock_openai.return_value.chat.completions.create = create
+
+        client = OpenAIClient()
+        state = AgentState(session_id="test")
+        state.add_message("user", "hola")
+
+        await client.ask(state)
+        first_step = client.prompt_tracker.stats.last_step
+        reloads = client._files.reloads
+        first_prompt = create.call_args.kwargs["messages"][0]["content"]
+
+        state.add_message("assistant", "Decision: skill:weather")
+        await client.ask(state)
+        second_step = client.prompt_tracker.stats.last_step
+
+        # Sin re-lectura de ficheros y system prompt byte-idéntico
+        assert client._files.reloads == reloads
+        assert create.call_args.kwargs["messages"][0]["content"] == first_prompt
+        # Todo lo enviado en el primer paso es prefijo reutilizable del segundo
+        assert second_step["bytes_reused"] == first_step["bytes_total"]
+        assert second_step["bytes_resent"] == len("assistant" + "Decision: skill:weather")
+
+
+class _Chunk:
+    def __init__(self, content):
+        delta = type("Delta", (), {"content": content})()
+        self.choices = [type("Choice", (), {"delta": delta})()]
+
+
+async def _stream(text, size=4):
+    for i in range(0, len(text), size):
+        yield _Chunk(text[i : i + size])
+
+
+@pytest.mark.asyncio
+async def test_ask_streaming_emits_events():
+    text = '{"type": "respond", "name": "final_answer", "args": {"response": "Hola mundo"}, "reason": "r"}'
+
+    with patch("openai.AsyncOpenAI") as mock_openai:
+        create = AsyncMock(return_value=_stream(text))
+        mock_openai.return_value.chat.completions.create = create
+
+        client = OpenAIClient()
+        client.stream = True
+        events = []
+
+        async def on_event(kind, data):
+            events.append((kind, data))
+
+        action = await client.ask(AgentState(session_id="test"), on_event=on_event)
+
+        assert create.call_args.kwargs["stream"] is True
+        assert action.args["response"] == "Hola mundo"
+        assert events[:2] == [("type", "respond"), ("name", "final_answer")]
+        assert "".join(d for k, d in events if k == "token") == "Hola mundo"
+
+
+def test_prompt_fingerprint_tracks_catalog():
+    with patch("openai.AsyncOpenAI"):
+        client = OpenAIClient()
+        state = AgentState(session_id="test")
+        before = client.prompt_fingerprint(state)
+        assert client.prompt_fingerprint(state) == before
+        state.available_skills = [SkillMetadata(name="weather", description="Clima")]
+        assert client.prompt_fingerprint(state) != before
+
+
+def test_prompt_parts_reuse_same_catalog_without_rebuilding():
+    with patch("openai.AsyncOpenAI"):
+        client = OpenAIClient()
+        skills = [SkillMetadata(name=f"s{i}", description="d") for i in range(3)]
+        state = AgentState(session_id="test", available_skills=skills)
+        first = client._system_prompt_parts(state)
+
+        with patch.object(client, "_build_skills_section") as build:
+            assert client._system_prompt_parts(state) == first
+            # Lista nueva con el mismo contenido: LRU por contenido, sin reconstruir
+            state.available_skills = list(skills)
+            assert client._system_prompt_parts(state) == first
+            build.assert_not_called()
+
+        state.available_skills = skills[:2]
+        assert client._system_prompt_parts(state)[1] != first[1]
@@ -0,0 +1,47 @@
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+import pytest
+from src.core.schemas.models import AgentState
+from src.infrastructure.llm.openai_client import OpenAIClient
+from src.settings import settings
+
+
+@asynccontextmanager
+async def stub_server():
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "scripts/openai_stub_server.py", "--port", "0", "--latency", "fixed:1",
+        stdout=asyncio.subprocess.PIPE,
+    )
+    line = (await asyncio.wait_for(process.stdout.readline(), 10)).decode()
+    try:
+        yield f"http://127.0.0.1:{line.split()[1]}/v1"
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_openai_client_replays_scripted_flow(monkeypatch, stream):
+    events = []
+
+    async def on_event(kind, data):
+        events.append(kind)
+
+    async with stub_server() as url:
+        monkeypatch.setattr(settings, "LLM_BASE_URL", url)
+        monkeypatch.setattr(settings, "LLM_STREAM", stream)
+        client = OpenAIClient()
+
+        state = AgentState(session_id="t")
+        state.add_message("user", "¿Qué tiempo hace en Madrid?")
+        first = await client.ask(state)
+        assert (first.type, first.name, first.args) == ("skill", "weather", {"city": "Madrid"})
+
+        state.add_message("assistant", "Decision: skill:weather")
+        second = await client.ask(state, on_event=on_event)
+
+    assert second.type == "respond"
+    assert "sol" in second.args["response"]
+    assert ("token" in events) is stream
@@ -0,0 +1,146 @@
+import asyncio
+import sqlite3
+import pytest
+from src.core.schemas.models import AgentState, BlobRef, Observation
+from src.infrastructure.storage.session_store import SessionConflictError, SQLiteSessionStore
+
+
+def _turn(state, i):
+    state.add_message("user", f"pregunta {i}")
+    state.add_message("assistant", f"Decision: skill:s{i}")
+    state.add_observation(Observation(origin=f"s{i}", content={"i": i}))
+
+
+def _rows(path, table):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.mark.asyncio
+async def test_appends_incrementally_and_resumes(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    store = SQLiteSessionStore(path, snapshot_every=1000)
+    state = AgentState(session_id="s1")
+    _turn(state, 0)
+    await store.save(state)
+    assert (state.cursor.messages, state.cursor.observations) == (3, 1)
+
+    state.observations.append(
+        Observation(origin="big", content=BlobRef(hash="ab" * 32, size=10**6, preview="..."))
+    )
+    _turn(state, 1)
+    await store.save(state)
+    await store.save(state)  # sin cambios: no inserta nada
+    assert _rows(path, "messages") == 6
+    assert _rows(path, "observations") == 3
+
+    resumed = await store.load("s1")
+    assert resumed.history == state.history
+    assert resumed.steps == state.steps == 2
+    assert isinstance(resumed.observations[1].content, BlobRef)
+    assert resumed.observations[2].content == {"i": 1}
+    assert resumed.cursor.messages == 6
+    assert await store.load("nope") is None
+
+
+@pytest.mark.asyncio
+async def test_resume_reads_snapshot_plus_tail(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    store = SQLiteSessionStore(path, snapshot_every=6)
+    state = AgentState(session_id="s1")
+    for i in range(3):
+        _turn(state, i)
+        await store.save(state)
+    # Snapshot tras el 2º turno (6 mensajes); el 3º solo está en el log
+    state.history[0]["content"] = "compactado"  # el snapshot guarda el estado compactado
+    _turn(state, 3)
+    await store.save(state)
+
+    # Los mensajes anteriores al snapshot no hacen falta para reanudar
+    with sqlite3.connect(path) as conn:
+        snap = conn.execute("SELECT snapshot_messages FROM sessions").fetchone()[0]
+        conn.execute("DELETE FROM messages WHERE seq < ?", (snap,))
+        conn.execute("DELETE FROM observations WHERE seq < 2")
+
+    resumed = await store.load("s1")
+    assert snap == 12
+    assert resumed.history == state.history
+    assert [o.content for o in resumed.observations] == [{"i": i} for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_many_concurrent_sessions(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite"), snapshot_every=4)
+    states = [AgentState(session_id=f"s{i}") for i in range(300)]
+
+    async def converse(state):
+        for turn in range(3):
+            _turn(state, turn)
+            await store.save(state)
+
+    await asyncio.gather(*(converse(s) for s in states))
+    resumed = await asyncio.gather(*(store.load(s.session_id) for s in states))
+    assert all(r.history == s.history for r, s in zip(resumed, states))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writer_does_not_overwrite(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    state = AgentState(session_id="s1")
+    _turn(state, 0)
+    await first.save(state)
+
+    # Dos procesos reanudan la misma sesión y escriben en las mismas posiciones
+    a, b = await first.load("s1"), await second.load("s1")
+    a.add_message("user", "desde a")
+    b.add_message("user", "desde b")
+    await first.save(a)
+    with pytest.raises(SessionConflictError):
+        await second.save(b)
+
+    resumed = await first.load("s1")
+    assert resumed.history[-1]["content"] == "desde a"
+    assert b.cursor.messages == 3
+
+
+@pytest.mark.asyncio
+async def test_persists_spill_cursor_and_rewritten_messages(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    store = SQLiteSessionStore(path, snapshot_every=6)
+    state = AgentState(session_id="s1")
+    for i in range(3):
+        _turn(state, i)
+    await store.save(state)  # snapshot con los 9 mensajes
+    _turn(state, 3)
+    state.cursor.spilled = 4
+    await store.save(state)  # los 3 últimos, solo en el log
+
+    # Compactación de un mensaje del log y de otro dentro del snapshot
+    state.replace_message(10, "compactado en el log")
+    assert state.cursor.edited == {10}
+    await store.save(state)
+    assert state.cursor.edited == set()
+    resumed = await store.load("s1")
+    assert resumed.history == state.history
+    assert resumed.cursor.spilled == 4
+
+    state.replace_message(1, "compactado en el snapshot")
+    await store.save(state)
+    resumed = await store.load("s1")
+    assert resumed.history == state.history
+    assert resumed.cursor.snapshot == 12
+
+
+def test_migrates_sessions_table_without_spill_cursor(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE sessions (session_id TEXT PRIMARY KEY, steps INTEGER NOT NULL DEFAULT 0, "
+            "updated_at REAL NOT NULL, snapshot TEXT, snapshot_messages INTEGER NOT NULL DEFAULT 0, "
+            "snapshot_observations INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute("INSERT INTO sessions (session_id, steps, updated_at) VALUES ('s1', 2, 0)")
+
+    resumed = SQLiteSessionStore(path).load_sync("s1")
+    assert (resumed.steps, resumed.cursor.spilled) == (2, 0)
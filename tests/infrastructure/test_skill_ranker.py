@@ -0,0 +1,48 @@
+import pytest
+from src.core.schemas.models import SkillMetadata
+from src.infrastructure.storage.skill_ranker import BM25SkillRanker, tokenize
+
+CATALOG = [
+    SkillMetadata(name="weather", description="Obtiene el clima actual de cualquier ciudad del mundo."),
+    SkillMetadata(name="instant-info", description="Información y resúmenes de internet sobre conceptos."),
+    SkillMetadata(name="pdf-reader", description="Extrae texto y tablas de documentos PDF."),
+    SkillMetadata(name="calendar", description="Crea y consulta eventos del calendario."),
+]
+
+
+def test_tokenize_folds_accents_and_stopwords():
+    assert tokenize("¿Qué tiempo hace en Málaga?") == ["tiempo", "hace", "malaga"]
+
+
+@pytest.mark.asyncio
+async def test_select_ranks_relevant_skills():
+    ranker = BM25SkillRanker(top_k=1)
+    selected = await ranker.select("¿Cómo está el clima en la ciudad de Madrid?", CATALOG)
+    assert [s.name for s in selected] == ["weather"]
+
+
+@pytest.mark.asyncio
+async def test_select_always_include_and_small_catalog():
+    ranker = BM25SkillRanker(top_k=1, always_include=["instant-info"])
+    selected = await ranker.select("extrae las tablas de este pdf", CATALOG)
+    assert [s.name for s in selected] == ["instant-info", "pdf-reader"]
+
+    # Sin coincidencias se completa hasta k con el orden del catálogo
+    selected = await ranker.select("hola", CATALOG)
+    assert [s.name for s in selected] == ["instant-info", "weather"]
+
+    # Una skill fija que no existe no amplía el límite
+    ranker = BM25SkillRanker(top_k=2, always_include=["no-existe"])
+    selected = await ranker.select("¿Qué tiempo hace en Málaga?", CATALOG)
+    assert [s.name for s in selected] == ["weather", "instant-info"]
+
+    # Catálogo menor o igual que k: se inyecta completo
+    assert await BM25SkillRanker(top_k=10).select("hola", CATALOG) == CATALOG
+
+
+def test_predict_returns_top_names_without_evicting_select_index():
+    ranker = BM25SkillRanker(top_k=2)
+    assert ranker.predict("clima de la ciudad", CATALOG, limit=1) == ["weather"]
+    assert ranker.predict("extrae las tablas del pdf", CATALOG[2:], limit=3) == ["pdf-reader"]
+    assert ranker.predict("hola", CATALOG, limit=2) == []
+    assert len(ranker._indexes) == 2
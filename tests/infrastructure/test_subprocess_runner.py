@@ -1,6 +1,8 @@
 import pytest
 import os
 import json
+import time
+import asyncio
 from src.infrastructure.runners.subprocess_runner import SubprocessRunner
 from src.core.schemas.models import SkillDoc, SkillMetadata
 
@@ -25,6 +27,17 @@ print(json.dumps({"received": args, "status": "ok"}))
 import sys
 sys.stderr.write("Algo salio mal")
 sys.exit(1)
+""")
+
+    # Script lento (duerme los segundos indicados)
+    sleep_script = skills_dir / "sleep.py"
+    sleep_script.write_text("""
+import sys
+import json
+import time
+args = json.loads(sys.argv[1])
+time.sleep(args["seconds"])
+print(json.dumps({"slept": args["seconds"]}))
 """)
 
     return str(workspace)
@@ -69,3 +82,36 @@ async def test_run_no_script(temp_workspace):
     observation = await runner.run(skill, {})
     assert observation.status == "error"
     assert "no tiene definido un entry_script" in observation.content
+
+def _sleep_skill():
+    return SkillDoc(
+        metadata=SkillMetadata(name="test-skill", description="test"),
+        instructions="...",
+        entry_script="scripts/sleep.py"
+    )
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_do_not_block(temp_workspace):
+    runner = SubprocessRunner(temp_workspace)
+    durations = [0.6, 0.6, 0.6, 0.6]
+
+    start = time.perf_counter()
+    observations = await asyncio.gather(
+        *(runner.run(_sleep_skill(), {"seconds": d}) for d in durations)
+    )
+    elapsed = time.perf_counter() - start
+
+    assert all(o.status == "success" for o in observations)
+    # ~max(t) y no sum(t)
+    assert elapsed < sum(durations) / 2
+
+@pytest.mark.asyncio
+async def test_run_timeout_kills_process(temp_workspace):
+    runner = SubprocessRunner(temp_workspace, timeout=0.3)
+
+    start = time.perf_counter()
+    observation = await runner.run(_sleep_skill(), {"seconds": 10})
+
+    assert observation.status == "error"
+    assert "Timeout" in observation.content
+    assert time.perf_counter() - start < 5
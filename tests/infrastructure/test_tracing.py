@@ -0,0 +1,92 @@
+import asyncio
+import json
+import pytest
+from src.core.interfaces.ports import NullTracer
+from src.infrastructure.observability.metrics import PrometheusMetrics
+from src.infrastructure.observability.tracing import (
+    JSONLSpanExporter,
+    SpanSink,
+    Tracer,
+)
+
+
+class ListSink(SpanSink):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def test_spans_nest_and_record_errors():
+    sink = ListSink()
+    tracer = Tracer([sink])
+    with tracer.span("chat", session_id="s1") as root:
+        with tracer.span("router") as child:
+            child.set("prompt_tokens", 10)
+        with pytest.raises(ValueError):
+            with tracer.span("skill.run"):
+                raise ValueError("boom")
+
+    router, skill, chat = sink.spans
+    assert chat is root and chat.parent_id is None
+    assert router.parent_id == skill.parent_id == root.span_id
+    assert {router.trace_id, skill.trace_id} == {root.trace_id}
+    assert router.attributes == {"prompt_tokens": 10}
+    assert skill.status == "error" and "boom" in skill.attributes["error"]
+
+
+@pytest.mark.asyncio
+async def test_context_propagates_into_gathered_tasks():
+    sink = ListSink()
+    tracer = Tracer([sink])
+
+    async def child(i):
+        with tracer.span("skill.run", i=i):
+            await asyncio.sleep(0)
+
+    with tracer.span("batch") as batch:
+        await asyncio.gather(*(child(i) for i in range(3)))
+
+    children = [s for s in sink.spans if s.name == "skill.run"]
+    assert len(children) == 3
+    assert all(s.parent_id == batch.span_id for s in children)
+
+
+def test_jsonl_exporter_writes_one_span_per_line(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracer = Tracer([JSONLSpanExporter(str(path), flush_every=100)])
+    with tracer.span("chat"):
+        with tracer.span("router", step=0):
+            pass
+    # El span raíz fuerza el flush sin cerrar el fichero
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    tracer.close()
+
+    assert [line["name"] for line in lines] == ["router", "chat"]
+    assert lines[0]["attributes"] == {"step": 0}
+    assert lines[0]["parent_id"] == lines[1]["span_id"]
+
+
+def test_prometheus_metrics_render():
+    metrics = PrometheusMetrics(buckets=(0.1, 1.0))
+    tracer = Tracer([metrics])
+    for _ in range(2):
+        with tracer.span("router") as span:
+            span.set("prompt_tokens", 100)
+            span.set("completion_tokens", 20)
+
+    text = metrics.render()
+    assert 'agent_span_duration_seconds_bucket{span="router",le="0.1"} 2' in text
+    assert 'agent_span_duration_seconds_bucket{span="router",le="+Inf"} 2' in text
+    assert 'agent_span_duration_seconds_count{span="router"} 2' in text
+    assert 'agent_spans_total{span="router",status="ok"} 2' in text
+    assert 'agent_llm_tokens_total{kind="prompt"} 200' in text
+    assert 'agent_llm_tokens_total{kind="completion"} 40' in text
+
+
+def test_null_tracer_is_a_noop():
+    tracer = NullTracer()
+    with tracer.span("chat", session_id="s") as span:
+        span.set("steps", 3)
+    assert tracer.span("a") is tracer.span("b")
@@ -0,0 +1,103 @@
+import pytest
+import asyncio
+from src.infrastructure.runners.warm_runner import WarmPoolRunner
+from src.core.schemas.models import SkillDoc, SkillMetadata
+
+
+@pytest.fixture
+def temp_workspace(tmp_path):
+    workspace = tmp_path / "workspace"
+    scripts_dir = workspace / "skills" / "test-skill" / "scripts"
+    scripts_dir.mkdir(parents=True)
+
+    # Devuelve el pid para comprobar la reutilización del worker
+    (scripts_dir / "echo.py").write_text("""
+import os
+import sys
+import json
+
+if __name__ == "__main__":
+    args = json.loads(sys.argv[1])
+    if args.get("fail"):
+        sys.stderr.write("Algo salio mal")
+        sys.exit(1)
+    if args.get("sleep"):
+        import time
+        time.sleep(args["sleep"])
+    print(json.dumps({"received": args, "pid": os.getpid()}))
+""")
+    return str(workspace)
+
+
+def _skill():
+    return SkillDoc(
+        metadata=SkillMetadata(name="test-skill", description="test"),
+        instructions="...",
+        entry_script="scripts/echo.py",
+    )
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_is_reused(temp_workspace):
+    runner = WarmPoolRunner(temp_workspace, pool_size=1)
+    try:
+        first = await runner.run(_skill(), {"n": 1})
+        second = await runner.run(_skill(), {"n": 2})
+
+        assert first.status == "success"
+        assert first.metadata["runner"] == "warm"
+        assert second.content["received"] == {"n": 2}
+        assert first.content["pid"] == second.content["pid"]
+    finally:
+        await runner.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_recycles_after_max_requests(temp_workspace):
+    runner = WarmPoolRunner(temp_workspace, pool_size=1, max_requests=1)
+    try:
+        first = await runner.run(_skill(), {})
+        second = await runner.run(_skill(), {})
+        assert first.content["pid"] != second.content["pid"]
+    finally:
+        await runner.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_worker_errors_and_timeout(temp_workspace):
+    runner = WarmPoolRunner(temp_workspace, pool_size=2, timeout=0.5)
+    try:
+        failed = await runner.run(_skill(), {"fail": True})
+        assert failed.status == "error"
+        assert "Algo salio mal" in failed.content
+
+        timed_out, ok = await asyncio.gather(
+            runner.run(_skill(), {"sleep": 5}), runner.run(_skill(), {"n": 3})
+        )
+        assert "Timeout" in timed_out.content
+        assert ok.status == "success"
+    finally:
+        await runner.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_wakes_waiters_after_discard(temp_workspace):
+    # Con un solo worker, el reciclado y el timeout deben despertar al que espera
+    runner = WarmPoolRunner(temp_workspace, pool_size=1, max_requests=1, timeout=0.5)
+    try:
+        first, second = await asyncio.wait_for(
+            asyncio.gather(runner.run(_skill(), {"n": 1}), runner.run(_skill(), {"n": 2})),
+            timeout=10,
+        )
+        assert first.status == second.status == "success"
+        assert first.content["pid"] != second.content["pid"]
+
+        timed_out, ok = await asyncio.wait_for(
+            asyncio.gather(runner.run(_skill(), {"sleep": 5}), runner.run(_skill(), {"n": 3})),
+            timeout=10,
+        )
+        assert "Timeout" in timed_out.content
+        assert ok.content["received"] == {"n": 3}
+        assert runner._pools[next(iter(runner._pools))].spawned <= 1
+    finally:
+        await runner.stop()
@@ -0,0 +1,63 @@
+from src.core.schemas.models import AgentState, Observation
+from src.infrastructure.llm.tokenizers import CharTokenizer, create_tokenizer
+from src.services.history_compactor import HistoryCompactor
+
+
+def _state(*sizes):
+    state = AgentState(session_id="t")
+    state.add_message("user", "pregunta")
+    for i, size in enumerate(sizes):
+        state.add_message("assistant", f"Decision: skill:s{i}")
+        state.add_observation(Observation(origin=f"s{i}", content="x" * size))
+    return state
+
+
+def test_char_tokenizer_estimate():
+    assert CharTokenizer().count("") == 0
+    assert CharTokenizer().count("abcde") == 2
+    assert create_tokenizer("char", "gpt-4o").count("abcd") == 1
+
+
+def test_under_budget_is_untouched():
+    state = _state(100, 100)
+    history = [dict(m) for m in state.history]
+    report = HistoryCompactor(CharTokenizer(), budget=10_000).compact(state)
+    assert state.history == history
+    assert report.tokens_before == report.tokens_after
+    assert not report.truncated and not report.elided
+
+
+def test_truncates_oldest_first_and_keeps_latest():
+    state = _state(8000, 8000, 8000)
+    compactor = HistoryCompactor(CharTokenizer(), budget=3000, preview_chars=200)
+    state.cursor.messages = 3  # solo los 3 primeros mensajes estaban guardados
+    report = compactor.compact(state)
+
+    assert report.tokens_after <= 3000 < report.tokens_before
+    assert report.truncated == [2, 4]
+    assert state.cursor.edited == {2}
+    assert "caracteres omitidos" in state.history[2]["content"]
+    assert state.history[-1]["content"].endswith("x" * 8000)
+    assert compactor.count(state.history) == report.tokens_after
+
+
+def test_elides_when_previews_do_not_fit():
+    state = _state(*[2000] * 6)
+    budget = 1000
+    report = HistoryCompactor(CharTokenizer(), budget=budget, preview_chars=1000).compact(state)
+    assert report.elided
+    assert "contenido elidido" in state.history[report.elided[0]]["content"]
+    assert state.history[-1]["content"].endswith("x" * 2000)
+
+
+def test_compaction_is_stable_across_steps():
+    state = _state(8000, 8000)
+    compactor = HistoryCompactor(CharTokenizer(), budget=2500, preview_chars=200)
+    compactor.compact(state)
+    compacted = [dict(m) for m in state.history]
+
+    state.add_message("assistant", "Decision: skill:s9")
+    state.add_observation(Observation(origin="s9", content="y" * 300))
+    compactor.compact(state)
+    # Los mensajes ya compactados no vuelven a cambiar (prefijo estable)
+    assert state.history[: len(compacted) - 1] == compacted[:-1]
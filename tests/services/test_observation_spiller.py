@@ -0,0 +1,122 @@
+import pytest
+from src.core.schemas.models import Action, AgentState, BlobRef, Observation, SkillDoc, SkillMetadata
+from src.infrastructure.storage.blob_store import FileBlobStore
+from src.services.observation_spiller import ObservationSpiller
+from src.services.orchestrator import Orchestrator
+
+BIG = "x" * 5000
+
+
+def _state(*contents):
+    state = AgentState(session_id="s")
+    state.add_message("user", "pregunta")
+    for i, content in enumerate(contents):
+        state.add_message("assistant", f"Decision: skill:s{i}")
+        state.add_observation(Observation(origin=f"s{i}", content=content))
+    return state
+
+
+@pytest.mark.asyncio
+async def test_spills_large_observations_from_state_and_history(tmp_path):
+    spiller = ObservationSpiller(FileBlobStore(str(tmp_path)), threshold=1000, preview_chars=50)
+    state = _state(BIG, {"rows": [BIG]}, "pequeño", BIG + "y")
+
+    spilled = await spiller.spill(state)
+
+    refs = [o.content for o in state.observations]
+    assert isinstance(refs[0], BlobRef) and refs[0].size == 5000 and refs[0].preview == "x" * 50
+    assert isinstance(refs[1], BlobRef) and refs[1].encoding == "json"
+    assert refs[2] == "pequeño"
+    assert isinstance(refs[3], BlobRef)
+    assert spilled > 3 * 5000
+    # En el historial queda el mismo preview que en la observación
+    observation_messages = [m["content"] for m in state.history if m["role"] == "user"][1:]
+    assert observation_messages[0].endswith(str(refs[0]))
+    assert observation_messages[2].endswith("pequeño")
+    assert all(BIG not in m for m in observation_messages)
+
+    # Incremental: solo se revisan las observaciones nuevas
+    assert state.cursor.spilled == 4
+    assert await spiller.spill(state) == 0
+    state.add_observation(Observation(origin="s4", content=BIG + "z"))
+    assert await spiller.spill(state) == 5001
+    assert isinstance(state.observations[4].content, BlobRef)
+
+    assert spiller.load(refs[0]) == BIG
+    assert spiller.rehydrate(state.observations[1]).content == {"rows": [BIG]}
+
+
+@pytest.mark.asyncio
+async def test_expand_rehydrates_only_the_latest_observation(tmp_path):
+    spiller = ObservationSpiller(FileBlobStore(str(tmp_path)), threshold=1000)
+    state = _state(BIG, BIG + "y")
+    state.add_message("assistant", "Decision: batch")
+    state.add_observations(
+        [Observation(origin="a", content=BIG + "a"), Observation(origin="b", content="ok")]
+    )
+    spiller.spill_sync(state)
+    before = [m["content"] for m in state.history]
+
+    collapsed = await spiller.expand(state)
+    assert BIG + "a" in state.history[-1]["content"]
+    assert "ok" in state.history[-1]["content"]
+    assert [m["content"] for m in state.history[:-1]] == before[:-1]
+
+    spiller.collapse(state, collapsed)
+    assert [m["content"] for m in state.history] == before
+
+    # Si el último mensaje no es una observación no hay nada que expandir
+    state.add_message("assistant", "listo")
+    assert await spiller.expand(state) is None
+
+
+def test_memory_report(tmp_path):
+    spiller = ObservationSpiller(FileBlobStore(str(tmp_path)), threshold=1000, preview_chars=10)
+    state = _state(BIG, "ok")
+    before = spiller.memory_report(state)
+    spiller.spill_sync(state)
+    report = spiller.memory_report(state)
+    assert report["spilled_bytes"] == 5000 and report["blobs"] == 1
+    assert report["observation_bytes"] < before["observation_bytes"] - 4000
+    assert report["history_bytes"] < before["history_bytes"] - 4000
+
+
+class Store:
+    async def get_all_metadata(self):
+        return []
+
+    async def get_skill_doc(self, name):
+        return SkillDoc(metadata=SkillMetadata(name=name, description=""), instructions="")
+
+
+class Runner:
+    async def run(self, skill, args):
+        return Observation(origin=skill.metadata.name, content=BIG)
+
+
+class LLM:
+    def __init__(self):
+        self.actions = [
+            Action(type="skill", name="scrape", args={"n": 1}, reason="r"),
+            Action(type="skill", name="scrape", args={"n": 2}, reason="r"),
+            Action(type="respond", name="final_answer", args={"response": "listo"}, reason="r"),
+        ]
+        self.last_history = None
+
+    async def ask(self, state, on_event=None):
+        self.last_history = [m["content"] for m in state.history]
+        return self.actions.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_spills_after_each_observation(tmp_path):
+    llm = LLM()
+    spiller = ObservationSpiller(FileBlobStore(str(tmp_path)), threshold=1000)
+    orchestrator = Orchestrator(Store(), llm, Runner(), spiller=spiller)
+    assert await orchestrator.chat("x") == "listo"
+    # El Router ve completa la última observación; las anteriores, con su preview
+    first, latest = llm.last_history[2], llm.last_history[4]
+    assert BIG not in first and "bytes en el blob" in first
+    assert latest.endswith(BIG)
+    blobs = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert len(blobs) == 1  # mismo contenido, mismo blob
@@ -0,0 +1,214 @@
+import asyncio
+import pytest
+from src.services.orchestrator import Orchestrator
+from src.core.schemas.models import Action, Observation, SkillDoc, SkillMetadata
+
+
+class FakeStore:
+    async def get_all_metadata(self):
+        return []
+
+    async def get_skill_doc(self, name):
+        if name == "missing":
+            return None
+        return SkillDoc(metadata=SkillMetadata(name=name, description=""), instructions="")
+
+
+class ScriptedLLM:
+    """Devuelve las acciones en orden; guarda el historial que vio en cada paso."""
+
+    def __init__(self, actions):
+        self.actions = list(actions)
+        self.seen = []
+
+    async def ask(self, state, on_event=None):
+        self.seen.append(list(state.history))
+        return self.actions.pop(0)
+
+
+class SlowRunner:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def run(self, skill, args):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if args.get("fail"):
+                raise RuntimeError("boom")
+            return Observation(origin=skill.metadata.name, content=f"ok {args['city']}")
+        finally:
+            self.running -= 1
+
+
+def _skill(city, **extra):
+    return Action(type="skill", name="weather", args={"city": city, **extra}, reason="r")
+
+
+def _respond():
+    return Action(type="respond", name="final_answer", args={"response": "listo"}, reason="r")
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_concurrently_and_injects_all_observations():
+    batch = Action(
+        type="batch",
+        name="batch",
+        reason="tres ciudades",
+        actions=[_skill("Madrid"), _skill("Paris"), _skill("Tokyo")],
+    )
+    llm = ScriptedLLM([batch, _respond()])
+    runner = SlowRunner(delay=0.2)
+    orchestrator = Orchestrator(FakeStore(), llm, runner, max_parallel_actions=4)
+
+    start = asyncio.get_running_loop().time()
+    assert await orchestrator.chat("tiempo") == "listo"
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert runner.peak == 3
+    assert elapsed < 0.5
+    observation_msg = llm.seen[1][-1]["content"]
+    for city in ("Madrid", "Paris", "Tokyo"):
+        assert f"ok {city}" in observation_msg
+
+
+def test_batch_sub_actions_do_not_require_reason():
+    batch = Action.model_validate(
+        {
+            "type": "batch",
+            "name": "batch",
+            "reason": "dos ciudades",
+            "actions": [
+                {"type": "skill", "name": "weather", "args": {"city": "Madrid"}},
+                {"type": "skill", "name": "weather", "args": {"city": "Paris"}, "reason": "r"},
+            ],
+        }
+    )
+    assert [a.reason for a in batch.actions] == ["", "r"]
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_concurrency_limit():
+    batch = Action(
+        type="batch", name="batch", reason="r", actions=[_skill(str(i)) for i in range(5)]
+    )
+    runner = SlowRunner(delay=0.05)
+    orchestrator = Orchestrator(
+        FakeStore(), ScriptedLLM([batch, _respond()]), runner, max_parallel_actions=2
+    )
+    await orchestrator.chat("x")
+    assert runner.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_failures_are_isolated():
+    batch = Action(
+        type="batch",
+        name="batch",
+        reason="r",
+        actions=[
+            _skill("Madrid"),
+            _skill("Paris", fail=True),
+            Action(type="skill", name="missing", args={}, reason="r"),
+            Action(type="respond", name="final_answer", args={}, reason="r"),
+        ],
+    )
+    llm = ScriptedLLM([batch, _respond()])
+    await Orchestrator(FakeStore(), llm, SlowRunner(delay=0)).chat("x")
+
+    observation_msg = llm.seen[1][-1]["content"]
+    assert "ok Madrid" in observation_msg
+    assert "boom" in observation_msg
+    assert "Skill 'missing' no encontrada" in observation_msg
+    assert "no permitida dentro de un batch" in observation_msg
+    assert observation_msg.count("(ERROR)") == 3
+
+
+@pytest.mark.asyncio
+async def test_emits_spans_per_phase():
+    from src.infrastructure.observability.tracing import SpanSink, Tracer
+
+    class ListSink(SpanSink):
+        def __init__(self):
+            self.spans = []
+
+        def export(self, span):
+            self.spans.append(span)
+
+    sink = ListSink()
+    action = _skill("Madrid")
+    action.usage = {"prompt_tokens": 120, "completion_tokens": 15}
+    orchestrator = Orchestrator(
+        FakeStore(), ScriptedLLM([action, _respond()]), SlowRunner(delay=0), tracer=Tracer([sink])
+    )
+    await orchestrator.chat("tiempo", session_id="s1")
+
+    names = [span.name for span in sink.spans]
+    assert names == [
+        "catalog.load",
+        "router",
+        "skill.load",
+        "skill.run",
+        "observation.inject",
+        "router",
+        "chat",
+    ]
+    root = sink.spans[-1]
+    assert root.attributes == {"session_id": "s1", "steps": 1}
+    assert all(span.parent_id == root.span_id for span in sink.spans[:-1])
+    router = sink.spans[1]
+    assert router.attributes["prompt_tokens"] == 120
+    assert router.attributes["action"] == "skill:weather"
+    assert sink.spans[3].attributes["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_resumes_session_from_store(tmp_path):
+    from src.infrastructure.storage.session_store import SQLiteSessionStore
+
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite"))
+    first = ScriptedLLM([_skill("Madrid"), _respond()])
+    await Orchestrator(FakeStore(), first, SlowRunner(delay=0), session_store=store).chat(
+        "tiempo en Madrid", session_id="abc"
+    )
+
+    # Otro proceso (nuevo Orchestrator) continúa la misma sesión
+    second = ScriptedLLM([_skill(str(i)) for i in range(5)] + [_respond()])
+    orchestrator = Orchestrator(FakeStore(), second, SlowRunner(delay=0), session_store=store)
+    assert await orchestrator.chat("¿y en Paris?", session_id="abc") == "listo"
+
+    seen = [m["content"] for m in second.seen[0]]
+    assert seen[0] == "tiempo en Madrid"
+    assert "ok Madrid" in seen[2]
+    assert seen[3:] == ["listo", "¿y en Paris?"]
+    # El límite de pasos es por turno, no por sesión
+    assert len(second.seen) == 6
+
+
+@pytest.mark.asyncio
+async def test_session_conflict_is_not_swallowed(tmp_path):
+    from src.core.interfaces.ports import SessionConflictError
+    from src.infrastructure.storage.session_store import SQLiteSessionStore
+
+    path = str(tmp_path / "sessions.sqlite")
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    await Orchestrator(FakeStore(), ScriptedLLM([_respond()]), None, session_store=first).chat(
+        "hola", session_id="abc"
+    )
+
+    class Interleaved(ScriptedLLM):
+        async def ask(self, state, on_event=None):
+            # Otro proceso responde un turno mientras este decide
+            await Orchestrator(
+                FakeStore(), ScriptedLLM([_respond()]), None, session_store=second
+            ).chat("otro turno", session_id="abc")
+            return await super().ask(state, on_event)
+
+    orchestrator = Orchestrator(FakeStore(), Interleaved([_respond()]), None, session_store=first)
+    with pytest.raises(SessionConflictError):
+        await orchestrator.chat("¿sigues?", session_id="abc")
+    resumed = await first.load("abc")
+    assert [m["content"] for m in resumed.history][-2:] == ["otro turno", "listo"]
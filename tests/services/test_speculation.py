@@ -0,0 +1,202 @@
+import asyncio
+import pytest
+from src.core.interfaces.ports import ISessionStore
+from src.core.schemas.models import Action, Observation, SkillDoc, SkillMetadata
+from src.services.orchestrator import Orchestrator
+from src.services.speculation import Speculator
+
+CATALOG = [
+    SkillMetadata(name="weather", description="Clima actual de una ciudad."),
+    SkillMetadata(name="news", description="Noticias de una ciudad."),
+    SkillMetadata(name="pdf-reader", description="Lee documentos PDF."),
+]
+
+
+class FixedPredictor:
+    def __init__(self, names):
+        self.names = names
+        self.queries = []
+        self.candidates = []
+
+    def predict(self, query, skills, limit):
+        self.queries.append(query)
+        self.candidates.append([s.name for s in skills])
+        return [n for n in self.names if n in self.candidates[-1]][:limit]
+
+
+class Store:
+    def __init__(self, idempotent=True):
+        self.idempotent = idempotent
+        self.loaded = []
+
+    async def get_all_metadata(self):
+        return CATALOG
+
+    async def get_skill_doc(self, name):
+        self.loaded.append(name)
+        return SkillDoc(
+            metadata=SkillMetadata(name=name, description=""),
+            instructions="",
+            cache_ttl=60 if self.idempotent else None,
+        )
+
+
+class Runner:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def run(self, skill, args):
+        self.calls.append((skill.metadata.name, args))
+        await asyncio.sleep(self.delay)
+        return Observation(origin=skill.metadata.name, content=f"ok {args}")
+
+
+class StreamingLLM:
+    """Emite type/name/args como el parser incremental y tarda `tail` en cerrar el JSON."""
+
+    def __init__(self, actions, streamed_args=None, tail=0.0):
+        self.actions = list(actions)
+        self.streamed_args = streamed_args
+        self.tail = tail
+        self.loaded_during_ask = []
+
+    async def ask(self, state, on_event=None):
+        action = self.actions.pop(0)
+        await asyncio.sleep(0.01)
+        self.loaded_during_ask.append(list(self.store.loaded))
+        if on_event and action.type == "skill":
+            await on_event("type", action.type)
+            await on_event("name", action.name)
+            await on_event("args", self.streamed_args or action.args)
+            await asyncio.sleep(self.tail)
+        return action
+
+
+def _skill(name, **args):
+    return Action(type="skill", name=name, args=args, reason="r")
+
+
+def _respond():
+    return Action(type="respond", name="final_answer", args={"response": "listo"}, reason="r")
+
+
+class MemorySessions(ISessionStore):
+    def __init__(self):
+        self.states = {}
+
+    async def load(self, session_id):
+        return self.states.get(session_id)
+
+    async def save(self, state):
+        self.states[state.session_id] = state
+
+
+def _orchestrator(llm, store, runner, names=("weather", "news"), early=True, sessions=None):
+    llm.store = store
+    speculator = Speculator(FixedPredictor(list(names)), top_n=2, early_execution=early)
+    return Orchestrator(store, llm, runner, speculator=speculator, session_store=sessions)
+
+
+@pytest.mark.asyncio
+async def test_prefetches_predicted_skills_while_router_thinks():
+    store, runner = Store(idempotent=False), Runner()
+    llm = StreamingLLM([_skill("weather", city="Madrid"), _respond()])
+    orchestrator = _orchestrator(llm, store, runner)
+
+    assert await orchestrator.chat("tiempo en Madrid") == "listo"
+
+    assert set(llm.loaded_during_ask[0]) == {"weather", "news"}
+    assert store.loaded.count("weather") == 1
+    stats = orchestrator.speculator.stats
+    assert (stats.prefetch_hits, stats.prefetch_waste) == (1, 1)
+    assert stats.hit_ratio == 0.5
+    # La segunda consulta del predictor incluye la última observación
+    # y ya no propone la skill ejecutada
+    predictor = orchestrator.speculator.predictor
+    assert "ok" in predictor.queries[1]
+    assert predictor.candidates[1] == ["news", "pdf-reader"]
+
+
+@pytest.mark.asyncio
+async def test_idempotent_skill_starts_before_router_finishes():
+    store, runner = Store(), Runner(delay=0.2)
+    llm = StreamingLLM([_skill("weather", city="Madrid"), _respond()], tail=0.2)
+    orchestrator = _orchestrator(llm, store, runner)
+
+    start = asyncio.get_running_loop().time()
+    await orchestrator.chat("tiempo")
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert runner.calls == [("weather", {"city": "Madrid"})]
+    assert elapsed < 0.35
+    assert orchestrator.speculator.stats.early_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_early_result_discarded_when_decision_differs():
+    store, runner = Store(), Runner()
+    llm = StreamingLLM(
+        [_skill("weather", city="Paris"), _respond()], streamed_args={"city": "Madrid"}, tail=0.05
+    )
+    orchestrator = _orchestrator(llm, store, runner)
+    await orchestrator.chat("tiempo")
+
+    assert runner.calls == [("weather", {"city": "Madrid"}), ("weather", {"city": "Paris"})]
+    stats = orchestrator.speculator.stats
+    assert (stats.early_hits, stats.early_waste) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_skills_are_not_run_early():
+    store, runner = Store(idempotent=False), Runner()
+    llm = StreamingLLM([_skill("weather", city="Madrid"), _respond()], tail=0.05)
+    orchestrator = _orchestrator(llm, store, runner)
+    await orchestrator.chat("tiempo")
+
+    assert runner.calls == [("weather", {"city": "Madrid"})]
+    assert orchestrator.speculator.stats.early_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_executed_skills_are_candidates_again_in_the_next_turn():
+    store, runner = Store(idempotent=False), Runner()
+    llm = StreamingLLM(
+        [_skill("weather", city="Madrid"), _respond(), _skill("weather", city="Lima"), _respond()]
+    )
+    orchestrator = _orchestrator(llm, store, runner, sessions=MemorySessions())
+
+    await orchestrator.chat("tiempo en Madrid", session_id="s")
+    await orchestrator.chat("¿y en Lima?", session_id="s")
+
+    # Solo se excluyen las skills ejecutadas en el turno en curso
+    candidates = orchestrator.speculator.predictor.candidates
+    assert candidates[1] == ["news", "pdf-reader"]
+    assert candidates[2] == ["weather", "news", "pdf-reader"]
+
+
+@pytest.mark.asyncio
+async def test_discarded_early_runs_do_not_outlive_the_turn():
+    class SlowRunner(Runner):
+        def __init__(self):
+            super().__init__()
+            self.cancelled = []
+
+        async def run(self, skill, args):
+            if args == {"city": "Madrid"}:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    self.cancelled.append(args)
+                    raise
+            return await super().run(skill, args)
+
+    store, runner = Store(), SlowRunner()
+    llm = StreamingLLM(
+        [_skill("weather", city="Paris"), _respond()], streamed_args={"city": "Madrid"}, tail=0.05
+    )
+    orchestrator = _orchestrator(llm, store, runner)
+
+    assert await asyncio.wait_for(orchestrator.chat("tiempo"), timeout=2) == "listo"
+    assert runner.cancelled == [{"city": "Madrid"}]
+    assert orchestrator.speculator.stats.early_waste == 1
@@ -14,7 +14,11 @@ def search_lite(query):
 
         response = requests.post(url, data=data, headers=headers, timeout=15)
         if response.status_code != 200:
-            return {"summary": "Error al acceder a DuckDuckGo Lite.", "sources": []}
+            return {
+                "summary": "Error al acceder a DuckDuckGo Lite.",
+                "sources": [],
+                "error": f"HTTP {response.status_code}",
+            }
 
         soup = BeautifulSoup(response.text, "html.parser")
 
@@ -53,7 +57,8 @@ def search_lite(query):
         return {"summary": "\n\n".join(results), "sources": sources}
 
     except Exception as e:
-        return {"summary": f"Error de scraping: {str(e)}", "sources": []}
+        # `error` marca el fallo como transitorio: el resultado no se cachea
+        return {"summary": f"Error de scraping: {str(e)}", "sources": [], "error": str(e)}
 
 
 if __name__ == "__main__":
@@ -70,4 +75,6 @@ if __name__ == "__main__":
             result = search_lite(query)
             print(json.dumps(result))
     except Exception as e:
-        print(json.dumps({"summary": f"Error fatal: {str(e)}", "sources": []}))
+        print(
+            json.dumps({"summary": f"Error fatal: {str(e)}", "sources": [], "error": str(e)})
+        )
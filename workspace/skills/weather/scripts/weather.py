@@ -37,7 +37,12 @@ def get_weather(city):
         }
 
     except Exception as e:
-        return {"summary": f"Error al obtener el clima: {str(e)}", "temperature": None}
+        # `error` marca el fallo como transitorio: el resultado no se cachea
+        return {
+            "summary": f"Error al obtener el clima: {str(e)}",
+            "temperature": None,
+            "error": str(e),
+        }
 
 
 if __name__ == "__main__":
@@ -58,4 +63,8 @@ if __name__ == "__main__":
             result = get_weather(city)
             print(json.dumps(result))
     except Exception as e:
-        print(json.dumps({"summary": f"Error fatal: {str(e)}", "temperature": None}))
+        print(
+            json.dumps(
+                {"summary": f"Error fatal: {str(e)}", "temperature": None, "error": str(e)}
+            )
+        )